@@ -1,14 +1,16 @@
 from __future__ import annotations
 
+from contextlib import contextmanager
 from logging.config import fileConfig
+from typing import Any, Iterator
 
 from alembic import context
-from sqlalchemy import engine_from_config, pool
+from sqlalchemy import DefaultClause, Table, TextClause, engine_from_config, event, pool, text
 from sqlalchemy.engine import Connection
 from sqlalchemy.ext.asyncio import async_engine_from_config
 
 from app.config import get_settings
-from app.db import Base
+from app.db import Base, create_sqlite_engine, is_file_sqlite
 from app import models  # noqa: F401
 
 
@@ -22,6 +24,31 @@ if config.config_file_name is not None:
 target_metadata = Base.metadata
 
 
+def _sqlite_now_defaults(table: Table, connection: Connection, **kw: Any) -> None:
+    """Give the initial revision's `now()` defaults SQLite's CURRENT_TIMESTAMP before its tables are created.
+
+    That revision spells its timestamp defaults `sa.text('now()')`. SQLite accepts the DEFAULT
+    clause but has no now() function, so every insert relying on it would fail.
+    """
+    for column in table.columns:
+        default = column.server_default
+        if isinstance(default, DefaultClause) and isinstance(default.arg, TextClause) and default.arg.text == "now()":
+            column.server_default = DefaultClause(text("CURRENT_TIMESTAMP"))
+
+
+@contextmanager
+def _sqlite_defaults(enabled: bool) -> Iterator[None]:
+    """Apply `_sqlite_now_defaults` to the tables migrations create, only while they run."""
+    if not enabled:
+        yield
+        return
+    event.listen(Table, "before_create", _sqlite_now_defaults)
+    try:
+        yield
+    finally:
+        event.remove(Table, "before_create", _sqlite_now_defaults)
+
+
 def run_migrations_offline() -> None:
     url = config.get_main_option("sqlalchemy.url")
     context.configure(
@@ -29,25 +56,35 @@ def run_migrations_offline() -> None:
         target_metadata=target_metadata,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
+        render_as_batch=url is not None and url.startswith("sqlite"),
     )
 
-    with context.begin_transaction():
+    with _sqlite_defaults(url is not None and url.startswith("sqlite")), context.begin_transaction():
         context.run_migrations()
 
 
 def do_run_migrations(connection: Connection) -> None:
-    context.configure(connection=connection, target_metadata=target_metadata)
+    # SQLite cannot ALTER most constraints in place; batch mode rebuilds the table instead.
+    context.configure(
+        connection=connection,
+        target_metadata=target_metadata,
+        render_as_batch=connection.dialect.name == "sqlite",
+    )
 
-    with context.begin_transaction():
+    with _sqlite_defaults(connection.dialect.name == "sqlite"), context.begin_transaction():
         context.run_migrations()
 
 
 async def run_async_migrations() -> None:
-    connectable = async_engine_from_config(
-        config.get_section(config.config_ini_section),
-        prefix="sqlalchemy.",
-        poolclass=pool.NullPool,
-    )
+    if is_file_sqlite(settings.database_url):
+        # Same pragmas as the app, so the file is switched to WAL before the first request.
+        connectable = create_sqlite_engine(settings.database_url, settings, pool_size=1)
+    else:
+        connectable = async_engine_from_config(
+            config.get_section(config.config_ini_section),
+            prefix="sqlalchemy.",
+            poolclass=pool.NullPool,
+        )
 
     async with connectable.connect() as connection:
         await connection.run_sync(do_run_migrations)
@@ -0,0 +1,76 @@
+"""Key the SQLite market search index on market id
+
+Revision ID: a3f8c1d5e7b2
+Revises: e6b2c7d4a9f1
+Create Date: 2026-10-19 15:40:12.907315
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3f8c1d5e7b2'
+down_revision: Union[str, Sequence[str], None] = 'e6b2c7d4a9f1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TRIGGERS = ("markets_fts_au", "markets_fts_ad", "markets_fts_ai")
+
+# Kept identical to app.models.MARKET_SEARCH_SQLITE_DDL at the time of this revision.
+UPGRADE_STATEMENTS = (
+    "CREATE VIRTUAL TABLE markets_fts USING fts5(market_id UNINDEXED, question, description, slug)",
+    "CREATE TRIGGER markets_fts_ai AFTER INSERT ON markets BEGIN "
+    "INSERT INTO markets_fts(market_id, question, description, slug) "
+    "VALUES (new.id, new.question, new.description, new.slug); END",
+    "CREATE TRIGGER markets_fts_ad AFTER DELETE ON markets BEGIN "
+    "DELETE FROM markets_fts WHERE market_id = old.id; END",
+    "CREATE TRIGGER markets_fts_au AFTER UPDATE OF question, description, slug ON markets BEGIN "
+    "UPDATE markets_fts SET question = new.question, description = new.description, slug = new.slug "
+    "WHERE market_id = old.id; END",
+    "INSERT INTO markets_fts(market_id, question, description, slug) "
+    "SELECT id, question, description, slug FROM markets",
+)
+
+# The external-content index from b7e2d91c4a10.
+DOWNGRADE_STATEMENTS = (
+    "CREATE VIRTUAL TABLE markets_fts USING fts5("
+    "question, description, slug, content='markets', content_rowid='rowid')",
+    "CREATE TRIGGER markets_fts_ai AFTER INSERT ON markets BEGIN "
+    "INSERT INTO markets_fts(rowid, question, description, slug) "
+    "VALUES (new.rowid, new.question, new.description, new.slug); END",
+    "CREATE TRIGGER markets_fts_ad AFTER DELETE ON markets BEGIN "
+    "INSERT INTO markets_fts(markets_fts, rowid, question, description, slug) "
+    "VALUES ('delete', old.rowid, old.question, old.description, old.slug); END",
+    "CREATE TRIGGER markets_fts_au AFTER UPDATE OF question, description, slug ON markets BEGIN "
+    "INSERT INTO markets_fts(markets_fts, rowid, question, description, slug) "
+    "VALUES ('delete', old.rowid, old.question, old.description, old.slug); "
+    "INSERT INTO markets_fts(rowid, question, description, slug) "
+    "VALUES (new.rowid, new.question, new.description, new.slug); END",
+    "INSERT INTO markets_fts(markets_fts) VALUES ('rebuild')",
+)
+
+
+def _replace_index(statements: Sequence[str]) -> None:
+    for trigger in TRIGGERS:
+        op.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+    op.execute("DROP TABLE IF EXISTS markets_fts")
+    for statement in statements:
+        op.execute(statement)
+
+
+def upgrade() -> None:
+    """Upgrade schema.
+
+    `markets` has no INTEGER PRIMARY KEY, so VACUUM may renumber the implicit rowid the
+    external-content index was keyed on. Postgres is unaffected.
+    """
+    if op.get_bind().dialect.name == "sqlite":
+        _replace_index(UPGRADE_STATEMENTS)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name == "sqlite":
+        _replace_index(DOWNGRADE_STATEMENTS)
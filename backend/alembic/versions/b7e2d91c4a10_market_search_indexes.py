@@ -0,0 +1,67 @@
+"""Market search indexes
+
+Revision ID: b7e2d91c4a10
+Revises: f34cfff60b55
+Create Date: 2026-10-19 09:12:44.318205
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7e2d91c4a10'
+down_revision: Union[str, Sequence[str], None] = 'f34cfff60b55'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Must stay equivalent to app.services.search.PG_SEARCH_DOCUMENT (which qualifies the columns
+# with `markets.`) so searches can use the index.
+PG_SEARCH_DOCUMENT = (
+    "to_tsvector('english', coalesce(question, '') || ' ' "
+    "|| coalesce(description, '') || ' ' || coalesce(slug, ''))"
+)
+
+SQLITE_STATEMENTS = (
+    "CREATE VIRTUAL TABLE markets_fts USING fts5("
+    "question, description, slug, content='markets', content_rowid='rowid')",
+    "CREATE TRIGGER markets_fts_ai AFTER INSERT ON markets BEGIN "
+    "INSERT INTO markets_fts(rowid, question, description, slug) "
+    "VALUES (new.rowid, new.question, new.description, new.slug); END",
+    "CREATE TRIGGER markets_fts_ad AFTER DELETE ON markets BEGIN "
+    "INSERT INTO markets_fts(markets_fts, rowid, question, description, slug) "
+    "VALUES ('delete', old.rowid, old.question, old.description, old.slug); END",
+    "CREATE TRIGGER markets_fts_au AFTER UPDATE OF question, description, slug ON markets BEGIN "
+    "INSERT INTO markets_fts(markets_fts, rowid, question, description, slug) "
+    "VALUES ('delete', old.rowid, old.question, old.description, old.slug); "
+    "INSERT INTO markets_fts(rowid, question, description, slug) "
+    "VALUES (new.rowid, new.question, new.description, new.slug); END",
+    "INSERT INTO markets_fts(markets_fts) VALUES ('rebuild')",
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    dialect = op.get_bind().dialect.name
+    if dialect == "postgresql":
+        op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        op.execute(f"CREATE INDEX ix_markets_search_document ON markets USING gin ({PG_SEARCH_DOCUMENT})")
+        op.execute("CREATE INDEX ix_markets_question_trgm ON markets USING gin (question gin_trgm_ops)")
+        op.execute("CREATE INDEX ix_markets_slug_trgm ON markets USING gin (slug gin_trgm_ops)")
+    elif dialect == "sqlite":
+        for statement in SQLITE_STATEMENTS:
+            op.execute(statement)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    dialect = op.get_bind().dialect.name
+    if dialect == "postgresql":
+        op.execute("DROP INDEX IF EXISTS ix_markets_slug_trgm")
+        op.execute("DROP INDEX IF EXISTS ix_markets_question_trgm")
+        op.execute("DROP INDEX IF EXISTS ix_markets_search_document")
+    elif dialect == "sqlite":
+        for trigger in ("markets_fts_au", "markets_fts_ad", "markets_fts_ai"):
+            op.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+        op.execute("DROP TABLE IF EXISTS markets_fts")
@@ -0,0 +1,56 @@
+"""Conditional orders
+
+Revision ID: c4a8e2f91d37
+Revises: b7e2d91c4a10
+Create Date: 2026-10-19 10:58:03.412977
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4a8e2f91d37'
+down_revision: Union[str, Sequence[str], None] = 'b7e2d91c4a10'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('conditional_orders',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('market_id', sa.UUID(), nullable=False),
+    sa.Column('side', sa.String(length=8), nullable=False),
+    sa.Column('type', sa.String(length=8), nullable=False),
+    sa.Column('kind', sa.String(length=16), nullable=False),
+    sa.Column('trigger_price', sa.Numeric(precision=6, scale=2), nullable=False),
+    sa.Column('direction', sa.String(length=8), nullable=False),
+    sa.Column('trigger_yes_price', sa.Numeric(precision=6, scale=2), nullable=False),
+    sa.Column('price', sa.Numeric(precision=6, scale=2), nullable=False),
+    sa.Column('quantity', sa.Integer(), nullable=False),
+    sa.Column('status', sa.String(length=16), nullable=False),
+    sa.Column('order_id', sa.UUID(), nullable=True),
+    sa.Column('rejection_reason', sa.String(length=255), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    sa.Column('triggered_at', sa.DateTime(timezone=True), nullable=True),
+    sa.CheckConstraint('price >= 0', name='ck_conditional_orders_price_positive'),
+    sa.CheckConstraint('quantity > 0', name='ck_conditional_orders_qty_positive'),
+    sa.ForeignKeyConstraint(['market_id'], ['markets.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['order_id'], ['orders.id'], ondelete='SET NULL'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(
+        'ix_conditional_orders_trigger',
+        'conditional_orders',
+        ['market_id', 'status', 'direction', 'trigger_yes_price'],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_conditional_orders_trigger', table_name='conditional_orders')
+    op.drop_table('conditional_orders')
@@ -0,0 +1,30 @@
+"""Market trading mode
+
+Revision ID: d91f3b6a0e52
+Revises: c4a8e2f91d37
+Create Date: 2026-10-19 11:24:37.905114
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd91f3b6a0e52'
+down_revision: Union[str, Sequence[str], None] = 'c4a8e2f91d37'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('markets', sa.Column('trading_mode', sa.String(length=16), server_default='CONTINUOUS', nullable=False))
+    op.add_column('markets', sa.Column('auction_interval_ms', sa.Integer(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('markets', 'auction_interval_ms')
+    op.drop_column('markets', 'trading_mode')
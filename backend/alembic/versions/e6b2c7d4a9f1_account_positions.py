@@ -0,0 +1,94 @@
+"""Per-account positions
+
+Revision ID: e6b2c7d4a9f1
+Revises: d91f3b6a0e52
+Create Date: 2026-10-19 13:02:18.441902
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e6b2c7d4a9f1'
+down_revision: Union[str, Sequence[str], None] = 'd91f3b6a0e52'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Kept equal to app.models.POSITION_PARTITIONS at the time of this revision.
+POSITION_PARTITIONS = 16
+POSITION_COLUMNS = "id, market_id, side, quantity, average_price, realized_pnl, created_at, updated_at"
+
+
+def _position_columns() -> list[sa.Column]:
+    return [
+        sa.Column('id', sa.UUID(), nullable=False),
+        sa.Column('market_id', sa.UUID(), nullable=False),
+        sa.Column('side', sa.String(length=8), nullable=False),
+        sa.Column('quantity', sa.Integer(), nullable=False),
+        sa.Column('average_price', sa.Numeric(precision=6, scale=2), nullable=False),
+        sa.Column('realized_pnl', sa.Numeric(precision=14, scale=2), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.CheckConstraint('quantity >= 0', name='ck_positions_qty_positive'),
+        sa.ForeignKeyConstraint(['market_id'], ['markets.id'], ondelete='CASCADE'),
+    ]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table in ('orders', 'order_book_levels', 'conditional_orders'):
+        op.add_column(table, sa.Column('account_id', sa.String(length=64), server_default='default', nullable=False))
+
+    # Neither a partitioned table nor a new primary key can be made in place: build the
+    # new table and copy the rows over. SQLite gets the same key, just unpartitioned.
+    postgresql = op.get_bind().dialect.name == "postgresql"
+    op.rename_table('positions', 'positions_unpartitioned')
+    if postgresql:
+        op.execute("ALTER INDEX positions_pkey RENAME TO positions_unpartitioned_pkey")
+    op.create_table('positions',
+    sa.Column('account_id', sa.String(length=64), server_default='default', nullable=False),
+    *_position_columns(),
+    sa.PrimaryKeyConstraint('id', 'account_id'),
+    sa.UniqueConstraint('account_id', 'market_id', 'side', name='uq_positions_account_market_side'),
+    postgresql_partition_by='HASH (account_id)',
+    )
+    if postgresql:
+        for remainder in range(POSITION_PARTITIONS):
+            op.execute(
+                f"CREATE TABLE positions_p{remainder} PARTITION OF positions "
+                f"FOR VALUES WITH (MODULUS {POSITION_PARTITIONS}, REMAINDER {remainder})"
+            )
+    op.execute(
+        f"INSERT INTO positions (account_id, {POSITION_COLUMNS}) "
+        f"SELECT 'default', {POSITION_COLUMNS} FROM positions_unpartitioned"
+    )
+    op.drop_table('positions_unpartitioned')
+    op.create_index('ix_positions_market_side', 'positions', ['market_id', 'side'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema.
+
+    Only the default account's holdings fit the single-holder schema; other accounts' rows are dropped.
+    """
+    op.drop_index('ix_positions_market_side', table_name='positions')
+    postgresql = op.get_bind().dialect.name == "postgresql"
+    op.rename_table('positions', 'positions_partitioned')
+    if postgresql:
+        op.execute("ALTER INDEX positions_pkey RENAME TO positions_partitioned_pkey")
+    op.create_table('positions',
+    *_position_columns(),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('market_id', 'side', name='uq_positions_market_side'),
+    )
+    op.execute(
+        f"INSERT INTO positions ({POSITION_COLUMNS}) "
+        f"SELECT {POSITION_COLUMNS} FROM positions_partitioned WHERE account_id = 'default'"
+    )
+    op.drop_table('positions_partitioned')
+
+    for table in ('conditional_orders', 'order_book_levels', 'orders'):
+        op.drop_column(table, 'account_id')
@@ -0,0 +1,74 @@
+"""Content negotiation for compact columnar responses on hot read routes."""
+
+from __future__ import annotations
+
+from typing import Any
+
+import msgpack
+import orjson
+from fastapi import Request, Response
+
+COLUMNAR_JSON = "application/vnd.predicta.columnar+json"
+MSGPACK = "application/msgpack"
+
+_COLUMNAR_MEDIA_TYPES = {
+    COLUMNAR_JSON: COLUMNAR_JSON,
+    MSGPACK: MSGPACK,
+    "application/x-msgpack": MSGPACK,
+}
+
+
+# How specifically an Accept entry names the default JSON; the most specific entry sets its weight.
+_JSON_RANGES = {"application/json": 2, "application/*": 1, "*/*": 0}
+
+
+def negotiate_columnar(request: Request) -> str | None:
+    """Return the columnar media type requested via `Accept`, or None for the default JSON rows.
+
+    Every entry is weighed: a columnar type is chosen only when its `q` beats the one the
+    header gives JSON (directly or through `application/*` or `*/*`), so JSON wins ties.
+    """
+    accept = request.headers.get("accept")
+    if not accept:
+        return None
+    best: str | None = None
+    best_quality = 0.0
+    json_quality = 0.0
+    json_specificity = -1
+    for entry in accept.split(","):
+        media_type, *params = entry.split(";")
+        media_type = media_type.strip().lower()
+        quality = _quality(params)
+        specificity = _JSON_RANGES.get(media_type)
+        if specificity is not None and specificity > json_specificity:
+            json_quality, json_specificity = quality, specificity
+        resolved = _COLUMNAR_MEDIA_TYPES.get(media_type)
+        if resolved is not None and quality > best_quality:
+            best, best_quality = resolved, quality
+    return best if best_quality > json_quality else None
+
+
+def _quality(params: list[str]) -> float:
+    """The `q` weight of one Accept entry; malformed weights count as not acceptable."""
+    for param in params:
+        name, _, value = param.partition("=")
+        if name.strip().lower() == "q":
+            try:
+                return float(value.strip())
+            except ValueError:
+                return 0.0
+    return 1.0
+
+
+def vary_on_accept(response: Response) -> None:
+    """Dependency for routes whose representation depends on `Accept`, including the default JSON."""
+    response.headers["Vary"] = "Accept"
+
+
+def render_columnar(payload: dict[str, Any], media_type: str) -> Response:
+    """Serialize a columnar payload; Decimals and UUIDs are emitted as strings."""
+    if media_type == MSGPACK:
+        body = msgpack.packb(payload, default=str, use_bin_type=True)
+    else:
+        body = orjson.dumps(payload, default=str)
+    return Response(content=body, media_type=media_type, headers={"Vary": "Accept"})
@@ -1,74 +1,293 @@
 from __future__ import annotations
 
+from decimal import Decimal
 from typing import List
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Query, Request, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from ...db import get_session
+from ...db import get_read_session, get_session, record_write
+from ...models import DEFAULT_ACCOUNT, OrderSide, OrderType, TradingMode
 from ...schemas import (
+    ConditionalOrderRequest,
+    ConditionalOrderResponse,
     MarketCreate,
     MarketResponse,
+    MarketSearchHit,
+    MarketSearchResponse,
+    MarketSnapshotResponse,
+    MarketTradeStatsResponse,
     OrderBookLevelResponse,
+    OrderQuoteResponse,
     OrderRequest,
     OrderResponse,
     PositionSummary,
     ResolveRequest,
+    TradingModeRequest,
 )
+from ...services import conditional_orders as conditional_service
 from ...services import markets as market_service
+from ...services import quotes as quote_service
+from ...services import search as search_service
+from ...services.admission import AdmissionController, get_admission_controller
+from ...services.post_trade import PostTradePipeline, TradeEvent, get_post_trade_pipeline
+from ...services.quotes import DepthCache, get_depth_cache
+from ..encoding import COLUMNAR_JSON, MSGPACK, negotiate_columnar, render_columnar, vary_on_accept
 
 router = APIRouter(prefix="/markets", tags=["markets"])
 
+COLUMNAR_RESPONSES = {
+    200: {
+        "content": {COLUMNAR_JSON: {}, MSGPACK: {}},
+        "description": f"Send `Accept: {COLUMNAR_JSON}` or `Accept: {MSGPACK}` for parallel per-field arrays.",
+    }
+}
+
 
 @router.get("", response_model=List[MarketResponse])
-async def list_markets(session: AsyncSession = Depends(get_session)) -> List[MarketResponse]:
+async def list_markets(session: AsyncSession = Depends(get_read_session)) -> List[MarketResponse]:
     markets = await market_service.list_markets(session)
     return list(markets)
 
 
-@router.post("", response_model=MarketResponse, status_code=status.HTTP_201_CREATED)
-async def create_market(payload: MarketCreate, session: AsyncSession = Depends(get_session)) -> MarketResponse:
-    return await market_service.create_market(session, payload)
+@router.post(
+    "",
+    response_model=MarketResponse,
+    status_code=status.HTTP_201_CREATED,
+)
+async def create_market(
+    payload: MarketCreate, response: Response, session: AsyncSession = Depends(get_session)
+) -> MarketResponse:
+    market = await market_service.create_market(session, payload)
+    record_write(response)
+    return market
+
+
+@router.get("/search", response_model=MarketSearchResponse)
+async def search_markets(
+    q: str = Query(min_length=1, max_length=200),
+    limit: int = Query(default=20, ge=1, le=100),
+    offset: int = Query(default=0, ge=0),
+    session: AsyncSession = Depends(get_read_session),
+) -> MarketSearchResponse:
+    # Fetch one extra row to know whether another page exists without counting matches.
+    hits = await search_service.search_markets(session, q, limit + 1, offset)
+    items = [
+        MarketSearchHit.model_validate({**MarketResponse.model_validate(market).model_dump(), "score": score})
+        for market, score in hits[:limit]
+    ]
+    return MarketSearchResponse(
+        items=items,
+        limit=limit,
+        offset=offset,
+        next_offset=offset + limit if len(hits) > limit else None,
+    )
 
 
 @router.get("/{market_id}", response_model=MarketResponse)
-async def fetch_market(market_id: UUID, session: AsyncSession = Depends(get_session)) -> MarketResponse:
+async def fetch_market(market_id: UUID, session: AsyncSession = Depends(get_read_session)) -> MarketResponse:
     return await market_service.get_market(session, market_id)
 
 
-@router.post("/{market_id}/orders", response_model=OrderResponse, status_code=status.HTTP_201_CREATED)
+@router.get("/{market_id}/snapshot", response_model=MarketSnapshotResponse)
+async def fetch_market_snapshot(
+    market_id: UUID,
+    account_id: str = Query(default=DEFAULT_ACCOUNT, min_length=1, max_length=64),
+    session: AsyncSession = Depends(get_read_session),
+) -> MarketSnapshotResponse:
+    snapshot = await market_service.get_market_snapshot(session, market_id, account_id)
+    return MarketSnapshotResponse.model_validate(snapshot)
+
+
+@router.get("/{market_id}/quote", response_model=OrderQuoteResponse)
+async def quote_order(
+    market_id: UUID,
+    side: OrderSide,
+    type: OrderType,
+    price: Decimal = Query(ge=0, le=100),
+    quantity: int = Query(gt=0, le=1_000_000),
+    account_id: str = Query(default=DEFAULT_ACCOUNT, min_length=1, max_length=64),
+    session: AsyncSession = Depends(get_read_session),
+    depth_cache: DepthCache = Depends(get_depth_cache),
+) -> OrderQuoteResponse:
+    depth = await depth_cache.get(session, market_id)
+    held = 0
+    if type == OrderType.SELL:
+        held = await market_service.get_held_quantity(session, market_id, account_id, side)
+    quote = quote_service.quote_order(depth, side, type, price, quantity, held)
+    return OrderQuoteResponse.model_validate(quote)
+
+
+@router.post(
+    "/{market_id}/orders",
+    response_model=OrderResponse,
+    status_code=status.HTTP_201_CREATED,
+    responses={status.HTTP_429_TOO_MANY_REQUESTS: {"description": "Admission limits hit; see `Retry-After`."}},
+)
 async def place_order(
     market_id: UUID,
     payload: OrderRequest,
+    request: Request,
+    response: Response,
     session: AsyncSession = Depends(get_session),
+    admission: AdmissionController = Depends(get_admission_controller),
+    post_trade: PostTradePipeline = Depends(get_post_trade_pipeline),
+    depth_cache: DepthCache = Depends(get_depth_cache),
 ) -> OrderResponse:
-    return await market_service.place_order(session, market_id, payload)
+    # The session connects lazily: the batched paths below never use it, and the direct
+    # path only does once admitted, so no connection is held while waiting for a slot.
+    mode = await admission.market_mode(session, market_id)
+    group_commit = request.app.state.group_commit
+    # An auction order waits out its batch's interval, so it takes no in-flight slot: holding one
+    # would let a busy auction market fill the global gate and turn away other markets' orders.
+    # The committer applies every order on its one batching task, so a market's orders already
+    # run one at a time there; holding the market gate too would leave one order per batch.
+    admitted = admission.admit(
+        market_id,
+        market_slot=not mode.batched and group_commit is None,
+        global_slot=not mode.batched,
+    )
+    async with admitted:
+        if mode.trading_mode == TradingMode.AUCTION:
+            # The scheduler publishes conditional orders the batch triggers itself.
+            order = await request.app.state.auctions.submit(market_id, payload, mode.auction_interval_ms)
+            orders = [order]
+        else:
+            if group_commit is not None:
+                execution = await group_commit.submit(market_id, payload)
+            else:
+                execution = await market_service.place_order(session, market_id, payload)
+            order, orders = execution.order, execution.orders
+    # Fills, resting levels and any triggered conditional orders all changed this market's book.
+    depth_cache.invalidate(market_id)
+    record_write(response)
+    for executed in orders:
+        await post_trade.publish(TradeEvent.from_order(executed))
+    return order
+
+
+@router.put("/{market_id}/trading-mode", response_model=MarketResponse)
+async def set_trading_mode(
+    market_id: UUID,
+    payload: TradingModeRequest,
+    request: Request,
+    response: Response,
+    session: AsyncSession = Depends(get_session),
+    admission: AdmissionController = Depends(get_admission_controller),
+) -> MarketResponse:
+    market = await market_service.set_trading_mode(session, market_id, payload)
+    if market.trading_mode != TradingMode.AUCTION:
+        # Orders still routed by the cached auction mode clear first; nothing awaits between the
+        # drain and recording the new mode, so continuous orders never run alongside a batch.
+        await request.app.state.auctions.drain(market.id)
+    admission.remember_mode(market.id, market.trading_mode, market.auction_interval_ms)
+    record_write(response)
+    return market
+
+
+@router.post(
+    "/{market_id}/conditional-orders",
+    response_model=ConditionalOrderResponse,
+    status_code=status.HTTP_201_CREATED,
+)
+async def create_conditional_order(
+    market_id: UUID,
+    payload: ConditionalOrderRequest,
+    response: Response,
+    session: AsyncSession = Depends(get_session),
+) -> ConditionalOrderResponse:
+    conditional = await conditional_service.create_conditional_order(session, market_id, payload)
+    record_write(response)
+    return conditional
+
+
+@router.get("/{market_id}/conditional-orders", response_model=List[ConditionalOrderResponse])
+async def list_conditional_orders(
+    market_id: UUID,
+    session: AsyncSession = Depends(get_read_session),
+) -> List[ConditionalOrderResponse]:
+    return list(await conditional_service.list_conditional_orders(session, market_id))
+
+
+@router.delete(
+    "/{market_id}/conditional-orders/{conditional_id}",
+    response_model=ConditionalOrderResponse,
+)
+async def cancel_conditional_order(
+    market_id: UUID,
+    conditional_id: UUID,
+    response: Response,
+    session: AsyncSession = Depends(get_session),
+) -> ConditionalOrderResponse:
+    conditional = await conditional_service.cancel_conditional_order(session, market_id, conditional_id)
+    record_write(response)
+    return conditional
 
 
 @router.post("/{market_id}/resolve", response_model=MarketResponse)
 async def resolve_market(
     market_id: UUID,
     payload: ResolveRequest,
+    response: Response,
     session: AsyncSession = Depends(get_session),
+    depth_cache: DepthCache = Depends(get_depth_cache),
 ) -> MarketResponse:
-    return await market_service.resolve_market(session, market_id, payload.outcome)
+    market = await market_service.resolve_market(session, market_id, payload.outcome)
+    depth_cache.invalidate(market_id)
+    record_write(response)
+    return market
 
 
-@router.get("/{market_id}/positions", response_model=List[PositionSummary])
+@router.get(
+    "/{market_id}/positions",
+    response_model=List[PositionSummary],
+    responses=COLUMNAR_RESPONSES,
+    dependencies=[Depends(vary_on_accept)],
+)
 async def get_positions(
     market_id: UUID,
-    session: AsyncSession = Depends(get_session),
-) -> List[PositionSummary]:
-    positions = await market_service.get_positions(session, market_id)
+    request: Request,
+    account_id: str | None = Query(default=None, min_length=1, max_length=64),
+    session: AsyncSession = Depends(get_read_session),
+) -> List[PositionSummary] | Response:
+    media_type = negotiate_columnar(request)
+    if media_type is not None:
+        columns = await market_service.get_position_columns(session, market_id, account_id)
+        return render_columnar({"market_id": market_id, **columns}, media_type)
+    positions = await market_service.get_positions(session, market_id, account_id)
     return [PositionSummary.model_validate(pos) for pos in positions]
 
 
-@router.get("/{market_id}/order-book", response_model=List[OrderBookLevelResponse])
+@router.get(
+    "/{market_id}/order-book",
+    response_model=List[OrderBookLevelResponse],
+    responses=COLUMNAR_RESPONSES,
+    dependencies=[Depends(vary_on_accept)],
+)
 async def get_order_book(
     market_id: UUID,
-    session: AsyncSession = Depends(get_session),
-) -> List[OrderBookLevelResponse]:
+    request: Request,
+    session: AsyncSession = Depends(get_read_session),
+) -> List[OrderBookLevelResponse] | Response:
+    media_type = negotiate_columnar(request)
+    if media_type is not None:
+        columns = await market_service.get_order_book_columns(session, market_id)
+        return render_columnar({"market_id": market_id, **columns}, media_type)
     levels = await market_service.get_order_book_levels(session, market_id)
     return [OrderBookLevelResponse.model_validate(level) for level in levels]
 
+
+@router.get("/{market_id}/stats", response_model=MarketTradeStatsResponse)
+async def get_trade_stats(market_id: UUID, request: Request) -> MarketTradeStatsResponse:
+    stats = request.app.state.trade_stats.for_market(market_id)
+    return MarketTradeStatsResponse(
+        market_id=market_id,
+        orders=stats.orders,
+        filled_quantity=stats.filled_quantity,
+        resting_quantity=stats.resting_quantity,
+        notional=stats.notional,
+        vwap=stats.vwap,
+        last_price=stats.last_price,
+        last_trade_at=stats.last_trade_at,
+    )
@@ -0,0 +1,19 @@
+from __future__ import annotations
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ...db import get_read_session
+from ...schemas import PortfolioAnalyticsResponse
+from ...services import portfolio as portfolio_service
+
+router = APIRouter(prefix="/portfolio", tags=["portfolio"])
+
+
+@router.get("/analytics", response_model=PortfolioAnalyticsResponse)
+async def get_portfolio_analytics(
+    top: int = Query(default=5, ge=0, le=100),
+    account_id: str | None = Query(default=None, min_length=1, max_length=64),
+    session: AsyncSession = Depends(get_read_session),
+) -> PortfolioAnalyticsResponse:
+    return await portfolio_service.get_portfolio_analytics(session, top=top, account_id=account_id)
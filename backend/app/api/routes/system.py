@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+
+from ...db import replica_lag
+from ...services.post_trade import PostTradePipeline, get_post_trade_pipeline
+from ...services.quotes import DepthCache, get_depth_cache
+
+router = APIRouter(prefix="/system", tags=["system"])
+
+
+@router.get("/post-trade")
+async def post_trade_stats(pipeline: PostTradePipeline = Depends(get_post_trade_pipeline)) -> dict[str, int | bool]:
+    return pipeline.snapshot()
+
+
+@router.get("/admission")
+async def admission_stats(request: Request, top: int = Query(20, ge=0, le=1000)) -> dict[str, object]:
+    return request.app.state.admission.snapshot(top)
+
+
+@router.get("/logging")
+async def logging_stats(request: Request) -> dict[str, int | bool | str]:
+    return request.app.state.log_pipeline.snapshot()
+
+
+@router.get("/auctions")
+async def auction_stats(request: Request) -> dict[str, object]:
+    return request.app.state.auctions.snapshot()
+
+
+@router.get("/depth-cache")
+async def depth_cache_stats(depth_cache: DepthCache = Depends(get_depth_cache)) -> dict[str, int | float]:
+    return depth_cache.snapshot()
+
+
+@router.get("/replica-lag")
+async def replica_lag_stats() -> dict[str, float | int | None]:
+    return replica_lag.snapshot()
+
+
+@router.get("/group-commit")
+async def group_commit_stats(request: Request) -> dict[str, float | int | bool]:
+    group_commit = request.app.state.group_commit
+    if group_commit is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Group commit is disabled.")
+    return group_commit.snapshot()
@@ -1,18 +1,178 @@
+import asyncio
+import logging
+import math
+import time
+from contextlib import suppress
 from typing import AsyncGenerator
 
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from fastapi import Request, Response
+from sqlalchemy import event, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import DeclarativeBase
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
-from .config import get_settings
+from .config import Settings, get_settings
+from .log import install_sql_logging
+
+logger = logging.getLogger(__name__)
 
 
 class Base(DeclarativeBase):
     """Base class for SQLAlchemy models."""
 
 
+def is_file_sqlite(url: str) -> bool:
+    """True for a file-backed SQLite URL, the embedded single-node deployment profile."""
+    parsed = make_url(url)
+    return parsed.get_backend_name() == "sqlite" and parsed.database not in (None, "", ":memory:")
+
+
+def sqlite_pragmas(settings: Settings, read_only: bool = False) -> list[str]:
+    pragmas = [
+        "PRAGMA journal_mode=WAL",
+        f"PRAGMA synchronous={settings.sqlite_synchronous}",
+        f"PRAGMA mmap_size={settings.sqlite_mmap_size}",
+        # Negative values are KiB rather than pages.
+        f"PRAGMA cache_size=-{settings.sqlite_cache_size_kib}",
+        f"PRAGMA busy_timeout={settings.sqlite_busy_timeout_ms}",
+        "PRAGMA foreign_keys=ON",
+        "PRAGMA temp_store=MEMORY",
+    ]
+    if read_only:
+        pragmas.append("PRAGMA query_only=ON")
+    return pragmas
+
+
+def create_sqlite_engine(url: str, settings: Settings, *, pool_size: int, read_only: bool = False) -> AsyncEngine:
+    """Create a SQLite engine whose connections all carry the tuned pragmas.
+
+    WAL lets readers run alongside the single writer; the writer engine gets a pool of
+    one so writes queue in-process on pool checkout instead of failing with SQLITE_BUSY.
+    """
+    sqlite_engine = create_async_engine(
+        url,
+        poolclass=AsyncAdaptedQueuePool,
+        pool_size=pool_size,
+        max_overflow=0,
+    )
+    pragmas = sqlite_pragmas(settings, read_only=read_only)
+
+    @event.listens_for(sqlite_engine.sync_engine, "connect")
+    def _apply_pragmas(dbapi_connection, _connection_record) -> None:
+        cursor = dbapi_connection.cursor()
+        try:
+            for pragma in pragmas:
+                cursor.execute(pragma)
+        finally:
+            cursor.close()
+
+    return sqlite_engine
+
+
 settings = get_settings()
-engine = create_async_engine(settings.database_url, echo=settings.app_env == "development")
+if is_file_sqlite(settings.database_url):
+    engine = create_sqlite_engine(settings.database_url, settings, pool_size=1)
+    read_engine = create_sqlite_engine(
+        settings.read_database_url or settings.database_url,
+        settings,
+        pool_size=settings.sqlite_reader_pool_size,
+        read_only=True,
+    )
+else:
+    engine = create_async_engine(settings.database_url)
+    if settings.read_database_url:
+        read_engine = create_async_engine(settings.read_database_url)
+    else:
+        read_engine = engine
+for _engine in {engine, read_engine}:
+    install_sql_logging(_engine, settings.log_sql_sample_rate)
 AsyncSessionLocal = async_sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
+if read_engine is engine:
+    AsyncReadSessionLocal = AsyncSessionLocal
+else:
+    AsyncReadSessionLocal = async_sessionmaker(read_engine, expire_on_commit=False, class_=AsyncSession)
+
+# Set on responses to successful writes so the same client reads its own writes from
+# the primary until the replica has replayed past them.
+LAST_WRITE_COOKIE = "predicta_last_write"
+
+# Seconds the standby's replay is behind its primary; 0 once it has replayed everything it
+# received (an idle primary would otherwise look ever more lagged), and 0 off a standby.
+_REPLICA_LAG = text(
+    "SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) END"
+)
+
+
+class ReplicaLagMonitor:
+    """Polls the replica's replay lag so read-your-writes pinning lasts only as long as needed.
+
+    Until a measurement succeeds (and for replicas it cannot measure, such as SQLite files),
+    `pin_seconds` falls back to `read_replica_max_lag_seconds`.
+    """
+
+    def __init__(self, replica: AsyncEngine | None, poll_seconds: float, fallback_seconds: float) -> None:
+        self.replica = replica
+        self.poll_seconds = poll_seconds
+        self.fallback_seconds = fallback_seconds
+        self.lag_seconds: float | None = None
+        self.failures = 0
+        self._task: asyncio.Task[None] | None = None
+
+    @property
+    def pin_seconds(self) -> float:
+        """How long after a write its client's reads stay on the primary."""
+        if self.lag_seconds is None:
+            return self.fallback_seconds
+        # The measurement may be up to one poll old.
+        return self.lag_seconds + self.poll_seconds
+
+    async def measure(self) -> float | None:
+        if self.replica is None:
+            return None
+        try:
+            async with self.replica.connect() as conn:
+                lag = float((await conn.execute(_REPLICA_LAG)).scalar_one())
+        except Exception as exc:
+            self.failures += 1
+            self.lag_seconds = None
+            logger.warning("Replica lag probe failed: %r", exc)
+            return None
+        self.lag_seconds = max(lag, 0.0)
+        return self.lag_seconds
+
+    def start(self) -> None:
+        if self.replica is not None and self._task is None:
+            self._task = asyncio.create_task(self._run(), name="replica-lag")
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        with suppress(asyncio.CancelledError):
+            await self._task
+        self._task = None
+
+    def snapshot(self) -> dict[str, float | int | None]:
+        return {
+            "lag_seconds": self.lag_seconds,
+            "pin_seconds": self.pin_seconds,
+            "poll_seconds": self.poll_seconds,
+            "failures": self.failures,
+        }
+
+    async def _run(self) -> None:
+        while True:
+            await self.measure()
+            await asyncio.sleep(self.poll_seconds)
+
+
+replica_lag = ReplicaLagMonitor(
+    read_engine if settings.read_database_url and read_engine.dialect.name == "postgresql" else None,
+    settings.read_replica_lag_poll_seconds,
+    settings.read_replica_max_lag_seconds,
+)
 
 
 async def get_session() -> AsyncGenerator[AsyncSession, None]:
@@ -20,3 +180,33 @@ async def get_session() -> AsyncGenerator[AsyncSession, None]:
     async with AsyncSessionLocal() as session:
         yield session
 
+
+def read_sessionmaker_for(request: Request) -> async_sessionmaker[AsyncSession]:
+    """Pick the replica unless it may not have replayed this client's last write yet."""
+    raw = request.cookies.get(LAST_WRITE_COOKIE)
+    if raw:
+        try:
+            last_write = float(raw)
+        except ValueError:
+            last_write = 0.0
+        if time.time() - last_write < replica_lag.pin_seconds:
+            return AsyncSessionLocal
+    return AsyncReadSessionLocal
+
+
+async def get_read_session(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    """FastAPI dependency that yields a session for read-only routes, preferring the replica."""
+    async with read_sessionmaker_for(request)() as session:
+        yield session
+
+
+def record_write(response: Response) -> None:
+    """Pin the client's subsequent reads to the primary; call once a write has committed."""
+    if settings.read_database_url:
+        response.set_cookie(
+            LAST_WRITE_COOKIE,
+            f"{time.time():.3f}",
+            max_age=max(1, math.ceil(replica_lag.pin_seconds)),
+            httponly=True,
+            samesite="lax",
+        )
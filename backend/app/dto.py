@@ -0,0 +1,47 @@
+"""Slotted read-only row objects for list endpoints.
+
+Built straight from column selects, so large order books and position sets skip
+ORM identity-map bookkeeping and per-instance `__dict__` allocation. Pydantic
+response models read them through `from_attributes` like ORM instances.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from decimal import Decimal
+from uuid import UUID
+
+from .models import Market, OrderSide
+
+
+@dataclass(frozen=True, slots=True)
+class PositionRow:
+    market_id: UUID
+    account_id: str
+    side: OrderSide
+    quantity: int
+    average_price: Decimal
+    realized_pnl: Decimal
+
+
+@dataclass(frozen=True, slots=True)
+class OrderBookLevelRow:
+    id: UUID
+    market_id: UUID
+    side: OrderSide
+    price: Decimal
+    quantity: int
+
+
+@dataclass(frozen=True, slots=True)
+class OrderBookDepthRow:
+    side: OrderSide
+    price: Decimal
+    quantity: int
+
+
+@dataclass(frozen=True, slots=True)
+class MarketSnapshot:
+    market: Market
+    positions: list[PositionRow]
+    order_book: list[OrderBookDepthRow]
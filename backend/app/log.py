@@ -0,0 +1,218 @@
+"""Non-blocking structured logging.
+
+Log calls on the event loop only put a record on a bounded in-memory queue; a
+`QueueListener` thread formats each record as one JSON line and writes it out.
+When the queue is full, records are dropped and counted rather than stalling
+the loop. SQL statements and requests are sampled at configurable rates; order
+audit lines (`predicta.audit`) are never sampled.
+"""
+
+from __future__ import annotations
+
+import copy
+import logging
+import queue
+import random
+import sys
+import time
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import IO, Any
+
+import orjson
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from .config import Settings
+
+sql_logger = logging.getLogger("predicta.sql")
+request_logger = logging.getLogger("predicta.request")
+audit_logger = logging.getLogger("predicta.audit")
+
+# Uvicorn's loggers; the pipeline reroutes them through its queue while it runs.
+_UVICORN_LOGGERS = ("uvicorn", "uvicorn.error", "uvicorn.access")
+
+# Attributes every LogRecord has; anything else on a record came from `extra=` and is emitted as a field.
+_RECORD_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime", "taskName"}
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        payload: dict[str, Any] = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRS:
+                payload[key] = value
+        if record.exc_info:
+            payload["exception"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            payload["exception"] = record.exc_text
+        return orjson.dumps(payload, default=str).decode()
+
+
+class DroppingQueueHandler(QueueHandler):
+    """Queue handler that never blocks: records arriving at a full queue are counted and dropped."""
+
+    def __init__(self, log_queue: queue.Queue[logging.LogRecord]) -> None:
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Only resolve what cannot cross threads safely; JSON encoding happens on the listener thread.
+        # Work on a copy, as QueueHandler does: other handlers may still see the original record.
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class _BlockingSentinelListener(QueueListener):
+    def enqueue_sentinel(self) -> None:
+        # The queue may be full at shutdown; wait for room instead of losing the stop signal.
+        self.queue.put(self._sentinel)
+
+
+class Sampler:
+    def __init__(self, rate: float) -> None:
+        self.rate = max(0.0, min(1.0, rate))
+
+    def __bool__(self) -> bool:
+        return self.rate > 0
+
+    def should_log(self) -> bool:
+        return self.rate >= 1.0 or (self.rate > 0 and random.random() < self.rate)
+
+
+class LogPipeline:
+    def __init__(self, level: str, queue_size: int, stream: IO[str] | None = None) -> None:
+        self.level = level.upper()
+        self.queue: queue.Queue[logging.LogRecord] = queue.Queue(maxsize=queue_size)
+        self.handler = DroppingQueueHandler(self.queue)
+        output = logging.StreamHandler(stream or sys.stdout)
+        output.setFormatter(JsonFormatter())
+        self.listener = _BlockingSentinelListener(self.queue, output)
+        # What `start` replaced, per logger: (handlers, level, propagate). None while stopped.
+        self._saved: dict[str, tuple[list[logging.Handler], int, bool]] | None = None
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> "LogPipeline":
+        return cls(settings.log_level, settings.log_queue_size)
+
+    @property
+    def running(self) -> bool:
+        return self._saved is not None
+
+    def start(self) -> None:
+        if self.running:
+            return
+        self._saved = {
+            name: (logger.handlers[:], logger.level, logger.propagate)
+            for name, logger in ((name, logging.getLogger(name or None)) for name in ("", *_UVICORN_LOGGERS))
+        }
+        root = logging.getLogger()
+        root.handlers = [self.handler]
+        root.setLevel(self.level)
+        # Uvicorn installs its own synchronous stream handlers; send its records through the queue too.
+        for name in _UVICORN_LOGGERS:
+            uvicorn_logger = logging.getLogger(name)
+            uvicorn_logger.handlers = []
+            uvicorn_logger.propagate = True
+        self.listener.start()
+
+    def stop(self) -> None:
+        """Write out everything queued, then restore the handlers, levels and propagation `start` changed."""
+        if self._saved is None:
+            return
+        self.listener.stop()
+        for name, (handlers, level, propagate) in self._saved.items():
+            logger = logging.getLogger(name or None)
+            logger.handlers = handlers
+            logger.setLevel(level)
+            logger.propagate = propagate
+        self._saved = None
+
+    def snapshot(self) -> dict[str, int | bool | str]:
+        return {
+            "running": self.running,
+            "level": self.level,
+            "queue_depth": self.queue.qsize(),
+            "queue_capacity": self.queue.maxsize,
+            "dropped": self.handler.dropped,
+        }
+
+
+def install_sql_logging(engine: AsyncEngine, sample_rate: float) -> None:
+    """Log a sample of executed statements with their duration; replaces `echo=True`."""
+    sampler = Sampler(sample_rate)
+    if not sampler:
+        return
+
+    # The start time lives on the execution context, which is discarded with the statement,
+    # so a statement that raises (and never reaches after_cursor_execute) leaves nothing behind.
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany) -> None:
+        if context is not None and sampler.should_log():
+            context.predicta_sql_started = time.perf_counter()
+
+    @event.listens_for(engine.sync_engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany) -> None:
+        started = getattr(context, "predicta_sql_started", None)
+        if started is None:
+            return
+        context.predicta_sql_started = None
+        sql_logger.info(
+            "sql",
+            extra={
+                "statement": statement,
+                "duration_ms": round((time.perf_counter() - started) * 1000, 3),
+                "executemany": executemany,
+            },
+        )
+
+
+class RequestLogMiddleware:
+    """ASGI middleware logging a sample of requests; server errors are always logged."""
+
+    def __init__(self, app: Any, sample_rate: float) -> None:
+        self.app = app
+        self.sampler = Sampler(sample_rate)
+
+    async def __call__(self, scope: dict[str, Any], receive: Any, send: Any) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        started = time.perf_counter()
+        status_code = 500
+
+        async def send_with_status(message: dict[str, Any]) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            if status_code >= 500 or self.sampler.should_log():
+                request_logger.info(
+                    "request",
+                    extra={
+                        "method": scope["method"],
+                        "path": scope["path"],
+                        "status": status_code,
+                        "duration_ms": round((time.perf_counter() - started) * 1000, 3),
+                    },
+                )
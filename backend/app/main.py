@@ -1,14 +1,85 @@
 from __future__ import annotations
 
+import asyncio
+from contextlib import asynccontextmanager, suppress
+
 from fastapi import FastAPI
+from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 
 from .api.routes.markets import router as markets_router
+from .api.routes.portfolio import router as portfolio_router
+from .api.routes.system import router as system_router
+from .config import get_settings
+from .db import AsyncReadSessionLocal, AsyncSessionLocal, engine, read_engine, replica_lag
+from .log import LogPipeline, RequestLogMiddleware
+from .services.admission import AdmissionController
+from .services.auction import AuctionScheduler
+from .services.group_commit import GroupCommitter
+from .services.post_trade import PostTradePipeline, TradeStatistics
+from .services.quotes import DepthCache
+from .warmup import ReadinessState, run_warmup
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    settings = get_settings()
+    readiness: ReadinessState = app.state.readiness
+    app.state.log_pipeline.start()
+    await app.state.post_trade.start()
+    replica_lag.start()
+    if app.state.group_commit is not None:
+        await app.state.group_commit.start()
+    warmup_task = None
+    if settings.warmup_enabled:
+        engines = [engine] if read_engine is engine else [engine, read_engine]
+        sessionmakers = (
+            [AsyncSessionLocal]
+            if AsyncReadSessionLocal is AsyncSessionLocal
+            else [AsyncSessionLocal, AsyncReadSessionLocal]
+        )
+        warmup_task = asyncio.create_task(
+            run_warmup(readiness, engines, sessionmakers, settings, app.state.depth_cache)
+        )
+    else:
+        readiness.ready = True
+    yield
+    # Fail readiness first so load balancers drain this instance while it shuts down.
+    readiness.ready = False
+    if warmup_task is not None:
+        warmup_task.cancel()
+        with suppress(asyncio.CancelledError):
+            await warmup_task
+    await app.state.auctions.stop()
+    if app.state.group_commit is not None:
+        await app.state.group_commit.stop()
+    await app.state.post_trade.stop()
+    await replica_lag.stop()
+    app.state.log_pipeline.stop()
 
 
 def create_app() -> FastAPI:
-    app = FastAPI(title="Predicta Capital Gains API", version="0.1.0")
+    settings = get_settings()
+    app = FastAPI(title="Predicta Capital Gains API", version="0.1.0", lifespan=lifespan)
 
+    app.state.log_pipeline = LogPipeline.from_settings(settings)
+    app.state.readiness = ReadinessState()
+    app.state.admission = AdmissionController.from_settings(settings)
+    app.state.trade_stats = TradeStatistics()
+    app.state.post_trade = PostTradePipeline(
+        handlers=[app.state.trade_stats],
+        max_queue=settings.post_trade_queue_size,
+        batch_size=settings.post_trade_batch_size,
+        flush_interval=settings.post_trade_flush_ms / 1000,
+        publish_timeout=settings.post_trade_publish_timeout_ms / 1000,
+    )
+    app.state.depth_cache = DepthCache.from_settings(settings)
+    app.state.auctions = AuctionScheduler.from_settings(settings, AsyncSessionLocal, app.state.post_trade)
+    app.state.group_commit = (
+        GroupCommitter.from_settings(settings, AsyncSessionLocal) if settings.group_commit_enabled else None
+    )
+
+    app.add_middleware(RequestLogMiddleware, sample_rate=settings.log_request_sample_rate)
     app.add_middleware(
         CORSMiddleware,
         allow_origins=["*"],
@@ -18,11 +89,18 @@ def create_app() -> FastAPI:
     )
 
     app.include_router(markets_router)
+    app.include_router(portfolio_router)
+    app.include_router(system_router)
 
     @app.get("/healthz")
     async def healthcheck() -> dict[str, str]:
         return {"status": "ok"}
 
+    @app.get("/readyz")
+    async def readiness() -> JSONResponse:
+        state: ReadinessState = app.state.readiness
+        return JSONResponse(state.snapshot(), status_code=200 if state.ready else 503)
+
     return app
 
 
@@ -5,28 +5,24 @@ import uuid
 from datetime import datetime
 from decimal import Decimal
 
-from typing import ClassVar
-
 from sqlalchemy import (
+    DDL,
     CheckConstraint,
     DateTime,
     ForeignKey,
+    Index,
     Integer,
     Numeric,
     String,
     Text,
     UniqueConstraint,
+    event,
     func,
 )
 from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.orm import (
-    Mapped,
-    attributes,
-    mapped_column,
-    reconstructor,
-    relationship,
-    validates,
-)
+from sqlalchemy.engine import Dialect
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy.types import TypeDecorator
 
 from .db import Base
 
@@ -51,40 +47,59 @@ class OrderType(str, enum.Enum):
     SELL = "SELL"
 
 
+class TradingMode(str, enum.Enum):
+    CONTINUOUS = "CONTINUOUS"
+    AUCTION = "AUCTION"
+
+
+class ConditionalKind(str, enum.Enum):
+    STOP = "STOP"
+    TAKE_PROFIT = "TAKE_PROFIT"
+
+
+class ConditionalStatus(str, enum.Enum):
+    PENDING = "PENDING"
+    TRIGGERED = "TRIGGERED"
+    REJECTED = "REJECTED"
+    CANCELLED = "CANCELLED"
+
+
+class TriggerDirection(str, enum.Enum):
+    RISE = "RISE"
+    FALL = "FALL"
+
+
+# Orders and holdings that do not name an account belong to this one.
+DEFAULT_ACCOUNT = "default"
+# Hash partitions of `positions` on Postgres; changing it needs a migration that repartitions.
+POSITION_PARTITIONS = 16
+
 DECIMAL_CENTS = Numeric(6, 2, asdecimal=True)
 DECIMAL_PNL = Numeric(14, 2, asdecimal=True)
 
 
-class EnumCoercionMixin:
-    """Ensures enum attributes remain Python enums while persisting strings."""
-
-    _enum_fields: ClassVar[dict[str, type[enum.Enum]]] = {}
+class EnumString(TypeDecorator):
+    """Persists a str enum as its value and hands back enum members when rows are loaded."""
 
-    @staticmethod
-    def _coerce(enum_cls: type[enum.Enum], value: enum.Enum | str | None):
-        if value is None or isinstance(value, enum_cls):
-            return value
-        return enum_cls(value)
+    impl = String
+    cache_ok = True
 
-    def _coerce_all(self) -> None:
-        for attr_name, enum_cls in self._enum_fields.items():
-            value = getattr(self, attr_name, None)
-            if value is None or isinstance(value, enum_cls):
-                continue
-            attributes.set_committed_value(self, attr_name, enum_cls(value))
+    def __init__(self, enum_cls: type[enum.Enum], length: int) -> None:
+        super().__init__(length)
+        self.enum_cls = enum_cls
 
-    @reconstructor
-    def _init_on_load(self) -> None:
-        self._coerce_all()
+    def process_bind_param(self, value: enum.Enum | str | None, dialect: Dialect) -> str | None:
+        if value is None:
+            return None
+        return self.enum_cls(value).value
 
-    def _convert_for_attr(self, key: str, value: enum.Enum | str | None):
-        enum_cls = self._enum_fields.get(key)
-        if enum_cls is None:
-            return value
-        return self._coerce(enum_cls, value)
+    def process_result_value(self, value: str | None, dialect: Dialect) -> enum.Enum | None:
+        if value is None:
+            return None
+        return self.enum_cls(value)
 
 
-class Market(EnumCoercionMixin, Base):
+class Market(Base):
     __tablename__ = "markets"
 
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
@@ -92,14 +107,20 @@ class Market(EnumCoercionMixin, Base):
     question: Mapped[str] = mapped_column(String(255))
     description: Mapped[str | None] = mapped_column(Text())
     status: Mapped[MarketStatus] = mapped_column(
-        String(16),
+        EnumString(MarketStatus, 16),
         default=MarketStatus.OPEN,
     )
     outcome: Mapped[MarketOutcome | None] = mapped_column(
-        String(16)
+        EnumString(MarketOutcome, 16)
     )
     yes_price: Mapped[Decimal] = mapped_column(DECIMAL_CENTS)
     no_price: Mapped[Decimal] = mapped_column(DECIMAL_CENTS)
+    trading_mode: Mapped[TradingMode] = mapped_column(
+        EnumString(TradingMode, 16),
+        default=TradingMode.CONTINUOUS,
+        server_default=TradingMode.CONTINUOUS.value,
+    )
+    auction_interval_ms: Mapped[int | None] = mapped_column(Integer)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
     updated_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
@@ -117,19 +138,45 @@ class Market(EnumCoercionMixin, Base):
         CheckConstraint("yes_price + no_price = 100.00", name="ck_market_complement_prices"),
     )
 
-    _enum_fields = {"status": MarketStatus, "outcome": MarketOutcome}
 
-    @validates("status", "outcome")
-    def _validate_market_enums(self, key: str, value):
-        return self._convert_for_attr(key, value)
+# Postgres searches markets through GIN full-text and trigram indexes created by migration.
+# SQLite (tests, embedded installs) has neither, so it keeps an FTS5 index of the same columns
+# in sync with triggers instead. The index stores its own copy keyed on the market id: `markets`
+# has no INTEGER PRIMARY KEY, so its implicit rowid may be renumbered by VACUUM and cannot be
+# used as an external-content key.
+MARKET_SEARCH_SQLITE_DDL = (
+    "CREATE VIRTUAL TABLE markets_fts USING fts5(market_id UNINDEXED, question, description, slug)",
+    "CREATE TRIGGER markets_fts_ai AFTER INSERT ON markets BEGIN "
+    "INSERT INTO markets_fts(market_id, question, description, slug) "
+    "VALUES (new.id, new.question, new.description, new.slug); END",
+    "CREATE TRIGGER markets_fts_ad AFTER DELETE ON markets BEGIN "
+    "DELETE FROM markets_fts WHERE market_id = old.id; END",
+    "CREATE TRIGGER markets_fts_au AFTER UPDATE OF question, description, slug ON markets BEGIN "
+    "UPDATE markets_fts SET question = new.question, description = new.description, slug = new.slug "
+    "WHERE market_id = old.id; END",
+)
 
+for _statement in MARKET_SEARCH_SQLITE_DDL:
+    event.listen(Market.__table__, "after_create", DDL(_statement).execute_if(dialect="sqlite"))
+event.listen(Market.__table__, "before_drop", DDL("DROP TABLE IF EXISTS markets_fts").execute_if(dialect="sqlite"))
+
+
+class Position(Base):
+    """One account's holding on one side of one market.
+
+    On Postgres the table is hash-partitioned by `account_id`, so the primary key and every
+    unique constraint carry it. Per-order lookups hit the `(account_id, market_id, side)`
+    unique index inside a single partition; settlement reads `(market_id, side)`.
+    """
 
-class Position(EnumCoercionMixin, Base):
     __tablename__ = "positions"
 
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    account_id: Mapped[str] = mapped_column(
+        String(64), primary_key=True, default=DEFAULT_ACCOUNT, server_default=DEFAULT_ACCOUNT
+    )
     market_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("markets.id", ondelete="CASCADE"))
-    side: Mapped[OrderSide] = mapped_column(String(8))
+    side: Mapped[OrderSide] = mapped_column(EnumString(OrderSide, 8))
     quantity: Mapped[int] = mapped_column(Integer, default=0)
     average_price: Mapped[Decimal] = mapped_column(DECIMAL_CENTS, default=Decimal("0.00"))
     realized_pnl: Mapped[Decimal] = mapped_column(DECIMAL_PNL, default=Decimal("0.00"))
@@ -141,24 +188,32 @@ class Position(EnumCoercionMixin, Base):
     market: Mapped[Market] = relationship(back_populates="positions")
 
     __table_args__ = (
-        UniqueConstraint("market_id", "side", name="uq_positions_market_side"),
+        UniqueConstraint("account_id", "market_id", "side", name="uq_positions_account_market_side"),
+        Index("ix_positions_market_side", "market_id", "side"),
         CheckConstraint("quantity >= 0", name="ck_positions_qty_positive"),
+        {"postgresql_partition_by": "HASH (account_id)"},
     )
 
-    _enum_fields = {"side": OrderSide}
 
-    @validates("side")
-    def _validate_side(self, key: str, value):
-        return self._convert_for_attr(key, value)
+for _remainder in range(POSITION_PARTITIONS):
+    event.listen(
+        Position.__table__,
+        "after_create",
+        DDL(
+            f"CREATE TABLE positions_p{_remainder} PARTITION OF positions "
+            f"FOR VALUES WITH (MODULUS {POSITION_PARTITIONS}, REMAINDER {_remainder})"
+        ).execute_if(dialect="postgresql"),
+    )
 
 
-class Order(EnumCoercionMixin, Base):
+class Order(Base):
     __tablename__ = "orders"
 
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     market_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("markets.id", ondelete="CASCADE"))
-    side: Mapped[OrderSide] = mapped_column(String(8))
-    type: Mapped[OrderType] = mapped_column(String(8))
+    account_id: Mapped[str] = mapped_column(String(64), default=DEFAULT_ACCOUNT, server_default=DEFAULT_ACCOUNT)
+    side: Mapped[OrderSide] = mapped_column(EnumString(OrderSide, 8))
+    type: Mapped[OrderType] = mapped_column(EnumString(OrderType, 8))
     price: Mapped[Decimal] = mapped_column(DECIMAL_CENTS)
     quantity: Mapped[int] = mapped_column(Integer)
     resting_quantity: Mapped[int] = mapped_column(Integer, default=0)
@@ -174,38 +229,27 @@ class Order(EnumCoercionMixin, Base):
         CheckConstraint("resting_quantity >= 0", name="ck_orders_resting_qty_positive"),
     )
 
-    _enum_fields = {"side": OrderSide, "type": OrderType}
-
-    @validates("side", "type")
-    def _validate_order_enums(self, key: str, value):
-        return self._convert_for_attr(key, value)
-
 
-class Resolution(EnumCoercionMixin, Base):
+class Resolution(Base):
     __tablename__ = "resolutions"
 
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     market_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("markets.id", ondelete="CASCADE"), unique=True)
-    outcome: Mapped[MarketOutcome] = mapped_column(String(16))
+    outcome: Mapped[MarketOutcome] = mapped_column(EnumString(MarketOutcome, 16))
     payout_yes: Mapped[Decimal] = mapped_column(DECIMAL_PNL)
     payout_no: Mapped[Decimal] = mapped_column(DECIMAL_PNL)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
 
     market: Mapped[Market] = relationship(back_populates="resolution")
 
-    _enum_fields = {"outcome": MarketOutcome}
-
-    @validates("outcome")
-    def _validate_resolution_outcome(self, key: str, value):
-        return self._convert_for_attr(key, value)
-
 
-class OrderBookLevel(EnumCoercionMixin, Base):
+class OrderBookLevel(Base):
     __tablename__ = "order_book_levels"
 
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     market_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("markets.id", ondelete="CASCADE"))
-    side: Mapped[OrderSide] = mapped_column(String(8))
+    account_id: Mapped[str] = mapped_column(String(64), default=DEFAULT_ACCOUNT, server_default=DEFAULT_ACCOUNT)
+    side: Mapped[OrderSide] = mapped_column(EnumString(OrderSide, 8))
     price: Mapped[Decimal] = mapped_column(DECIMAL_CENTS)
     quantity: Mapped[int] = mapped_column(Integer)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
@@ -217,9 +261,42 @@ class OrderBookLevel(EnumCoercionMixin, Base):
         CheckConstraint("price >= 0", name="ck_order_book_levels_price_positive"),
     )
 
-    _enum_fields = {"side": OrderSide}
 
-    @validates("side")
-    def _validate_order_book_side(self, key: str, value):
-        return self._convert_for_attr(key, value)
+class ConditionalOrder(Base):
+    """A stop or take-profit order waiting for the market price to cross its trigger.
 
+    `trigger_price` is quoted on the order's own side; `trigger_yes_price` and `direction`
+    restate it against the market's YES price so one index serves both sides.
+    """
+
+    __tablename__ = "conditional_orders"
+
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    market_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("markets.id", ondelete="CASCADE"))
+    account_id: Mapped[str] = mapped_column(String(64), default=DEFAULT_ACCOUNT, server_default=DEFAULT_ACCOUNT)
+    side: Mapped[OrderSide] = mapped_column(EnumString(OrderSide, 8))
+    type: Mapped[OrderType] = mapped_column(EnumString(OrderType, 8))
+    kind: Mapped[ConditionalKind] = mapped_column(EnumString(ConditionalKind, 16))
+    trigger_price: Mapped[Decimal] = mapped_column(DECIMAL_CENTS)
+    direction: Mapped[TriggerDirection] = mapped_column(EnumString(TriggerDirection, 8))
+    trigger_yes_price: Mapped[Decimal] = mapped_column(DECIMAL_CENTS)
+    price: Mapped[Decimal] = mapped_column(DECIMAL_CENTS)
+    quantity: Mapped[int] = mapped_column(Integer)
+    status: Mapped[ConditionalStatus] = mapped_column(
+        EnumString(ConditionalStatus, 16),
+        default=ConditionalStatus.PENDING,
+    )
+    order_id: Mapped[uuid.UUID | None] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("orders.id", ondelete="SET NULL")
+    )
+    rejection_reason: Mapped[str | None] = mapped_column(String(255))
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+    triggered_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
+
+    __table_args__ = (
+        # Equality on the first three columns leaves a range scan over trigger_yes_price,
+        # so a price move reads exactly the triggers it crossed.
+        Index("ix_conditional_orders_trigger", "market_id", "status", "direction", "trigger_yes_price"),
+        CheckConstraint("quantity > 0", name="ck_conditional_orders_qty_positive"),
+        CheckConstraint("price >= 0", name="ck_conditional_orders_price_positive"),
+    )
@@ -1,11 +1,21 @@
 from __future__ import annotations
 
+from datetime import datetime
 from decimal import Decimal
 from uuid import UUID
 
 from pydantic import BaseModel, Field
 
-from .models import MarketOutcome, MarketStatus, OrderSide, OrderType
+from .models import (
+    DEFAULT_ACCOUNT,
+    ConditionalKind,
+    ConditionalStatus,
+    MarketOutcome,
+    MarketStatus,
+    OrderSide,
+    OrderType,
+    TradingMode,
+)
 
 
 class MarketBase(BaseModel):
@@ -25,12 +35,32 @@ class MarketResponse(MarketBase):
     outcome: MarketOutcome | None
     yes_price: Decimal
     no_price: Decimal
+    trading_mode: TradingMode
+    auction_interval_ms: int | None
 
     class Config:
         from_attributes = True
 
 
+class TradingModeRequest(BaseModel):
+    mode: TradingMode
+    # Only used in AUCTION mode; falls back to `auction_default_interval_ms` when omitted.
+    auction_interval_ms: int | None = Field(default=None, ge=10, le=60_000)
+
+
+class MarketSearchHit(MarketResponse):
+    score: float
+
+
+class MarketSearchResponse(BaseModel):
+    items: list[MarketSearchHit]
+    limit: int
+    offset: int
+    next_offset: int | None
+
+
 class OrderRequest(BaseModel):
+    account_id: str = Field(default=DEFAULT_ACCOUNT, min_length=1, max_length=64)
     side: OrderSide
     type: OrderType
     price: Decimal = Field(ge=0, le=100)
@@ -40,6 +70,7 @@ class OrderRequest(BaseModel):
 class OrderResponse(BaseModel):
     id: UUID
     market_id: UUID
+    account_id: str
     side: OrderSide
     type: OrderType
     price: Decimal
@@ -52,12 +83,42 @@ class OrderResponse(BaseModel):
         from_attributes = True
 
 
+class ConditionalOrderRequest(BaseModel):
+    account_id: str = Field(default=DEFAULT_ACCOUNT, min_length=1, max_length=64)
+    side: OrderSide
+    type: OrderType
+    kind: ConditionalKind
+    trigger_price: Decimal = Field(gt=0, lt=100)
+    price: Decimal = Field(ge=0, le=100)
+    quantity: int = Field(gt=0, le=1_000_000)
+
+
+class ConditionalOrderResponse(BaseModel):
+    id: UUID
+    market_id: UUID
+    account_id: str
+    side: OrderSide
+    type: OrderType
+    kind: ConditionalKind
+    trigger_price: Decimal
+    price: Decimal
+    quantity: int
+    status: ConditionalStatus
+    order_id: UUID | None
+    rejection_reason: str | None
+    triggered_at: datetime | None
+
+    class Config:
+        from_attributes = True
+
+
 class ResolveRequest(BaseModel):
     outcome: MarketOutcome
 
 
 class PositionSummary(BaseModel):
     market_id: UUID
+    account_id: str
     side: OrderSide
     quantity: int
     average_price: Decimal
@@ -77,3 +138,82 @@ class OrderBookLevelResponse(BaseModel):
     class Config:
         from_attributes = True
 
+
+class OrderBookDepthResponse(BaseModel):
+    side: OrderSide
+    price: Decimal
+    quantity: int
+
+    class Config:
+        from_attributes = True
+
+
+class MarketSnapshotResponse(BaseModel):
+    market: MarketResponse
+    positions: list[PositionSummary]
+    order_book: list[OrderBookDepthResponse]
+
+    class Config:
+        from_attributes = True
+
+
+class QuoteFillResponse(BaseModel):
+    price: Decimal
+    quantity: int
+
+    class Config:
+        from_attributes = True
+
+
+class OrderQuoteResponse(BaseModel):
+    market_id: UUID
+    side: OrderSide
+    type: OrderType
+    limit_price: Decimal
+    quantity: int
+    fills: list[QuoteFillResponse]
+    book_quantity: int
+    synthetic_quantity: int
+    resting_quantity: int
+    book_vwap: Decimal | None
+    average_price: Decimal | None
+    total_cost: Decimal
+    reference_price: Decimal
+    slippage: Decimal | None
+    would_fill: bool
+
+    class Config:
+        from_attributes = True
+
+
+class MarketTradeStatsResponse(BaseModel):
+    market_id: UUID
+    orders: int
+    filled_quantity: int
+    resting_quantity: int
+    notional: Decimal
+    vwap: Decimal | None
+    last_price: Decimal | None
+    last_trade_at: datetime | None
+
+
+class PortfolioMarketExposure(BaseModel):
+    market_id: UUID
+    exposure: Decimal
+    unrealized_pnl: Decimal
+    max_payout: Decimal
+
+
+class PortfolioAnalyticsResponse(BaseModel):
+    market_count: int
+    position_count: int
+    cost_basis: Decimal
+    market_value: Decimal
+    unrealized_pnl: Decimal
+    realized_pnl: Decimal
+    payout_if_yes: Decimal
+    payout_if_no: Decimal
+    worst_case_payout: Decimal
+    herfindahl_index: float
+    top_market_share: float
+    top_exposures: list[PortfolioMarketExposure]
@@ -0,0 +1,299 @@
+"""Admission control for order placement.
+
+Every order must pass a global and a per-market token bucket, then take an
+in-flight slot at both levels. Slots have a short bounded wait queue; anything
+beyond the rate, the queue or the wait timeout is answered with 429 and a
+`Retry-After` hint instead of piling onto the connection pool. An order turned
+away by the queue gets its tokens back, and per-market state is kept for at most
+`max_markets` markets, evicting the least recently used idle ones.
+
+Which gates an order takes depends on its market's trading mode, so the
+controller also keeps each market's mode in memory. Admission itself never
+touches the database: only a cache miss reads the mode, and that connection goes
+back to the pool before the order waits for a slot. Entries expire after
+`trading_mode_ttl` so a mode changed by another process is picked up.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import heapq
+import math
+import time
+from collections import OrderedDict
+from contextlib import AsyncExitStack, asynccontextmanager
+from dataclasses import dataclass, field
+from typing import AsyncIterator
+from uuid import UUID
+
+from fastapi import HTTPException, Request, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..config import Settings
+from ..models import TradingMode
+from . import markets as market_service
+
+
+def _too_many_requests(detail: str, retry_after: float) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        detail=detail,
+        headers={"Retry-After": str(max(1, math.ceil(retry_after)))},
+    )
+
+
+@dataclass
+class TokenBucket:
+    rate: float
+    capacity: float
+    tokens: float = field(init=False)
+    updated: float = field(default_factory=time.monotonic)
+
+    def __post_init__(self) -> None:
+        self.tokens = self.capacity
+
+    def refill(self, now: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def refund(self) -> None:
+        self.tokens = min(self.capacity, self.tokens + 1)
+
+    def wait_time(self) -> float:
+        """Seconds until one token is available; 0 when one is available now."""
+        if self.tokens >= 1:
+            return 0.0
+        return (1 - self.tokens) / self.rate if self.rate > 0 else math.inf
+
+
+@dataclass
+class InFlightGate:
+    limit: int
+    max_waiting: int
+    in_flight: int = 0
+    waiting: int = 0
+
+    def __post_init__(self) -> None:
+        self._semaphore = asyncio.Semaphore(self.limit)
+
+    @asynccontextmanager
+    async def slot(self, timeout: float) -> AsyncIterator[None]:
+        if self._semaphore.locked():
+            if self.waiting >= self.max_waiting:
+                raise _too_many_requests("Order queue is full.", 1)
+            self.waiting += 1
+            try:
+                await asyncio.wait_for(self._semaphore.acquire(), timeout)
+            except asyncio.TimeoutError:
+                raise _too_many_requests("Timed out waiting for an order slot.", timeout) from None
+            finally:
+                self.waiting -= 1
+        else:
+            await self._semaphore.acquire()
+        self.in_flight += 1
+        try:
+            yield
+        finally:
+            self.in_flight -= 1
+            self._semaphore.release()
+
+
+@dataclass(frozen=True, slots=True)
+class MarketMode:
+    trading_mode: TradingMode
+    auction_interval_ms: int | None
+    loaded_at: float = field(default_factory=time.monotonic, compare=False)
+
+    @property
+    def batched(self) -> bool:
+        """Auction orders wait for their batch to clear, so they pass on rate alone and take no in-flight slot."""
+        return self.trading_mode == TradingMode.AUCTION
+
+
+@dataclass
+class AdmissionCounters:
+    admitted: int = 0
+    rejected_rate: int = 0
+    rejected_queue: int = 0
+
+
+@dataclass
+class _Scope:
+    bucket: TokenBucket
+    gate: InFlightGate
+    counters: AdmissionCounters = field(default_factory=AdmissionCounters)
+
+    @property
+    def idle(self) -> bool:
+        return not self.gate.in_flight and not self.gate.waiting
+
+    def snapshot(self) -> dict[str, float | int]:
+        return {
+            "in_flight": self.gate.in_flight,
+            "queue_depth": self.gate.waiting,
+            "tokens": round(self.bucket.tokens, 2),
+            "admitted": self.counters.admitted,
+            "rejected_rate": self.counters.rejected_rate,
+            "rejected_queue": self.counters.rejected_queue,
+        }
+
+
+class AdmissionController:
+    def __init__(
+        self,
+        *,
+        global_rate: float,
+        global_burst: int,
+        global_max_in_flight: int,
+        market_rate: float,
+        market_burst: int,
+        market_max_in_flight: int,
+        max_queue: int,
+        queue_timeout: float,
+        max_markets: int = 10_000,
+        trading_mode_ttl: float = 5.0,
+    ) -> None:
+        self.market_rate = market_rate
+        self.market_burst = market_burst
+        self.market_max_in_flight = market_max_in_flight
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.max_markets = max_markets
+        self.trading_mode_ttl = trading_mode_ttl
+        self.global_scope = _Scope(
+            bucket=TokenBucket(rate=global_rate, capacity=global_burst),
+            gate=InFlightGate(limit=global_max_in_flight, max_waiting=max_queue),
+        )
+        # Least recently admitted first; market ids come from clients, so this must stay bounded.
+        self.markets: OrderedDict[UUID, _Scope] = OrderedDict()
+        self.evicted_markets = 0
+        self._modes: OrderedDict[UUID, MarketMode] = OrderedDict()
+        self.mode_hits = 0
+        self.mode_misses = 0
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> "AdmissionController":
+        return cls(
+            global_rate=settings.admission_global_rate,
+            global_burst=settings.admission_global_burst,
+            global_max_in_flight=settings.admission_global_max_in_flight,
+            market_rate=settings.admission_market_rate,
+            market_burst=settings.admission_market_burst,
+            market_max_in_flight=settings.admission_market_max_in_flight,
+            max_queue=settings.admission_max_queue,
+            queue_timeout=settings.admission_queue_timeout_seconds,
+            max_markets=settings.admission_max_markets,
+            trading_mode_ttl=settings.admission_trading_mode_ttl_seconds,
+        )
+
+    async def market_mode(self, session: AsyncSession, market_id: UUID) -> MarketMode:
+        """Return the market's trading mode, reading it through `session` only on a cache miss.
+
+        After a miss the session's connection is released, so nothing is held while the
+        order then waits for admission.
+        """
+        mode = self._modes.get(market_id)
+        if mode is not None and time.monotonic() - mode.loaded_at < self.trading_mode_ttl:
+            self._modes.move_to_end(market_id)
+            self.mode_hits += 1
+            return mode
+        self.mode_misses += 1
+        trading_mode, auction_interval_ms = await market_service.get_trading_mode(session, market_id)
+        await session.commit()
+        return self.remember_mode(market_id, trading_mode, auction_interval_ms)
+
+    def remember_mode(self, market_id: UUID, trading_mode: TradingMode, auction_interval_ms: int | None) -> MarketMode:
+        """Record a market's current mode; the trading-mode route calls this after every change."""
+        mode = MarketMode(trading_mode, auction_interval_ms)
+        self._modes[market_id] = mode
+        self._modes.move_to_end(market_id)
+        while len(self._modes) > self.max_markets:
+            self._modes.popitem(last=False)
+        return mode
+
+    def _market_scope(self, market_id: UUID) -> _Scope:
+        scope = self.markets.get(market_id)
+        if scope is not None:
+            self.markets.move_to_end(market_id)
+            return scope
+        scope = _Scope(
+            bucket=TokenBucket(rate=self.market_rate, capacity=self.market_burst),
+            gate=InFlightGate(limit=self.market_max_in_flight, max_waiting=self.max_queue),
+        )
+        self.markets[market_id] = scope
+        self._evict()
+        return scope
+
+    def _evict(self) -> None:
+        """Drop the least recently used idle scopes until at most `max_markets` remain."""
+        excess = len(self.markets) - self.max_markets
+        if excess <= 0:
+            return
+        # A scope with orders in flight or queued is kept, or its gate would stop limiting them.
+        evict: list[UUID] = []
+        for market_id, scope in self.markets.items():
+            if len(evict) == excess:
+                break
+            if scope.idle:
+                evict.append(market_id)
+        for market_id in evict:
+            del self.markets[market_id]
+        self.evicted_markets += len(evict)
+
+    @asynccontextmanager
+    async def admit(
+        self, market_id: UUID, *, market_slot: bool = True, global_slot: bool = True
+    ) -> AsyncIterator[None]:
+        """Admit one order; the `*_slot` flags skip an in-flight gate, never the rate limits."""
+        market_scope = self._market_scope(market_id)
+        scopes = (market_scope, self.global_scope)
+
+        now = time.monotonic()
+        for scope in scopes:
+            scope.bucket.refill(now)
+        wait = max(scope.bucket.wait_time() for scope in scopes)
+        if wait > 0:
+            for scope in scopes:
+                scope.counters.rejected_rate += 1
+            raise _too_many_requests("Order rate limit exceeded.", wait)
+        for scope in scopes:
+            scope.bucket.tokens -= 1
+
+        # Market slot first: a hot market queues on its own gate without holding a global slot.
+        async with AsyncExitStack() as stack:
+            gated = (market_scope,) * market_slot + (self.global_scope,) * global_slot
+            for scope in gated:
+                try:
+                    await stack.enter_async_context(scope.gate.slot(self.queue_timeout))
+                except HTTPException:
+                    # Turned away before doing any work, so the order does not count against the rate.
+                    for rejected in scopes:
+                        rejected.bucket.refund()
+                        rejected.counters.rejected_queue += 1
+                    raise
+            for scope in scopes:
+                scope.counters.admitted += 1
+            yield
+
+    def snapshot(self, top: int = 20) -> dict[str, object]:
+        """Global counters plus the `top` busiest markets by in-flight and queued orders.
+
+        Ties go to the most recently admitted market, so a quiet system still shows its latest ones.
+        """
+        busiest = heapq.nlargest(
+            top,
+            enumerate(self.markets.items()),
+            key=lambda entry: (entry[1][1].gate.in_flight + entry[1][1].gate.waiting, entry[0]),
+        )
+        return {
+            "global": self.global_scope.snapshot(),
+            "tracked_markets": len(self.markets),
+            "evicted_markets": self.evicted_markets,
+            "trading_modes": {"cached": len(self._modes), "hits": self.mode_hits, "misses": self.mode_misses},
+            "markets": {str(market_id): scope.snapshot() for _, (market_id, scope) in busiest},
+        }
+
+
+def get_admission_controller(request: Request) -> AdmissionController:
+    """FastAPI dependency returning the application's admission controller."""
+    return request.app.state.admission
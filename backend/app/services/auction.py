@@ -0,0 +1,193 @@
+"""Periodic call auctions for markets in AUCTION trading mode.
+
+The first order for an auction market opens a batch and schedules its clearing
+`auction_interval_ms` later. Every order arriving before then joins the batch;
+`markets.run_call_auction` clears the whole batch at one price in a single
+transaction, and each caller gets back its own order (or rejection) once that
+transaction has committed. Conditional orders the clearing price triggers belong
+to no caller, so the scheduler audits them and publishes them to the post-trade
+pipeline itself. Work per batch is one uncrossing pass, however many orders it
+holds.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from decimal import Decimal
+from uuid import UUID
+
+from fastapi import HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from ..config import Settings
+from ..models import Order
+from ..schemas import OrderRequest
+from . import markets as market_service
+from .post_trade import PostTradePipeline, TradeEvent
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _PendingAuctionOrder:
+    payload: OrderRequest
+    future: asyncio.Future[Order]
+
+
+@dataclass
+class _AuctionBatch:
+    orders: list[_PendingAuctionOrder] = field(default_factory=list)
+    task: asyncio.Task[None] | None = None
+
+
+@dataclass
+class AuctionStats:
+    auctions: int = 0
+    orders: int = 0
+    rejected: int = 0
+    failed: int = 0
+    matched_volume: int = 0
+    max_batch_size: int = 0
+    last_batch_size: int = 0
+    last_matched_volume: int = 0
+    last_clearing_price: Decimal | None = None
+
+    def snapshot(self) -> dict[str, object]:
+        return {
+            "auctions": self.auctions,
+            "orders": self.orders,
+            "rejected": self.rejected,
+            "failed": self.failed,
+            "matched_volume": self.matched_volume,
+            "avg_batch_size": round(self.orders / self.auctions, 3) if self.auctions else 0.0,
+            "max_batch_size": self.max_batch_size,
+            "last_batch_size": self.last_batch_size,
+            "last_matched_volume": self.last_matched_volume,
+            "last_clearing_price": self.last_clearing_price,
+        }
+
+
+class AuctionScheduler:
+    def __init__(
+        self,
+        sessionmaker: async_sessionmaker[AsyncSession],
+        default_interval_ms: int,
+        post_trade: PostTradePipeline | None = None,
+    ) -> None:
+        self.sessionmaker = sessionmaker
+        self.default_interval_ms = default_interval_ms
+        self.post_trade = post_trade
+        self.markets: dict[UUID, AuctionStats] = {}
+        self._batches: dict[UUID, _AuctionBatch] = {}
+        # Consecutive batches of one market clear one after the other, never concurrently.
+        self._locks: dict[UUID, asyncio.Lock] = {}
+        self._tasks: set[asyncio.Task[None]] = set()
+        self._closed = False
+
+    @classmethod
+    def from_settings(
+        cls,
+        settings: Settings,
+        sessionmaker: async_sessionmaker[AsyncSession],
+        post_trade: PostTradePipeline | None = None,
+    ) -> "AuctionScheduler":
+        return cls(sessionmaker, settings.auction_default_interval_ms, post_trade)
+
+    async def submit(self, market_id: UUID, payload: OrderRequest, interval_ms: int | None = None) -> Order:
+        """Add an order to the market's open batch and wait for that batch to clear."""
+        if self._closed:
+            raise RuntimeError("Auction scheduler is shut down.")
+        batch = self._batches.get(market_id)
+        if batch is None:
+            batch = _AuctionBatch()
+            self._batches[market_id] = batch
+            interval = (interval_ms or self.default_interval_ms) / 1000
+            batch.task = asyncio.create_task(self._clear_after(market_id, interval), name=f"auction-{market_id}")
+            self._tasks.add(batch.task)
+            batch.task.add_done_callback(self._tasks.discard)
+        future: asyncio.Future[Order] = asyncio.get_running_loop().create_future()
+        batch.orders.append(_PendingAuctionOrder(payload, future))
+        return await future
+
+    async def drain(self, market_id: UUID) -> None:
+        """Clear the market's open batch now and wait until no batch of it is clearing.
+
+        Called before a market leaves auction mode, so no batch matches its book alongside
+        the continuous orders admitted once the new mode is recorded.
+        """
+        while True:
+            batch = self._batches.pop(market_id, None)
+            if batch is not None:
+                # Still in `_batches`, so its task is only sleeping.
+                if batch.task is not None:
+                    batch.task.cancel()
+                await self._clear(market_id, batch.orders)
+                continue
+            lock = self._locks.get(market_id)
+            if lock is None or not lock.locked():
+                return
+            async with lock:
+                pass
+
+    async def stop(self) -> None:
+        """Clear every open batch now instead of waiting out its interval."""
+        self._closed = True
+        batches = list(self._batches.items())
+        self._batches.clear()
+        # Tasks still in `_batches` are only sleeping; ones already clearing are left to finish.
+        for _, batch in batches:
+            if batch.task is not None:
+                batch.task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        for market_id, batch in batches:
+            await self._clear(market_id, batch.orders)
+
+    def snapshot(self) -> dict[str, object]:
+        return {
+            "open_batches": {str(market_id): len(batch.orders) for market_id, batch in self._batches.items()},
+            "markets": {str(market_id): stats.snapshot() for market_id, stats in self.markets.items()},
+        }
+
+    async def _clear_after(self, market_id: UUID, interval: float) -> None:
+        await asyncio.sleep(interval)
+        batch = self._batches.pop(market_id)
+        await self._clear(market_id, batch.orders)
+
+    async def _clear(self, market_id: UUID, orders: list[_PendingAuctionOrder]) -> None:
+        stats = self.markets.setdefault(market_id, AuctionStats())
+        lock = self._locks.setdefault(market_id, asyncio.Lock())
+        try:
+            async with lock, self.sessionmaker() as session:
+                result = await market_service.run_call_auction(session, market_id, [item.payload for item in orders])
+                await session.commit()
+        except Exception as exc:
+            stats.failed += 1
+            logger.exception("Call auction for market %s with %d orders failed", market_id, len(orders))
+            for item in orders:
+                if not item.future.done():
+                    item.future.set_exception(exc)
+            return
+
+        stats.auctions += 1
+        stats.orders += len(orders)
+        stats.last_batch_size = len(orders)
+        stats.max_batch_size = max(stats.max_batch_size, len(orders))
+        stats.matched_volume += result.matched_volume
+        stats.last_matched_volume = result.matched_volume
+        if result.clearing_price is not None:
+            stats.last_clearing_price = result.clearing_price
+        for item, outcome in zip(orders, result.outcomes):
+            if isinstance(outcome, HTTPException):
+                stats.rejected += 1
+                if not item.future.done():
+                    item.future.set_exception(outcome)
+            else:
+                market_service.audit_order(outcome, "auction")
+                if not item.future.done():
+                    item.future.set_result(outcome)
+        for order in result.triggered:
+            market_service.audit_order(order, "conditional")
+            if self.post_trade is not None:
+                await self.post_trade.publish(TradeEvent.from_order(order))
@@ -0,0 +1,105 @@
+"""Stop and take-profit orders.
+
+A conditional order rests in `conditional_orders` until the market price crosses
+its trigger; `markets.execute_order` then matches it in the transaction that moved
+the price. Triggers are quoted on the order's own side and stored restated against
+the YES price, so a single (market, status, direction, price) index serves both sides.
+"""
+
+from __future__ import annotations
+
+from decimal import Decimal
+from typing import Sequence
+from uuid import UUID
+
+from fastapi import HTTPException, status
+from sqlalchemy import bindparam, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..models import (
+    ConditionalKind,
+    ConditionalOrder,
+    ConditionalStatus,
+    MarketStatus,
+    OrderSide,
+    OrderType,
+    TriggerDirection,
+)
+from ..schemas import ConditionalOrderRequest
+from . import markets as market_service
+from .matching import HUNDRED, quantize
+
+_CONDITIONALS_FOR_MARKET = (
+    select(ConditionalOrder)
+    .where(ConditionalOrder.market_id == bindparam("market_id"))
+    .order_by(ConditionalOrder.created_at.desc())
+)
+
+
+def trigger_on_yes_price(
+    side: OrderSide, order_type: OrderType, kind: ConditionalKind, trigger_price: Decimal
+) -> tuple[TriggerDirection, Decimal]:
+    """Restate a side-quoted trigger as a direction and level of the YES price.
+
+    Stops fire when the side's price moves against the holder (a falling price for a
+    SELL, a rising one for a BUY); take-profits fire on the opposite move.
+    """
+    side_rises = (kind == ConditionalKind.STOP) == (order_type == OrderType.BUY)
+    if side == OrderSide.YES:
+        return (TriggerDirection.RISE if side_rises else TriggerDirection.FALL), quantize(trigger_price)
+    return (TriggerDirection.FALL if side_rises else TriggerDirection.RISE), quantize(HUNDRED - trigger_price)
+
+
+async def create_conditional_order(
+    session: AsyncSession, market_id: UUID, payload: ConditionalOrderRequest
+) -> ConditionalOrder:
+    market = await market_service.get_market(session, market_id)
+    if market.status != MarketStatus.OPEN:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Market is resolved.")
+
+    direction, trigger_yes_price = trigger_on_yes_price(payload.side, payload.type, payload.kind, payload.trigger_price)
+    already_crossed = (
+        market.yes_price >= trigger_yes_price
+        if direction == TriggerDirection.RISE
+        else market.yes_price <= trigger_yes_price
+    )
+    if already_crossed:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="Trigger price has already been reached; place a regular order instead.",
+        )
+
+    conditional = ConditionalOrder(
+        market_id=market_id,
+        account_id=payload.account_id,
+        side=payload.side,
+        type=payload.type,
+        kind=payload.kind,
+        trigger_price=quantize(payload.trigger_price),
+        direction=direction,
+        trigger_yes_price=trigger_yes_price,
+        price=quantize(payload.price),
+        quantity=payload.quantity,
+        status=ConditionalStatus.PENDING,
+    )
+    session.add(conditional)
+    await session.commit()
+    await session.refresh(conditional)
+    return conditional
+
+
+async def list_conditional_orders(session: AsyncSession, market_id: UUID) -> Sequence[ConditionalOrder]:
+    result = await session.execute(_CONDITIONALS_FOR_MARKET, {"market_id": market_id})
+    return result.scalars().all()
+
+
+async def cancel_conditional_order(session: AsyncSession, market_id: UUID, conditional_id: UUID) -> ConditionalOrder:
+    conditional = await session.get(ConditionalOrder, conditional_id)
+    if conditional is None or conditional.market_id != market_id:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Conditional order not found")
+    if conditional.status != ConditionalStatus.PENDING:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Conditional order is no longer pending.")
+    conditional.status = ConditionalStatus.CANCELLED
+    await session.commit()
+    await session.refresh(conditional)
+    return conditional
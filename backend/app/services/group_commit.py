@@ -0,0 +1,176 @@
+"""Opt-in group commit for order placement.
+
+With `group_commit_enabled`, the order route hands its request to a
+`GroupCommitter` instead of committing on its own session. Orders arriving
+within `group_commit_window_ms` of the first queued one (up to
+`group_commit_max_batch`, for any mix of markets) are executed on one session,
+each inside its own savepoint, and made durable by a single commit. Every
+caller is answered only after that commit, so an acknowledged order is never
+lost; an order rejected by the matching rules rolls back its savepoint alone
+and fails only its own request.
+
+Batches run one after another on a single task and orders within a batch in
+arrival order, so orders for one market never execute concurrently. The route
+therefore submits without taking the market's in-flight gate, which lets
+same-market orders share a batch.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from uuid import UUID
+
+from fastapi import HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from ..config import Settings
+from ..schemas import OrderRequest
+from . import markets as market_service
+from .markets import OrderExecution
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _PendingOrder:
+    market_id: UUID
+    payload: OrderRequest
+    future: asyncio.Future[OrderExecution]
+
+
+@dataclass
+class GroupCommitCounters:
+    batches: int = 0
+    orders: int = 0
+    rejected: int = 0
+    failed_commits: int = 0
+    last_batch_size: int = 0
+    max_batch_size: int = 0
+
+
+@dataclass
+class GroupCommitter:
+    sessionmaker: async_sessionmaker[AsyncSession]
+    max_batch: int = 64
+    window: float = 0.002
+    counters: GroupCommitCounters = field(default_factory=GroupCommitCounters)
+
+    def __post_init__(self) -> None:
+        self._pending: list[_PendingOrder] = []
+        self._wakeup = asyncio.Event()
+        self._full = asyncio.Event()
+        self._task: asyncio.Task[None] | None = None
+        self._closed = False
+
+    @classmethod
+    def from_settings(
+        cls, settings: Settings, sessionmaker: async_sessionmaker[AsyncSession]
+    ) -> "GroupCommitter":
+        return cls(
+            sessionmaker=sessionmaker,
+            max_batch=settings.group_commit_max_batch,
+            window=settings.group_commit_window_ms / 1000,
+        )
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    async def start(self) -> None:
+        if self.running:
+            return
+        self._closed = False
+        self._task = asyncio.create_task(self._run(), name="group-commit")
+
+    async def submit(self, market_id: UUID, payload: OrderRequest) -> OrderExecution:
+        """Queue an order for the next batch and wait until its batch has committed."""
+        if self._closed:
+            raise RuntimeError("Group committer is shut down.")
+        if not self.running:
+            await self.start()
+        future: asyncio.Future[OrderExecution] = asyncio.get_running_loop().create_future()
+        self._pending.append(_PendingOrder(market_id, payload, future))
+        self._wakeup.set()
+        if len(self._pending) >= self.max_batch:
+            self._full.set()
+        return await future
+
+    async def stop(self) -> None:
+        """Commit whatever is queued, then stop the batching task."""
+        self._closed = True
+        if self._task is None:
+            return
+        self._full.set()
+        self._wakeup.set()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+
+    def snapshot(self) -> dict[str, float | int | bool]:
+        batches = self.counters.batches
+        return {
+            "running": self.running,
+            "pending": len(self._pending),
+            "max_batch": self.max_batch,
+            "window_ms": round(self.window * 1000, 3),
+            "batches": batches,
+            "orders": self.counters.orders,
+            "rejected": self.counters.rejected,
+            "failed_commits": self.counters.failed_commits,
+            "avg_batch_size": round(self.counters.orders / batches, 3) if batches else 0.0,
+            "last_batch_size": self.counters.last_batch_size,
+            "max_batch_size": self.counters.max_batch_size,
+        }
+
+    async def _run(self) -> None:
+        while True:
+            if not self._pending:
+                if self._closed:
+                    return
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+            # The window opens with the first queued order; a full batch closes it early.
+            if len(self._pending) < self.max_batch and not self._closed:
+                try:
+                    await asyncio.wait_for(self._full.wait(), self.window)
+                except asyncio.TimeoutError:
+                    pass
+            batch = self._pending[: self.max_batch]
+            del self._pending[: self.max_batch]
+            if len(self._pending) < self.max_batch:
+                self._full.clear()
+            await self._commit_batch(batch)
+
+    async def _commit_batch(self, batch: list[_PendingOrder]) -> None:
+        executed: list[tuple[_PendingOrder, OrderExecution]] = []
+        async with self.sessionmaker() as session:
+            try:
+                for item in batch:
+                    try:
+                        async with session.begin_nested():
+                            execution = await market_service.execute_order(session, item.market_id, item.payload)
+                    except HTTPException as exc:
+                        self.counters.rejected += 1
+                        if not item.future.done():
+                            item.future.set_exception(exc)
+                        continue
+                    executed.append((item, execution))
+                await session.commit()
+            except Exception as exc:
+                self.counters.failed_commits += 1
+                logger.exception("Group commit of %d orders failed", len(executed))
+                for item in batch:
+                    if not item.future.done():
+                        item.future.set_exception(exc)
+                return
+
+        self.counters.batches += 1
+        self.counters.orders += len(executed)
+        self.counters.last_batch_size = len(executed)
+        self.counters.max_batch_size = max(self.counters.max_batch_size, len(executed))
+        for item, execution in executed:
+            market_service.audit_execution(execution, "group_commit")
+            if not item.future.done():
+                item.future.set_result(execution)
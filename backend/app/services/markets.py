@@ -1,16 +1,24 @@
 from __future__ import annotations
 
 import re
-from decimal import Decimal, ROUND_HALF_UP
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from decimal import Decimal
 from typing import Sequence
 from uuid import UUID
 
 from fastapi import HTTPException, status
-from sqlalchemy import func, select
+from sqlalchemy import bindparam, case, cast, func, literal, literal_column, null, select, union_all, update
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
 
+from ..dto import MarketSnapshot, OrderBookDepthRow, OrderBookLevelRow, PositionRow
+from ..log import audit_logger
 from ..models import (
+    DECIMAL_PNL,
+    DEFAULT_ACCOUNT,
+    ConditionalOrder,
+    ConditionalStatus,
     Market,
     MarketOutcome,
     MarketStatus,
@@ -20,15 +28,189 @@ from ..models import (
     OrderType,
     Position,
     Resolution,
+    TradingMode,
+    TriggerDirection,
+)
+from ..schemas import MarketCreate, OrderRequest, TradingModeRequest
+from .matching import (
+    HUNDRED,
+    AuctionInterest,
+    apply_trade as _apply_trade,
+    calculate_trade_price as _calculate_trade_price,
+    clear_call_auction,
+    complement_side,
+    quantize as _quantize,
+    update_market_price_from_fill as _update_market_price_from_fill,
 )
-from ..schemas import MarketCreate, OrderRequest
 
-HUNDRED = Decimal("100.00")
-CENT = Decimal("0.01")
+# Matching-path and hot read statements are built once with bound parameters. Reusing
+# the same construct skips per-call select() building and keeps the compiled-cache hit cheap.
+_SLUG_EXISTS = select(Market.id).where(Market.slug == bindparam("slug")).limit(1)
+# Position lookups always lead with `account_id`: it is the partition key on Postgres, so each
+# one is an index probe inside a single partition however many accounts hold the market.
+_POSITION_BY_SIDE = select(Position).where(
+    Position.account_id == bindparam("account_id"),
+    Position.market_id == bindparam("market_id"),
+    Position.side == bindparam("side"),
+)
+_HELD_QUANTITY = select(Position.quantity).where(
+    Position.account_id == bindparam("account_id"),
+    Position.market_id == bindparam("market_id"),
+    Position.side == bindparam("side"),
+)
+# What an account already has resting on a side is reserved: it cannot be sold twice.
+_RESTING_QUANTITY = select(func.coalesce(func.sum(OrderBookLevel.quantity), 0)).where(
+    OrderBookLevel.account_id == bindparam("account_id"),
+    OrderBookLevel.market_id == bindparam("market_id"),
+    OrderBookLevel.side == bindparam("side"),
+)
+_POSITIONS_FOR_ACCOUNTS = select(Position).where(
+    Position.account_id.in_(bindparam("account_ids", expanding=True)),
+    Position.market_id == bindparam("market_id"),
+)
+_BEST_LEVEL = (
+    select(OrderBookLevel)
+    .where(
+        OrderBookLevel.market_id == bindparam("market_id"),
+        OrderBookLevel.side == bindparam("side"),
+        OrderBookLevel.price >= bindparam("min_price"),
+    )
+    .order_by(OrderBookLevel.price.asc(), OrderBookLevel.created_at.asc())
+    .limit(1)
+)
+_BOOK_LEVEL_ROWS = (
+    select(
+        OrderBookLevel.id,
+        OrderBookLevel.market_id,
+        OrderBookLevel.side,
+        OrderBookLevel.price,
+        OrderBookLevel.quantity,
+    )
+    .where(OrderBookLevel.market_id == bindparam("market_id"))
+    .order_by(OrderBookLevel.side.asc(), OrderBookLevel.price.asc(), OrderBookLevel.created_at.asc())
+)
+_BOOK_COLUMNS = (
+    select(OrderBookLevel.side, OrderBookLevel.price, OrderBookLevel.quantity)
+    .where(OrderBookLevel.market_id == bindparam("market_id"))
+    .order_by(OrderBookLevel.side.asc(), OrderBookLevel.price.asc(), OrderBookLevel.created_at.asc())
+)
+_POSITION_ROWS = (
+    select(
+        Position.market_id,
+        Position.account_id,
+        Position.side,
+        Position.quantity,
+        Position.average_price,
+        Position.realized_pnl,
+    )
+    .where(Position.market_id == bindparam("market_id"))
+    .order_by(Position.account_id, Position.side)
+)
+_ACCOUNT_POSITION_ROWS = _POSITION_ROWS.where(Position.account_id == bindparam("account_id"))
+_POSITION_COLUMNS = (
+    select(Position.account_id, Position.side, Position.quantity, Position.average_price, Position.realized_pnl)
+    .where(Position.market_id == bindparam("market_id"))
+    .order_by(Position.account_id, Position.side)
+)
+_ACCOUNT_POSITION_COLUMNS = _POSITION_COLUMNS.where(Position.account_id == bindparam("account_id"))
+_TRADING_MODE = select(Market.trading_mode, Market.auction_interval_ms).where(Market.id == bindparam("market_id"))
+_RESTING_LEVELS = (
+    select(OrderBookLevel)
+    .where(OrderBookLevel.market_id == bindparam("market_id"))
+    .order_by(OrderBookLevel.created_at.asc())
+)
+_CROSSED_RISING = (
+    select(ConditionalOrder)
+    .where(
+        ConditionalOrder.market_id == bindparam("market_id"),
+        ConditionalOrder.status == ConditionalStatus.PENDING,
+        ConditionalOrder.direction == TriggerDirection.RISE,
+        ConditionalOrder.trigger_yes_price <= bindparam("high"),
+    )
+    .order_by(ConditionalOrder.trigger_yes_price.asc(), ConditionalOrder.created_at.asc())
+)
+_CROSSED_FALLING = (
+    select(ConditionalOrder)
+    .where(
+        ConditionalOrder.market_id == bindparam("market_id"),
+        ConditionalOrder.status == ConditionalStatus.PENDING,
+        ConditionalOrder.direction == TriggerDirection.FALL,
+        ConditionalOrder.trigger_yes_price >= bindparam("low"),
+    )
+    .order_by(ConditionalOrder.trigger_yes_price.desc(), ConditionalOrder.created_at.asc())
+)
+_CANCEL_PENDING_CONDITIONALS = (
+    update(ConditionalOrder)
+    .where(
+        ConditionalOrder.market_id == bindparam("resolved_market_id"),
+        ConditionalOrder.status == ConditionalStatus.PENDING,
+    )
+    .values(status=ConditionalStatus.CANCELLED)
+)
 
+# Settlement is set-based: one aggregate for the payouts and one UPDATE across every holder,
+# both driven by the (market_id, side) index instead of loading positions into the session.
+_SETTLEMENT_TOTALS = (
+    select(Position.side, func.sum(Position.quantity))
+    .where(Position.market_id == bindparam("market_id"))
+    .group_by(Position.side)
+)
+_SETTLE_POSITIONS = (
+    update(Position)
+    .where(Position.market_id == bindparam("resolved_market_id"), Position.quantity > 0)
+    .values(
+        realized_pnl=Position.realized_pnl
+        + (
+            case(
+                (Position.side == bindparam("winning_side"), literal(HUNDRED, DECIMAL_PNL)),
+                else_=literal(Decimal("0.00"), DECIMAL_PNL),
+            )
+            - Position.average_price
+        )
+        * Position.quantity,
+        quantity=0,
+        average_price=Decimal("0.00"),
+    )
+    # Rows are settled in the database only; nothing in this session holds them.
+    .execution_options(synchronize_session=False)
+)
 
-def _quantize(amount: Decimal) -> Decimal:
-    return amount.quantize(CENT, rounding=ROUND_HALF_UP)
+# Detail-page snapshot: positions and the book aggregated per (side, price) are unioned into
+# one row set and outer-joined to the market, so the whole page is a single round trip.
+_SNAPSHOT_ROWS = union_all(
+    select(
+        literal_column("'position'").label("kind"),
+        Position.market_id,
+        Position.side,
+        Position.average_price.label("price"),
+        Position.quantity,
+        Position.realized_pnl,
+    ).where(Position.market_id == bindparam("market_id"), Position.account_id == bindparam("account_id")),
+    select(
+        literal_column("'level'"),
+        OrderBookLevel.market_id,
+        OrderBookLevel.side,
+        OrderBookLevel.price,
+        func.sum(OrderBookLevel.quantity),
+        cast(null(), DECIMAL_PNL),
+    )
+    .where(OrderBookLevel.market_id == bindparam("market_id"))
+    .group_by(OrderBookLevel.market_id, OrderBookLevel.side, OrderBookLevel.price),
+).subquery("snapshot_rows")
+_MARKET_SNAPSHOT = (
+    select(
+        Market,
+        _SNAPSHOT_ROWS.c.kind,
+        _SNAPSHOT_ROWS.c.side,
+        _SNAPSHOT_ROWS.c.price,
+        _SNAPSHOT_ROWS.c.quantity,
+        _SNAPSHOT_ROWS.c.realized_pnl,
+    )
+    .select_from(Market)
+    .outerjoin(_SNAPSHOT_ROWS, _SNAPSHOT_ROWS.c.market_id == Market.id)
+    .where(Market.id == bindparam("market_id"))
+    .order_by(_SNAPSHOT_ROWS.c.kind, _SNAPSHOT_ROWS.c.side, _SNAPSHOT_ROWS.c.price)
+)
 
 
 async def list_markets(session: AsyncSession) -> Sequence[Market]:
@@ -37,11 +219,7 @@ async def list_markets(session: AsyncSession) -> Sequence[Market]:
 
 
 async def get_market(session: AsyncSession, market_id: UUID) -> Market:
-    result = await session.execute(
-        select(Market)
-        .options(selectinload(Market.positions))
-        .where(Market.id == market_id)
-    )
+    result = await session.execute(select(Market).where(Market.id == market_id))
     market = result.scalars().first()
     if not market:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Market not found")
@@ -85,8 +263,79 @@ async def create_market(session: AsyncSession, payload: MarketCreate) -> Market:
     return market
 
 
-async def place_order(session: AsyncSession, market_id: UUID, payload: OrderRequest) -> Order:
+@dataclass
+class OrderExecution:
+    order: Order
+    # Conditional orders the order's price move triggered, matched in the same transaction.
+    triggered: list[Order]
+
+    @property
+    def orders(self) -> list[Order]:
+        return [self.order, *self.triggered]
+
+
+async def place_order(session: AsyncSession, market_id: UUID, payload: OrderRequest) -> OrderExecution:
+    execution = await execute_order(session, market_id, payload)
+    await session.commit()
+    await session.refresh(execution.order)
+    audit_execution(execution, "continuous")
+    return execution
+
+
+def audit_order(order: Order, source: str) -> None:
+    """Write the audit line for a committed order; call only after the commit succeeded."""
+    audit_logger.info(
+        "order",
+        extra={
+            "order_id": order.id,
+            "market_id": order.market_id,
+            "account_id": order.account_id,
+            "side": order.side.value,
+            "type": order.type.value,
+            "price": order.price,
+            "quantity": order.quantity,
+            "resting_quantity": order.resting_quantity,
+            "total_cost": order.total_cost,
+            "realized_pnl": order.realized_pnl,
+            "source": source,
+        },
+    )
+
+
+def audit_execution(execution: OrderExecution, source: str) -> None:
+    """Audit an order and the conditional orders it triggered, once their commit succeeded."""
+    audit_order(execution.order, source)
+    for order in execution.triggered:
+        audit_order(order, "conditional")
+
+
+async def execute_order(session: AsyncSession, market_id: UUID, payload: OrderRequest) -> OrderExecution:
+    """Match and persist an order inside the caller's transaction without committing it.
+
+    Conditional orders whose trigger the resulting price moves cross are matched in the
+    same transaction before this returns, and come back as `OrderExecution.triggered`.
+    """
     market = await get_market(session, market_id)
+    band = _PriceBand(market.yes_price, market.yes_price)
+    order = await _match_order(session, market, payload, band)
+    triggered = await _fire_triggers(session, market, band)
+    return OrderExecution(order, triggered)
+
+
+@dataclass
+class _PriceBand:
+    """Lowest and highest YES price a market passed through during one transaction."""
+
+    low: Decimal
+    high: Decimal
+
+    def include(self, yes_price: Decimal) -> None:
+        self.low = min(self.low, yes_price)
+        self.high = max(self.high, yes_price)
+
+
+async def _match_order(session: AsyncSession, market: Market, payload: OrderRequest, band: _PriceBand) -> Order:
+    # Every rejection happens before the first write, so a rejected order leaves no trace.
     if market.status != MarketStatus.OPEN:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Market is resolved.")
 
@@ -95,14 +344,19 @@ async def place_order(session: AsyncSession, market_id: UUID, payload: OrderRequ
     if complement < 0:
         raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="Price must be <= 100.")
 
-    position = await _get_position(session, market_id, payload.side)
-    if payload.type == OrderType.SELL and payload.quantity > position.quantity:
+    position = await _get_position(session, market.id, payload.account_id, payload.side)
+    held = position.quantity if position is not None else 0
+    if payload.type == OrderType.SELL:
+        held -= await _resting_quantity(session, market.id, payload.account_id, payload.side)
+    if payload.type == OrderType.SELL and payload.quantity > held:
         raise HTTPException(
             status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
             detail="Cannot sell more contracts than currently held.",
         )
+    if position is None:
+        position = await _create_position(session, market.id, payload.account_id, payload.side)
 
-    comp_side = OrderSide.NO if payload.side == OrderSide.YES else OrderSide.YES
+    comp_side = complement_side(payload.side)
     target_price = complement
 
     remaining_qty = payload.quantity
@@ -111,7 +365,7 @@ async def place_order(session: AsyncSession, market_id: UUID, payload: OrderRequ
     realized_total = Decimal("0.00")
 
     while remaining_qty > 0:
-        level = await _get_best_level(session, market_id, comp_side, target_price)
+        level = await _get_best_level(session, market.id, comp_side, target_price)
         if not level:
             break
 
@@ -123,8 +377,10 @@ async def place_order(session: AsyncSession, market_id: UUID, payload: OrderRequ
         realized_total += realized
         remaining_qty -= fill_qty
 
-        await _consume_level(session, level, fill_qty)
+        # The maker sells the complement of what the taker pays, so the two legs add up to 100.
+        await _consume_level(session, level, fill_qty, _quantize(HUNDRED - actual_price))
         _update_market_price_from_fill(market, payload.side, actual_price)
+        band.include(market.yes_price)
 
     resting_qty = 0
     if remaining_qty > 0:
@@ -134,10 +390,13 @@ async def place_order(session: AsyncSession, market_id: UUID, payload: OrderRequ
             executed_cost += limit_price * remaining_qty
             realized_total += realized
             _update_market_price_from_fill(market, payload.side, limit_price)
+            band.include(market.yes_price)
             remaining_qty = 0
         else:
             resting_qty = remaining_qty
-            await _add_order_book_level(session, market.id, payload.side, limit_price, resting_qty)
+            await _add_order_book_level(
+                session, market.id, payload.account_id, payload.side, limit_price, resting_qty
+            )
             remaining_qty = 0
 
     if executed_qty == 0:
@@ -147,7 +406,8 @@ async def place_order(session: AsyncSession, market_id: UUID, payload: OrderRequ
         order_price = _quantize(executed_cost / Decimal(executed_qty))
 
     order = Order(
-        market_id=market_id,
+        market_id=market.id,
+        account_id=payload.account_id,
         side=payload.side,
         type=payload.type,
         price=order_price,
@@ -157,10 +417,194 @@ async def place_order(session: AsyncSession, market_id: UUID, payload: OrderRequ
         realized_pnl=_quantize(realized_total),
     )
     session.add(order)
+    await session.flush()
+    return order
+
+
+async def _fire_triggers(session: AsyncSession, market: Market, band: _PriceBand) -> list[Order]:
+    """Match every pending conditional order the band crossed, including ones crossed by those fills.
+
+    Pending RISE triggers always sit above the current YES price and FALL triggers below it,
+    so the crossed set is a range read on the trigger index rather than a scan.
+    """
+    fired: list[Order] = []
+    while market.status == MarketStatus.OPEN:
+        params = {"market_id": market.id, "high": band.high, "low": band.low}
+        rising = (await session.execute(_CROSSED_RISING, params)).scalars().all()
+        falling = (await session.execute(_CROSSED_FALLING, params)).scalars().all()
+        crossed = [*rising, *falling]
+        if not crossed:
+            break
+        now = datetime.now(timezone.utc)
+        for conditional in crossed:
+            conditional.triggered_at = now
+            payload = OrderRequest(
+                account_id=conditional.account_id,
+                side=conditional.side,
+                type=conditional.type,
+                price=conditional.price,
+                quantity=conditional.quantity,
+            )
+            try:
+                order = await _match_order(session, market, payload, band)
+            except HTTPException as exc:
+                conditional.status = ConditionalStatus.REJECTED
+                conditional.rejection_reason = str(exc.detail)
+                continue
+            conditional.status = ConditionalStatus.TRIGGERED
+            conditional.order_id = order.id
+            fired.append(order)
+        await session.flush()
+    return fired
+
+
+async def get_trading_mode(session: AsyncSession, market_id: UUID) -> tuple[TradingMode, int | None]:
+    result = await session.execute(_TRADING_MODE, {"market_id": market_id})
+    row = result.first()
+    if row is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Market not found")
+    return row.trading_mode, row.auction_interval_ms
 
+
+async def set_trading_mode(session: AsyncSession, market_id: UUID, payload: TradingModeRequest) -> Market:
+    market = await get_market(session, market_id)
+    if market.status != MarketStatus.OPEN:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Market is resolved.")
+    market.trading_mode = payload.mode
+    market.auction_interval_ms = payload.auction_interval_ms if payload.mode == TradingMode.AUCTION else None
     await session.commit()
-    await session.refresh(order)
-    return order
+    await session.refresh(market)
+    return market
+
+
+@dataclass
+class CallAuctionResult:
+    clearing_price: Decimal | None
+    matched_volume: int
+    # One entry per submitted order, in submission order: the persisted order or its rejection.
+    outcomes: list[Order | HTTPException]
+    # Conditional orders the clearing price move triggered, matched in the same transaction.
+    triggered: list[Order] = field(default_factory=list)
+
+
+async def run_call_auction(
+    session: AsyncSession, market_id: UUID, payloads: Sequence[OrderRequest]
+) -> CallAuctionResult:
+    """Clear a batch of orders at one price inside the caller's transaction without committing it.
+
+    Orders and resting levels are restated as YES-price interest: YES orders and resting
+    YES levels bid, NO orders and resting NO levels offer at the complement, which pairs
+    them exactly as continuous matching does. Remainders are then handled as in
+    `execute_order`: BUYs fill at their limit and SELLs rest on the book.
+    """
+    market = await get_market(session, market_id)
+    if market.status != MarketStatus.OPEN:
+        rejection = HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Market is resolved.")
+        return CallAuctionResult(clearing_price=None, matched_volume=0, outcomes=[rejection] * len(payloads))
+
+    account_ids = sorted({payload.account_id for payload in payloads})
+    positions = {
+        (position.account_id, position.side): position
+        for position in await _get_account_positions(session, market_id, account_ids)
+    }
+    sellable = {key: position.quantity for key, position in positions.items()}
+    levels = (await session.execute(_RESTING_LEVELS, {"market_id": market_id})).scalars().all()
+    for level in levels:
+        if (level.account_id, level.side) in sellable:
+            sellable[(level.account_id, level.side)] -= level.quantity
+
+    # Resting levels are older than anything in the batch, so they lead in time priority.
+    bids = [AuctionInterest(level.id, level.price, level.quantity) for level in levels if level.side == OrderSide.YES]
+    asks = [
+        AuctionInterest(level.id, _quantize(HUNDRED - level.price), level.quantity)
+        for level in levels
+        if level.side == OrderSide.NO
+    ]
+    outcomes: list[Order | HTTPException | None] = [None] * len(payloads)
+    for idx, payload in enumerate(payloads):
+        if payload.type == OrderType.SELL:
+            key = (payload.account_id, payload.side)
+            if payload.quantity > sellable.get(key, 0):
+                outcomes[idx] = HTTPException(
+                    status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                    detail="Cannot sell more contracts than currently held.",
+                )
+                continue
+            sellable[key] -= payload.quantity
+        limit_price = _quantize(payload.price)
+        if payload.side == OrderSide.YES:
+            bids.append(AuctionInterest(idx, limit_price, payload.quantity))
+        else:
+            asks.append(AuctionInterest(idx, _quantize(HUNDRED - limit_price), payload.quantity))
+
+    clearing = clear_call_auction(bids, asks, market.yes_price)
+    for level in levels:
+        filled = clearing.allocations.get(level.id)
+        if filled:
+            assert clearing.price is not None
+            # Resting makers fill at the uniform clearing price, like every order in the batch.
+            await _consume_level(session, level, filled, _auction_fill_price(level.side, clearing.price))
+
+    band = _PriceBand(market.yes_price, market.yes_price)
+    for idx, payload in enumerate(payloads):
+        if outcomes[idx] is not None:
+            continue
+        position = positions.get((payload.account_id, payload.side))
+        if position is None:
+            # Only BUYs get here without a holding; SELLs were checked against `sellable` above.
+            position = await _create_position(session, market.id, payload.account_id, payload.side)
+            positions[(payload.account_id, payload.side)] = position
+        limit_price = _quantize(payload.price)
+        executed_qty = clearing.allocations.get(idx, 0)
+        executed_cost = Decimal("0.00")
+        realized_total = Decimal("0.00")
+        if executed_qty:
+            assert clearing.price is not None
+            fill_price = _auction_fill_price(payload.side, clearing.price)
+            realized_total += _apply_trade(position, payload.type, fill_price, executed_qty)
+            executed_cost += fill_price * executed_qty
+
+        remaining_qty = payload.quantity - executed_qty
+        resting_qty = 0
+        if remaining_qty > 0:
+            if payload.type == OrderType.BUY:
+                realized_total += _apply_trade(position, OrderType.BUY, limit_price, remaining_qty)
+                executed_qty += remaining_qty
+                executed_cost += limit_price * remaining_qty
+                _update_market_price_from_fill(market, payload.side, limit_price)
+                band.include(market.yes_price)
+            else:
+                resting_qty = remaining_qty
+                await _add_order_book_level(
+                    session, market.id, payload.account_id, payload.side, limit_price, resting_qty
+                )
+
+        order = Order(
+            market_id=market.id,
+            account_id=payload.account_id,
+            side=payload.side,
+            type=payload.type,
+            price=limit_price if executed_qty == 0 else _quantize(executed_cost / Decimal(executed_qty)),
+            quantity=executed_qty,
+            resting_quantity=resting_qty,
+            total_cost=_quantize(executed_cost),
+            realized_pnl=_quantize(realized_total),
+        )
+        session.add(order)
+        outcomes[idx] = order
+
+    if clearing.price is not None:
+        # The batch settles at its clearing price, whatever the synthetic remainders did.
+        _update_market_price_from_fill(market, OrderSide.YES, clearing.price)
+        band.include(market.yes_price)
+    await session.flush()
+    triggered = await _fire_triggers(session, market, band)
+    return CallAuctionResult(
+        clearing_price=clearing.price,
+        matched_volume=clearing.volume,
+        outcomes=[outcome for outcome in outcomes if outcome is not None],
+        triggered=triggered,
+    )
 
 
 async def resolve_market(session: AsyncSession, market_id: UUID, outcome: MarketOutcome) -> Market:
@@ -168,50 +612,140 @@ async def resolve_market(session: AsyncSession, market_id: UUID, outcome: Market
     if market.status == MarketStatus.RESOLVED:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Market already resolved.")
 
-    payout_yes = Decimal("0.00")
-    payout_no = Decimal("0.00")
-
-    positions = await _get_positions(session, market_id)
-    for position in positions:
-        winning = position.side.value == outcome.value
-        payout_price = HUNDRED if winning else Decimal("0.00")
-        pnl = (payout_price - position.average_price) * Decimal(position.quantity)
-        position.realized_pnl = _quantize(position.realized_pnl + pnl)
-        if position.side == OrderSide.YES:
-            payout_yes = _quantize(payout_price * Decimal(position.quantity))
-        else:
-            payout_no = _quantize(payout_price * Decimal(position.quantity))
-        position.quantity = 0
-        position.average_price = _quantize(Decimal("0.00"))
+    winning_side = OrderSide(outcome.value)
+    totals = dict((await session.execute(_SETTLEMENT_TOTALS, {"market_id": market.id})).all())
+    payouts = {
+        side: _quantize(HUNDRED * Decimal(totals.get(side) or 0)) if side == winning_side else Decimal("0.00")
+        for side in OrderSide
+    }
+    await session.execute(_SETTLE_POSITIONS, {"resolved_market_id": market.id, "winning_side": winning_side})
 
     market.status = MarketStatus.RESOLVED
     market.outcome = outcome
     resolution = Resolution(
         market_id=market.id,
         outcome=outcome,
-        payout_yes=payout_yes,
-        payout_no=payout_no,
+        payout_yes=payouts[OrderSide.YES],
+        payout_no=payouts[OrderSide.NO],
     )
     session.add(resolution)
+    await session.execute(_CANCEL_PENDING_CONDITIONALS, {"resolved_market_id": market.id})
     await session.commit()
     await session.refresh(market)
     return market
 
 
-async def get_positions(session: AsyncSession, market_id: UUID) -> Sequence[Position]:
-    positions = await _get_positions(session, market_id)
-    return positions
+async def get_positions(session: AsyncSession, market_id: UUID, account_id: str | None = None) -> list[PositionRow]:
+    """Return every holder's positions in the market, or only `account_id`'s."""
+    if account_id is None:
+        result = await session.execute(_POSITION_ROWS, {"market_id": market_id})
+    else:
+        result = await session.execute(_ACCOUNT_POSITION_ROWS, {"market_id": market_id, "account_id": account_id})
+    return [PositionRow(*row) for row in result]
 
 
-async def get_order_book_levels(session: AsyncSession, market_id: UUID) -> list[OrderBookLevel]:
-    stmt = (
-        select(OrderBookLevel)
-        .where(OrderBookLevel.market_id == market_id)
-        .order_by(OrderBookLevel.side.asc(), OrderBookLevel.price.asc(), OrderBookLevel.created_at.asc())
+async def get_held_quantity(session: AsyncSession, market_id: UUID, account_id: str, side: OrderSide) -> int:
+    """Return how many contracts the account can still sell: its holding less what is already resting."""
+    result = await session.execute(
+        _HELD_QUANTITY, {"market_id": market_id, "account_id": account_id, "side": side}
     )
-    result = await session.execute(stmt)
-    # Return ORM instances so pydantic can leverage `from_attributes`.
-    return list(result.scalars().all())
+    held = result.scalar_one_or_none() or 0
+    return held - await _resting_quantity(session, market_id, account_id, side)
+
+
+async def get_order_book_levels(session: AsyncSession, market_id: UUID) -> list[OrderBookLevelRow]:
+    result = await session.execute(_BOOK_LEVEL_ROWS, {"market_id": market_id})
+    # Slotted rows instead of ORM instances; pydantic still reads them via `from_attributes`.
+    return [OrderBookLevelRow(*row) for row in result]
+
+
+async def get_order_book_columns(session: AsyncSession, market_id: UUID) -> dict[str, dict[str, list]]:
+    """Return resting levels as parallel price/quantity arrays per side, skipping ORM hydration."""
+    result = await session.execute(_BOOK_COLUMNS, {"market_id": market_id})
+    book: dict[str, dict[str, list]] = {side.value: {"price": [], "quantity": []} for side in OrderSide}
+    for side, price, quantity in result:
+        column = book[side.value]
+        column["price"].append(price)
+        column["quantity"].append(quantity)
+    return book
+
+
+async def get_position_columns(
+    session: AsyncSession, market_id: UUID, account_id: str | None = None
+) -> dict[str, list]:
+    """Return positions as parallel arrays keyed by field, skipping ORM hydration."""
+    if account_id is None:
+        result = await session.execute(_POSITION_COLUMNS, {"market_id": market_id})
+    else:
+        result = await session.execute(_ACCOUNT_POSITION_COLUMNS, {"market_id": market_id, "account_id": account_id})
+    columns: dict[str, list] = {
+        "account_id": [],
+        "side": [],
+        "quantity": [],
+        "average_price": [],
+        "realized_pnl": [],
+    }
+    for account, side, quantity, average_price, realized_pnl in result:
+        columns["account_id"].append(account)
+        columns["side"].append(side.value)
+        columns["quantity"].append(quantity)
+        columns["average_price"].append(average_price)
+        columns["realized_pnl"].append(realized_pnl)
+    return columns
+
+
+async def get_market_snapshot(
+    session: AsyncSession, market_id: UUID, account_id: str = DEFAULT_ACCOUNT
+) -> MarketSnapshot:
+    """Return the market, `account_id`'s positions and the aggregated book from one statement."""
+    result = await session.execute(_MARKET_SNAPSHOT, {"market_id": market_id, "account_id": account_id})
+    market: Market | None = None
+    positions: list[PositionRow] = []
+    order_book: list[OrderBookDepthRow] = []
+    for market, kind, side, price, quantity, realized_pnl in result:
+        if kind == "position":
+            positions.append(PositionRow(market_id, account_id, side, quantity, price, realized_pnl))
+        elif kind == "level":
+            order_book.append(OrderBookDepthRow(side, price, quantity))
+    if market is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Market not found")
+    return MarketSnapshot(market=market, positions=positions, order_book=order_book)
+
+
+# Never matches a row; used to execute (and so compile and cache) the hot statements.
+_PROBE_ID = UUID(int=0)
+
+
+async def prime_statements(session: AsyncSession) -> int:
+    """Execute each hot-path statement once so its compiled form lands in the session's engine cache.
+
+    Every probe misses, so nothing is read or written; returns how many statements ran.
+    """
+    probes = [
+        lambda: list_markets(session),
+        lambda: get_positions(session, _PROBE_ID),
+        lambda: get_positions(session, _PROBE_ID, DEFAULT_ACCOUNT),
+        lambda: get_order_book_levels(session, _PROBE_ID),
+        lambda: get_order_book_columns(session, _PROBE_ID),
+        lambda: get_position_columns(session, _PROBE_ID),
+        lambda: get_position_columns(session, _PROBE_ID, DEFAULT_ACCOUNT),
+        lambda: session.execute(_MARKET_SNAPSHOT, {"market_id": _PROBE_ID, "account_id": DEFAULT_ACCOUNT}),
+        lambda: session.execute(_CROSSED_RISING, {"market_id": _PROBE_ID, "high": Decimal("0.00")}),
+        lambda: session.execute(_CROSSED_FALLING, {"market_id": _PROBE_ID, "low": Decimal("100.00")}),
+        lambda: _slug_exists(session, ""),
+        lambda: session.execute(_TRADING_MODE, {"market_id": _PROBE_ID}),
+        lambda: _get_account_positions(session, _PROBE_ID, [DEFAULT_ACCOUNT]),
+    ]
+    for side in OrderSide:
+        probes += [
+            lambda side=side: _get_best_level(session, _PROBE_ID, side, Decimal("0.00")),
+            lambda side=side: _get_position(session, _PROBE_ID, DEFAULT_ACCOUNT, side),
+            lambda side=side: get_held_quantity(session, _PROBE_ID, DEFAULT_ACCOUNT, side),
+        ]
+    for probe in probes:
+        await probe()
+    await session.rollback()
+    return len(probes)
 
 
 async def _generate_unique_slug(session: AsyncSession, question: str) -> str:
@@ -231,45 +765,44 @@ def _slugify(value: str) -> str:
 
 
 async def _slug_exists(session: AsyncSession, slug: str) -> bool:
-    result = await session.execute(select(func.count(Market.id)).where(Market.slug == slug))
-    count = result.scalar_one()
-    return count > 0
+    result = await session.execute(_SLUG_EXISTS, {"slug": slug})
+    return result.scalar_one_or_none() is not None
 
 
-async def _get_position(session: AsyncSession, market_id: UUID, side: OrderSide) -> Position:
+async def _get_position(session: AsyncSession, market_id: UUID, account_id: str, side: OrderSide) -> Position | None:
     result = await session.execute(
-        select(Position).where(Position.market_id == market_id, Position.side == side)
+        _POSITION_BY_SIDE, {"market_id": market_id, "account_id": account_id, "side": side}
     )
-    position = result.scalars().first()
-    if not position:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Position not found")
-    return position
-
-
-async def _get_positions(session: AsyncSession, market_id: UUID) -> list[Position]:
-    result = await session.execute(select(Position).where(Position.market_id == market_id).order_by(Position.side))
-    return list(result.scalars().all())
+    return result.scalars().first()
 
 
-def _apply_trade(position: Position, order_type: OrderType, price: Decimal, quantity: int) -> Decimal:
-    price = _quantize(price)
-    qty_decimal = Decimal(quantity)
-    realized = Decimal("0.00")
+async def _create_position(session: AsyncSession, market_id: UUID, account_id: str, side: OrderSide) -> Position:
+    """Open an empty holding the first time an account buys into a market side."""
+    position = Position(
+        market_id=market_id,
+        account_id=account_id,
+        side=side,
+        quantity=0,
+        average_price=_quantize(Decimal("0.00")),
+        realized_pnl=_quantize(Decimal("0.00")),
+    )
+    try:
+        async with session.begin_nested():
+            session.add(position)
+    except IntegrityError as exc:
+        # A concurrent transaction opened the same holding first; use its row.
+        existing = await _get_position(session, market_id, account_id, side)
+        if existing is None:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT, detail="Position changed concurrently; retry the order."
+            ) from exc
+        return existing
+    return position
 
-    if order_type == OrderType.BUY:
-        new_qty = position.quantity + quantity
-        numerator = (Decimal(position.quantity) * position.average_price) + (qty_decimal * price)
-        average_price = numerator / Decimal(new_qty) if new_qty else Decimal("0.00")
-        position.quantity = new_qty
-        position.average_price = _quantize(average_price if new_qty else Decimal("0.00"))
-    else:
-        realized = (price - position.average_price) * qty_decimal
-        position.quantity -= quantity
-        position.realized_pnl = _quantize(position.realized_pnl + realized)
-        if position.quantity == 0:
-            position.average_price = _quantize(Decimal("0.00"))
 
-    return _quantize(realized)
+async def _get_account_positions(session: AsyncSession, market_id: UUID, account_ids: Sequence[str]) -> list[Position]:
+    result = await session.execute(_POSITIONS_FOR_ACCOUNTS, {"market_id": market_id, "account_ids": list(account_ids)})
+    return list(result.scalars().all())
 
 
 async def _get_best_level(
@@ -278,21 +811,28 @@ async def _get_best_level(
     side: OrderSide,
     min_price: Decimal,
 ) -> OrderBookLevel | None:
-    stmt = (
-        select(OrderBookLevel)
-        .where(
-            OrderBookLevel.market_id == market_id,
-            OrderBookLevel.side == side,
-            OrderBookLevel.price >= min_price,
-        )
-        .order_by(OrderBookLevel.price.asc(), OrderBookLevel.created_at.asc())
-        .limit(1)
-    )
-    result = await session.execute(stmt)
+    result = await session.execute(_BEST_LEVEL, {"market_id": market_id, "side": side, "min_price": min_price})
     return result.scalars().first()
 
 
-async def _consume_level(session: AsyncSession, level: OrderBookLevel, quantity: int) -> None:
+async def _resting_quantity(session: AsyncSession, market_id: UUID, account_id: str, side: OrderSide) -> int:
+    result = await session.execute(
+        _RESTING_QUANTITY, {"market_id": market_id, "account_id": account_id, "side": side}
+    )
+    return int(result.scalar_one())
+
+
+def _auction_fill_price(side: OrderSide, clearing_price: Decimal) -> Decimal:
+    """What one side pays or receives when a batch clears at `clearing_price` (a YES price)."""
+    return clearing_price if side == OrderSide.YES else _quantize(HUNDRED - clearing_price)
+
+
+async def _consume_level(session: AsyncSession, level: OrderBookLevel, quantity: int, price: Decimal) -> None:
+    """Fill `quantity` of a resting level and settle the sale at `price` on its owner's position."""
+    maker = await _get_position(session, level.market_id, level.account_id, level.side)
+    if maker is not None:
+        # Resting quantity is reserved at placement, so the maker still holds what is sold here.
+        _apply_trade(maker, OrderType.SELL, price, quantity)
     level.quantity -= quantity
     if level.quantity <= 0:
         await session.delete(level)
@@ -304,29 +844,16 @@ async def _consume_level(session: AsyncSession, level: OrderBookLevel, quantity:
 async def _add_order_book_level(
     session: AsyncSession,
     market_id: UUID,
+    account_id: str,
     side: OrderSide,
     price: Decimal,
     quantity: int,
 ) -> None:
     level = OrderBookLevel(
         market_id=market_id,
+        account_id=account_id,
         side=side,
         price=_quantize(price),
         quantity=quantity,
     )
     session.add(level)
-
-
-def _calculate_trade_price(order_side: OrderSide, level_price: Decimal) -> Decimal:
-    return _quantize(HUNDRED - level_price)
-
-
-def _update_market_price_from_fill(market: Market, order_side: OrderSide, fill_price: Decimal) -> None:
-    if order_side == OrderSide.YES:
-        market.yes_price = fill_price
-        market.no_price = _quantize(HUNDRED - fill_price)
-    else:
-        yes_price = _quantize(HUNDRED - fill_price)
-        market.yes_price = yes_price
-        market.no_price = fill_price
-
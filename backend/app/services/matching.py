@@ -0,0 +1,268 @@
+"""Matching, position and pricing rules, plus a synchronous in-memory engine.
+
+The rule functions here are shared by the database-backed `place_order` in
+`services.markets` and by `InMemoryMatchingEngine`, so backtests exercise the
+exact arithmetic production uses without needing an `AsyncSession`.
+`clear_call_auction` is the uncrossing step for markets in call-auction mode.
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_left, bisect_right, insort
+from dataclasses import dataclass, field
+from decimal import Decimal, ROUND_HALF_UP
+from itertools import accumulate
+from typing import Hashable, Protocol, Sequence
+
+from ..models import OrderSide, OrderType
+
+HUNDRED = Decimal("100.00")
+CENT = Decimal("0.01")
+ZERO = Decimal("0.00")
+
+
+class PositionState(Protocol):
+    quantity: int
+    average_price: Decimal
+    realized_pnl: Decimal
+
+
+class PriceState(Protocol):
+    yes_price: Decimal
+    no_price: Decimal
+
+
+def quantize(amount: Decimal) -> Decimal:
+    return amount.quantize(CENT, rounding=ROUND_HALF_UP)
+
+
+def complement_side(side: OrderSide) -> OrderSide:
+    return OrderSide.NO if side == OrderSide.YES else OrderSide.YES
+
+
+def apply_trade(position: PositionState, order_type: OrderType, price: Decimal, quantity: int) -> Decimal:
+    price = quantize(price)
+    qty_decimal = Decimal(quantity)
+    realized = Decimal("0.00")
+
+    if order_type == OrderType.BUY:
+        new_qty = position.quantity + quantity
+        numerator = (Decimal(position.quantity) * position.average_price) + (qty_decimal * price)
+        average_price = numerator / Decimal(new_qty) if new_qty else Decimal("0.00")
+        position.quantity = new_qty
+        position.average_price = quantize(average_price if new_qty else Decimal("0.00"))
+    else:
+        realized = (price - position.average_price) * qty_decimal
+        position.quantity -= quantity
+        position.realized_pnl = quantize(position.realized_pnl + realized)
+        if position.quantity == 0:
+            position.average_price = quantize(Decimal("0.00"))
+
+    return quantize(realized)
+
+
+def calculate_trade_price(order_side: OrderSide, level_price: Decimal) -> Decimal:
+    return quantize(HUNDRED - level_price)
+
+
+def update_market_price_from_fill(market: PriceState, order_side: OrderSide, fill_price: Decimal) -> None:
+    if order_side == OrderSide.YES:
+        market.yes_price = fill_price
+        market.no_price = quantize(HUNDRED - fill_price)
+    else:
+        yes_price = quantize(HUNDRED - fill_price)
+        market.yes_price = yes_price
+        market.no_price = fill_price
+
+
+@dataclass(frozen=True)
+class AuctionInterest:
+    """One order or resting level in a call auction, limit expressed as a YES price."""
+
+    key: Hashable
+    price: Decimal
+    quantity: int
+
+
+@dataclass
+class AuctionClearing:
+    price: Decimal | None
+    volume: int
+    allocations: dict[Hashable, int] = field(default_factory=dict)
+
+
+def clear_call_auction(
+    bids: Sequence[AuctionInterest],
+    asks: Sequence[AuctionInterest],
+    reference_price: Decimal,
+) -> AuctionClearing:
+    """Find the single YES price that uncrosses a batch and allocate fills at it.
+
+    Bids fill at or below their price, asks at or above it. The clearing price
+    maximises matched volume, then minimises the leftover imbalance, then stays
+    closest to `reference_price`. Fills are allocated by price, then by position in
+    the input sequences, so callers pass interest in time priority.
+    """
+    if not bids or not asks:
+        return AuctionClearing(price=None, volume=0)
+
+    bid_prices = sorted(bid.price for bid in bids)
+    bid_cumulative = [0, *accumulate(bid.quantity for bid in sorted(bids, key=lambda bid: bid.price))]
+    ask_prices = sorted(ask.price for ask in asks)
+    ask_cumulative = [0, *accumulate(ask.quantity for ask in sorted(asks, key=lambda ask: ask.price))]
+
+    best: tuple[int, int, Decimal] | None = None
+    best_price: Decimal | None = None
+    for price in sorted({*bid_prices, *ask_prices}):
+        demand = bid_cumulative[-1] - bid_cumulative[bisect_left(bid_prices, price)]
+        supply = ask_cumulative[bisect_right(ask_prices, price)]
+        rank = (min(demand, supply), -abs(demand - supply), -abs(price - reference_price))
+        if best is None or rank > best:
+            best, best_price = rank, price
+    assert best is not None and best_price is not None
+    volume = best[0]
+    if volume == 0:
+        return AuctionClearing(price=None, volume=0)
+
+    allocations: dict[Hashable, int] = {}
+    eligible_bids = sorted((bid for bid in bids if bid.price >= best_price), key=lambda bid: -bid.price)
+    eligible_asks = sorted((ask for ask in asks if ask.price <= best_price), key=lambda ask: ask.price)
+    for eligible in (eligible_bids, eligible_asks):
+        remaining = volume
+        for interest in eligible:
+            if remaining == 0:
+                break
+            fill = min(remaining, interest.quantity)
+            allocations[interest.key] = fill
+            remaining -= fill
+    return AuctionClearing(price=quantize(best_price), volume=volume, allocations=allocations)
+
+
+class OrderRejected(ValueError):
+    """Raised by the in-memory engine where the API would answer with a 4xx."""
+
+
+@dataclass
+class SimulatedPosition:
+    quantity: int = 0
+    average_price: Decimal = ZERO
+    realized_pnl: Decimal = ZERO
+
+
+@dataclass
+class SimulatedMarket:
+    yes_price: Decimal
+    no_price: Decimal
+
+
+@dataclass
+class OrderResult:
+    """Mirror of the persisted `Order` row produced by `place_order`."""
+
+    side: OrderSide
+    type: OrderType
+    price: Decimal
+    quantity: int
+    resting_quantity: int
+    total_cost: Decimal
+    realized_pnl: Decimal
+
+
+@dataclass
+class _BookSide:
+    # Keys are kept sorted by (price, sequence): the same price/age priority as
+    # `_get_best_level`'s ORDER BY price, created_at.
+    keys: list[tuple[Decimal, int]] = field(default_factory=list)
+    quantities: dict[tuple[Decimal, int], int] = field(default_factory=dict)
+
+
+class InMemoryMatchingEngine:
+    """Synchronous single-market engine with the same semantics as `services.markets.place_order`."""
+
+    def __init__(self, initial_price_yes: Decimal) -> None:
+        price_yes = quantize(initial_price_yes)
+        if price_yes <= 0 or price_yes >= HUNDRED:
+            raise OrderRejected("Yes price must be between 0 and 100.")
+        self.market = SimulatedMarket(yes_price=price_yes, no_price=quantize(HUNDRED - price_yes))
+        self.positions: dict[OrderSide, SimulatedPosition] = {side: SimulatedPosition() for side in OrderSide}
+        self._books: dict[OrderSide, _BookSide] = {side: _BookSide() for side in OrderSide}
+        self._sequence = 0
+
+    def order_book(self, side: OrderSide) -> list[tuple[Decimal, int]]:
+        """Return resting `(price, quantity)` levels for a side in matching priority."""
+        book = self._books[side]
+        return [(key[0], book.quantities[key]) for key in book.keys]
+
+    def place_order(self, side: OrderSide, order_type: OrderType, price: Decimal, quantity: int) -> OrderResult:
+        if quantity <= 0:
+            raise OrderRejected("Quantity must be positive.")
+        limit_price = quantize(price)
+        complement = quantize(HUNDRED - limit_price)
+        if complement < 0 or limit_price < 0:
+            raise OrderRejected("Price must be between 0 and 100.")
+
+        position = self.positions[side]
+        resting = sum(self._books[side].quantities.values())
+        if order_type == OrderType.SELL and quantity > position.quantity - resting:
+            raise OrderRejected("Cannot sell more contracts than currently held.")
+
+        book = self._books[complement_side(side)]
+        # The single holder also owns every resting level, so it is the maker of each fill.
+        maker = self.positions[complement_side(side)]
+        remaining_qty = quantity
+        executed_qty = 0
+        executed_cost = Decimal("0.00")
+        realized_total = Decimal("0.00")
+
+        while remaining_qty > 0:
+            idx = bisect_left(book.keys, (complement, -1))
+            if idx == len(book.keys):
+                break
+            key = book.keys[idx]
+            level_qty = book.quantities[key]
+
+            fill_qty = min(remaining_qty, level_qty)
+            actual_price = calculate_trade_price(side, key[0])
+            realized = apply_trade(position, order_type, actual_price, fill_qty)
+            executed_qty += fill_qty
+            executed_cost += actual_price * fill_qty
+            realized_total += realized
+            remaining_qty -= fill_qty
+            apply_trade(maker, OrderType.SELL, quantize(HUNDRED - actual_price), fill_qty)
+
+            if fill_qty == level_qty:
+                del book.keys[idx]
+                del book.quantities[key]
+            else:
+                book.quantities[key] = level_qty - fill_qty
+            update_market_price_from_fill(self.market, side, actual_price)
+
+        resting_qty = 0
+        if remaining_qty > 0:
+            if order_type == OrderType.BUY:
+                realized = apply_trade(position, OrderType.BUY, limit_price, remaining_qty)
+                executed_qty += remaining_qty
+                executed_cost += limit_price * remaining_qty
+                realized_total += realized
+                update_market_price_from_fill(self.market, side, limit_price)
+            else:
+                resting_qty = remaining_qty
+                self._rest(side, limit_price, resting_qty)
+
+        order_price = limit_price if executed_qty == 0 else quantize(executed_cost / Decimal(executed_qty))
+        return OrderResult(
+            side=side,
+            type=order_type,
+            price=order_price,
+            quantity=executed_qty,
+            resting_quantity=resting_qty,
+            total_cost=quantize(executed_cost),
+            realized_pnl=quantize(realized_total),
+        )
+
+    def _rest(self, side: OrderSide, price: Decimal, quantity: int) -> None:
+        book = self._books[side]
+        key = (price, self._sequence)
+        self._sequence += 1
+        insort(book.keys, key)
+        book.quantities[key] = quantity
@@ -0,0 +1,126 @@
+"""Portfolio-wide mark-to-market analytics computed over NumPy arrays."""
+
+from __future__ import annotations
+
+from decimal import Decimal
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..models import Market, MarketStatus, OrderSide, Position
+from ..schemas import PortfolioAnalyticsResponse, PortfolioMarketExposure
+
+# Prices are stored with two decimals, so every amount below is an exact integer
+# count of hundredths; a winning contract pays 100.00.
+PAYOUT_HUNDREDTHS = 10_000
+
+
+def _to_hundredths(values: list[Decimal]) -> np.ndarray:
+    return np.rint(np.asarray(values, dtype=np.float64) * 100).astype(np.int64)
+
+
+def _from_hundredths(value: int | np.integer) -> Decimal:
+    return Decimal(int(value)).scaleb(-2)
+
+
+async def get_portfolio_analytics(
+    session: AsyncSession, top: int = 5, account_id: str | None = None
+) -> PortfolioAnalyticsResponse:
+    """Load every open position with its market prices in one query and aggregate vectorised.
+
+    Positions of all accounts are combined unless `account_id` narrows it to one holder.
+    """
+    stmt = (
+        select(
+            Position.market_id,
+            Position.side,
+            Position.quantity,
+            Position.average_price,
+            Position.realized_pnl,
+            Market.yes_price,
+            Market.no_price,
+        )
+        .join(Market, Market.id == Position.market_id)
+        .where(Market.status == MarketStatus.OPEN)
+        .order_by(Position.market_id)
+    )
+    if account_id is not None:
+        stmt = stmt.where(Position.account_id == account_id)
+    rows = (await session.execute(stmt)).all()
+    if not rows:
+        return PortfolioAnalyticsResponse(
+            market_count=0,
+            position_count=0,
+            cost_basis=Decimal("0.00"),
+            market_value=Decimal("0.00"),
+            unrealized_pnl=Decimal("0.00"),
+            realized_pnl=Decimal("0.00"),
+            payout_if_yes=Decimal("0.00"),
+            payout_if_no=Decimal("0.00"),
+            worst_case_payout=Decimal("0.00"),
+            herfindahl_index=0.0,
+            top_market_share=0.0,
+            top_exposures=[],
+        )
+
+    market_ids, sides, quantities, average_prices, realized, yes_prices, no_prices = zip(*rows)
+    ids = np.asarray(market_ids, dtype=object)
+    is_yes = np.asarray(sides, dtype=object) == OrderSide.YES.value
+    qty = np.asarray(quantities, dtype=np.int64)
+    avg = _to_hundredths(average_prices)
+    mark = np.where(is_yes, _to_hundredths(yes_prices), _to_hundredths(no_prices))
+
+    # Rows are sorted by market, so a market boundary is wherever the id changes.
+    boundaries = np.concatenate(([True], ids[1:] != ids[:-1]))
+    codes = np.cumsum(boundaries) - 1
+    market_count = int(codes[-1]) + 1
+    unique_ids = ids[boundaries]
+
+    cost = qty * avg
+    value = qty * mark
+    payout_yes = np.zeros(market_count, dtype=np.int64)
+    payout_no = np.zeros(market_count, dtype=np.int64)
+    exposure = np.zeros(market_count, dtype=np.int64)
+    unrealized = np.zeros(market_count, dtype=np.int64)
+    np.add.at(payout_yes, codes[is_yes], qty[is_yes] * PAYOUT_HUNDREDTHS)
+    np.add.at(payout_no, codes[~is_yes], qty[~is_yes] * PAYOUT_HUNDREDTHS)
+    np.add.at(exposure, codes, value)
+    np.add.at(unrealized, codes, value - cost)
+    max_payout = np.maximum(payout_yes, payout_no)
+
+    total_exposure = int(exposure.sum())
+    if total_exposure > 0:
+        shares = exposure / total_exposure
+        herfindahl = float(np.square(shares).sum())
+        top_share = float(shares.max())
+    else:
+        herfindahl = 0.0
+        top_share = 0.0
+
+    top = max(0, min(top, market_count))
+    top_idx = np.argsort(-exposure, kind="stable")[:top]
+    top_exposures = [
+        PortfolioMarketExposure(
+            market_id=unique_ids[i],
+            exposure=_from_hundredths(exposure[i]),
+            unrealized_pnl=_from_hundredths(unrealized[i]),
+            max_payout=_from_hundredths(max_payout[i]),
+        )
+        for i in top_idx
+    ]
+
+    return PortfolioAnalyticsResponse(
+        market_count=market_count,
+        position_count=int(np.count_nonzero(qty)),
+        cost_basis=_from_hundredths(cost.sum()),
+        market_value=_from_hundredths(total_exposure),
+        unrealized_pnl=_from_hundredths(unrealized.sum()),
+        realized_pnl=_from_hundredths(_to_hundredths(realized).sum()),
+        payout_if_yes=_from_hundredths(payout_yes.sum()),
+        payout_if_no=_from_hundredths(payout_no.sum()),
+        worst_case_payout=_from_hundredths(max_payout.sum()),
+        herfindahl_index=herfindahl,
+        top_market_share=top_share,
+        top_exposures=top_exposures,
+    )
@@ -0,0 +1,229 @@
+"""Write-behind pipeline for post-trade work that must not delay order acknowledgement.
+
+`place_order` commits and replies; the route then publishes a `TradeEvent` into a
+bounded queue. Consumer tasks drain the queue in batches and hand each batch to
+the registered handlers (statistics, fill history, notifications, ...). The events
+describe orders that already committed, so none is ever dropped: when the queue is
+full `publish` waits up to `publish_timeout` for space, and if the consumers are
+still behind it runs the handlers on the event itself. A slow handler therefore
+slows producers down instead of growing memory without bound or losing fills, and
+`stop` drains everything still queued.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from datetime import datetime
+from decimal import Decimal
+from typing import Awaitable, Callable, Sequence
+from uuid import UUID
+
+from fastapi import Request
+
+from ..models import Order, OrderSide, OrderType
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class TradeEvent:
+    order_id: UUID
+    market_id: UUID
+    side: OrderSide
+    type: OrderType
+    price: Decimal
+    quantity: int
+    resting_quantity: int
+    total_cost: Decimal
+    realized_pnl: Decimal
+    occurred_at: datetime
+
+    @classmethod
+    def from_order(cls, order: Order) -> "TradeEvent":
+        return cls(
+            order_id=order.id,
+            market_id=order.market_id,
+            side=order.side,
+            type=order.type,
+            price=order.price,
+            quantity=order.quantity,
+            resting_quantity=order.resting_quantity,
+            total_cost=order.total_cost,
+            realized_pnl=order.realized_pnl,
+            occurred_at=order.created_at,
+        )
+
+
+BatchHandler = Callable[[Sequence[TradeEvent]], Awaitable[None]]
+
+
+@dataclass
+class MarketTradeStats:
+    orders: int = 0
+    filled_quantity: int = 0
+    resting_quantity: int = 0
+    notional: Decimal = Decimal("0.00")
+    last_price: Decimal | None = None
+    last_trade_at: datetime | None = None
+
+    @property
+    def vwap(self) -> Decimal | None:
+        if not self.filled_quantity:
+            return None
+        return (self.notional / self.filled_quantity).quantize(Decimal("0.01"))
+
+
+class TradeStatistics:
+    """Batch handler keeping per-market order flow aggregates in memory."""
+
+    def __init__(self) -> None:
+        self.markets: dict[UUID, MarketTradeStats] = {}
+
+    async def __call__(self, events: Sequence[TradeEvent]) -> None:
+        for event in events:
+            stats = self.markets.setdefault(event.market_id, MarketTradeStats())
+            stats.orders += 1
+            stats.resting_quantity += event.resting_quantity
+            if event.quantity:
+                stats.filled_quantity += event.quantity
+                stats.notional += event.total_cost
+                stats.last_price = event.price
+                stats.last_trade_at = event.occurred_at
+
+    def for_market(self, market_id: UUID) -> MarketTradeStats:
+        return self.markets.get(market_id, MarketTradeStats())
+
+
+@dataclass
+class PipelineCounters:
+    published: int = 0
+    processed: int = 0
+    batches: int = 0
+    handler_failures: int = 0
+    publish_waits: int = 0
+    inline_dispatches: int = 0
+    max_batch_size: int = 0
+
+
+@dataclass
+class PostTradePipeline:
+    handlers: list[BatchHandler] = field(default_factory=list)
+    max_queue: int = 10_000
+    batch_size: int = 256
+    flush_interval: float = 0.05
+    consumers: int = 1
+    publish_timeout: float = 0.1
+    counters: PipelineCounters = field(default_factory=PipelineCounters)
+
+    def __post_init__(self) -> None:
+        self._queue: asyncio.Queue[TradeEvent] | None = None
+        self._tasks: list[asyncio.Task[None]] = []
+        self._closed = False
+
+    @property
+    def running(self) -> bool:
+        return bool(self._tasks)
+
+    @property
+    def depth(self) -> int:
+        return self._queue.qsize() if self._queue is not None else 0
+
+    def add_handler(self, handler: BatchHandler) -> None:
+        self.handlers.append(handler)
+
+    async def start(self) -> None:
+        self._start()
+
+    async def publish(self, event: TradeEvent) -> bool:
+        """Enqueue an event; returns False when the queue stayed full and it was handled inline."""
+        if self._closed:
+            raise RuntimeError("Post-trade pipeline is shut down.")
+        self._start()
+        assert self._queue is not None
+        try:
+            self._queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.counters.publish_waits += 1
+            try:
+                await asyncio.wait_for(self._queue.put(event), self.publish_timeout)
+            except asyncio.TimeoutError:
+                self.counters.inline_dispatches += 1
+                logger.warning("Post-trade queue full; handling event for order %s inline", event.order_id)
+                await self._dispatch([event])
+                return False
+        self.counters.published += 1
+        return True
+
+    async def stop(self, timeout: float = 10.0) -> None:
+        """Stop accepting events, flush everything queued, then stop the consumers."""
+        self._closed = True
+        if not self.running:
+            return
+        assert self._queue is not None
+        try:
+            await asyncio.wait_for(self._queue.join(), timeout)
+        except asyncio.TimeoutError:
+            logger.error("Post-trade pipeline stopped with %d events still queued", self._queue.qsize())
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def snapshot(self) -> dict[str, int | bool]:
+        return {
+            "running": self.running,
+            "queue_depth": self.depth,
+            "queue_capacity": self.max_queue,
+            "published": self.counters.published,
+            "processed": self.counters.processed,
+            "batches": self.counters.batches,
+            "max_batch_size": self.counters.max_batch_size,
+            "handler_failures": self.counters.handler_failures,
+            "publish_waits": self.counters.publish_waits,
+            "inline_dispatches": self.counters.inline_dispatches,
+        }
+
+    def _start(self) -> None:
+        if self.running:
+            return
+        self._closed = False
+        self._queue = asyncio.Queue(maxsize=self.max_queue)
+        self._tasks = [asyncio.create_task(self._consume(), name=f"post-trade-{idx}") for idx in range(self.consumers)]
+
+    async def _consume(self) -> None:
+        assert self._queue is not None
+        queue = self._queue
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await queue.get()]
+            # asyncio.timeout rather than wait_for: on 3.11 wait_for can swallow a cancel that
+            # lands as the get completes, and the consumer would then never stop.
+            try:
+                async with asyncio.timeout_at(loop.time() + self.flush_interval):
+                    while len(batch) < self.batch_size:
+                        batch.append(await queue.get())
+            except TimeoutError:
+                pass
+            try:
+                await self._dispatch(batch)
+            finally:
+                for _ in batch:
+                    queue.task_done()
+
+    async def _dispatch(self, batch: list[TradeEvent]) -> None:
+        for handler in self.handlers:
+            try:
+                await handler(batch)
+            except Exception:
+                self.counters.handler_failures += 1
+                logger.exception("Post-trade handler %r failed on a batch of %d events", handler, len(batch))
+        self.counters.batches += 1
+        self.counters.processed += len(batch)
+        self.counters.max_batch_size = max(self.counters.max_batch_size, len(batch))
+
+
+def get_post_trade_pipeline(request: Request) -> PostTradePipeline:
+    """FastAPI dependency returning the application's pipeline."""
+    return request.app.state.post_trade
@@ -0,0 +1,230 @@
+"""Read-only order quotes over a cached cumulative-depth view of each book.
+
+A `BookDepth` holds, per side, the resting level prices in ascending order with
+their aggregated and cumulative quantities. Quoting walks it the way
+`markets._match_order` walks the book: levels on the complement side priced at
+or above `100 - limit`, cheapest first, each filling at `100 - level price`. A
+bisect finds the first eligible level and the level that exhausts the order, so
+a quote touches only the levels it would fill and never hits the database once
+the depth is cached.
+
+Depth is cached per market and dropped whenever an order, auction or resolution
+for that market commits in this process. Writes from other processes are only
+picked up when the entry expires, so `quote_cache_ttl_seconds` bounds how stale
+a quote can be in multi-worker deployments.
+"""
+
+from __future__ import annotations
+
+import time
+from bisect import bisect_left
+from collections import OrderedDict
+from dataclasses import dataclass
+from decimal import Decimal
+from uuid import UUID
+
+from fastapi import HTTPException, Request, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..config import Settings
+from ..models import MarketStatus, OrderSide, OrderType
+from . import markets as market_service
+from .matching import HUNDRED, calculate_trade_price, complement_side, quantize
+
+
+@dataclass(frozen=True, slots=True)
+class DepthSide:
+    prices: list[Decimal]
+    quantities: list[int]
+    # cumulative[i] is the quantity resting below prices[i]; cumulative[-1] is the side's total.
+    cumulative: list[int]
+    # What an incoming order pays at each level (the same for either side), precomputed once per load.
+    fill_prices: list[Decimal]
+
+    @classmethod
+    def from_levels(cls, levels: list[tuple[Decimal, int]]) -> "DepthSide":
+        prices: list[Decimal] = []
+        quantities: list[int] = []
+        cumulative = [0]
+        fill_prices: list[Decimal] = []
+        for price, quantity in levels:
+            prices.append(price)
+            quantities.append(quantity)
+            cumulative.append(cumulative[-1] + quantity)
+            fill_prices.append(calculate_trade_price(OrderSide.YES, price))
+        return cls(prices, quantities, cumulative, fill_prices)
+
+
+@dataclass(frozen=True, slots=True)
+class BookDepth:
+    market_id: UUID
+    status: MarketStatus
+    yes_price: Decimal
+    no_price: Decimal
+    sides: dict[OrderSide, DepthSide]
+    loaded_at: float
+
+    def side_price(self, side: OrderSide) -> Decimal:
+        return self.yes_price if side == OrderSide.YES else self.no_price
+
+
+@dataclass(frozen=True, slots=True)
+class QuoteFill:
+    price: Decimal
+    quantity: int
+
+
+@dataclass(frozen=True, slots=True)
+class OrderQuote:
+    market_id: UUID
+    side: OrderSide
+    type: OrderType
+    limit_price: Decimal
+    quantity: int
+    fills: list[QuoteFill]
+    book_quantity: int
+    synthetic_quantity: int
+    resting_quantity: int
+    book_vwap: Decimal | None
+    average_price: Decimal | None
+    total_cost: Decimal
+    reference_price: Decimal
+    slippage: Decimal | None
+    would_fill: bool
+
+
+async def load_book_depth(session: AsyncSession, market_id: UUID) -> BookDepth:
+    """Build the depth view from the one-statement market snapshot."""
+    snapshot = await market_service.get_market_snapshot(session, market_id)
+    levels: dict[OrderSide, list[tuple[Decimal, int]]] = {side: [] for side in OrderSide}
+    for row in snapshot.order_book:  # already ordered by side, then ascending price
+        levels[row.side].append((row.price, int(row.quantity)))
+    market = snapshot.market
+    return BookDepth(
+        market_id=market.id,
+        status=market.status,
+        yes_price=market.yes_price,
+        no_price=market.no_price,
+        sides={side: DepthSide.from_levels(rows) for side, rows in levels.items()},
+        loaded_at=time.monotonic(),
+    )
+
+
+def quote_order(
+    depth: BookDepth, side: OrderSide, order_type: OrderType, price: Decimal, quantity: int, held: int = 0
+) -> OrderQuote:
+    """Walk `depth` for a hypothetical order; raises the same rejections `place_order` would.
+
+    `held` is what the quoting account can still sell on `side`: its holding less its own resting
+    levels. Holdings are per account and not part of the cached depth, so callers look it up
+    (only SELLs need it).
+    """
+    if depth.status != MarketStatus.OPEN:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Market is resolved.")
+    limit_price = quantize(price)
+    complement = quantize(HUNDRED - limit_price)
+    if complement < 0:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="Price must be <= 100.")
+    if order_type == OrderType.SELL and quantity > held:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="Cannot sell more contracts than currently held.",
+        )
+
+    book = depth.sides[complement_side(side)]
+    start = bisect_left(book.prices, complement)
+    # First level whose cumulative depth (from `start`) covers the order; the walk stops there.
+    end = min(bisect_left(book.cumulative, book.cumulative[start] + quantity, lo=start + 1), len(book.prices))
+
+    fills: list[QuoteFill] = []
+    remaining = quantity
+    book_cost = Decimal("0.00")
+    for index in range(start, end):
+        fill_qty = min(remaining, book.quantities[index])
+        fill_price = book.fill_prices[index]
+        fills.append(QuoteFill(fill_price, fill_qty))
+        book_cost += fill_price * fill_qty
+        remaining -= fill_qty
+    book_quantity = quantity - remaining
+
+    synthetic_quantity = remaining if order_type == OrderType.BUY else 0
+    resting_quantity = remaining - synthetic_quantity
+    executed = book_quantity + synthetic_quantity
+    total_cost = book_cost + limit_price * synthetic_quantity
+    average_price = quantize(total_cost / executed) if executed else None
+    reference_price = depth.side_price(side)
+    return OrderQuote(
+        market_id=depth.market_id,
+        side=side,
+        type=order_type,
+        limit_price=limit_price,
+        quantity=quantity,
+        fills=fills,
+        book_quantity=book_quantity,
+        synthetic_quantity=synthetic_quantity,
+        resting_quantity=resting_quantity,
+        book_vwap=quantize(book_cost / book_quantity) if book_quantity else None,
+        average_price=average_price,
+        total_cost=quantize(total_cost),
+        reference_price=reference_price,
+        slippage=average_price - reference_price if average_price is not None else None,
+        would_fill=resting_quantity == 0,
+    )
+
+
+class DepthCache:
+    """Least-recently-used depth views per market, each valid until invalidated or expired."""
+
+    def __init__(self, max_markets: int, ttl_seconds: float) -> None:
+        self.max_markets = max_markets
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[UUID, BookDepth] = OrderedDict()
+        # Bumped on every invalidation so a load that raced a commit is not cached.
+        self._generations: dict[UUID, int] = {}
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> "DepthCache":
+        return cls(settings.quote_cache_max_markets, settings.quote_cache_ttl_seconds)
+
+    async def get(self, session: AsyncSession, market_id: UUID) -> BookDepth:
+        depth = self._entries.get(market_id)
+        if depth is not None and time.monotonic() - depth.loaded_at < self.ttl_seconds:
+            self._entries.move_to_end(market_id)
+            self.hits += 1
+            return depth
+        self.misses += 1
+        return await self.load(session, market_id)
+
+    async def load(self, session: AsyncSession, market_id: UUID) -> BookDepth:
+        generation = self._generations.get(market_id, 0)
+        depth = await load_book_depth(session, market_id)
+        if self._generations.get(market_id, 0) != generation:
+            return depth
+        self._entries[market_id] = depth
+        self._entries.move_to_end(market_id)
+        while len(self._entries) > self.max_markets:
+            self._entries.popitem(last=False)
+        return depth
+
+    def invalidate(self, market_id: UUID) -> None:
+        self._generations[market_id] = self._generations.get(market_id, 0) + 1
+        if self._entries.pop(market_id, None) is not None:
+            self.invalidations += 1
+
+    def snapshot(self) -> dict[str, int | float]:
+        return {
+            "markets": len(self._entries),
+            "max_markets": self.max_markets,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "invalidations": self.invalidations,
+        }
+
+
+def get_depth_cache(request: Request) -> DepthCache:
+    """FastAPI dependency returning the application's depth cache."""
+    return request.app.state.depth_cache
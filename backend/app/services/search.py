@@ -0,0 +1,86 @@
+"""Ranked market search over question, description and slug.
+
+Postgres uses the `ix_markets_search_document` full-text index and the trigram
+indexes on `question`/`slug` (migration `b7e2d91c4a10`); SQLite
+uses the FTS5 table declared next to the `Market` model.
+"""
+
+from __future__ import annotations
+
+import re
+
+from sqlalchemy import column, func, literal_column, or_, select, table
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..models import Market
+
+# Must stay equivalent to the indexed expression in migration b7e2d91c4a10 (the same text once the
+# `markets.` qualifiers are dropped) so the planner uses the index.
+PG_SEARCH_DOCUMENT = (
+    "to_tsvector('english', coalesce(markets.question, '') || ' ' "
+    "|| coalesce(markets.description, '') || ' ' || coalesce(markets.slug, ''))"
+)
+
+_markets_fts = table("markets_fts", column("market_id"), column("rank"), column("markets_fts"))
+_TOKEN = re.compile(r"\w+", re.UNICODE)
+
+
+def _escape_like(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def _fts5_query(query: str) -> str | None:
+    """Quote every token and make it a prefix match so partial words still hit."""
+    tokens = _TOKEN.findall(query.lower())
+    if not tokens:
+        return None
+    return " ".join(f'"{token}"*' for token in tokens)
+
+
+async def search_markets(session: AsyncSession, query: str, limit: int, offset: int) -> list[tuple[Market, float]]:
+    """Return `(market, score)` pairs, best match first."""
+    query = query.strip()
+    if not query:
+        return []
+    if session.bind.dialect.name == "postgresql":
+        return await _search_postgres(session, query, limit, offset)
+    return await _search_sqlite(session, query, limit, offset)
+
+
+async def _search_postgres(session: AsyncSession, query: str, limit: int, offset: int) -> list[tuple[Market, float]]:
+    document = literal_column(PG_SEARCH_DOCUMENT)
+    ts_query = func.websearch_to_tsquery(literal_column("'english'"), query)
+    pattern = f"%{_escape_like(query)}%"
+    score = func.ts_rank_cd(document, ts_query) + func.word_similarity(query, Market.question)
+    stmt = (
+        select(Market, score.label("score"))
+        .where(
+            or_(
+                document.op("@@")(ts_query),
+                Market.question.ilike(pattern, escape="\\"),
+                Market.slug.ilike(pattern, escape="\\"),
+            )
+        )
+        .order_by(score.desc(), Market.created_at.desc())
+        .limit(limit)
+        .offset(offset)
+    )
+    result = await session.execute(stmt)
+    return [(market, float(value)) for market, value in result]
+
+
+async def _search_sqlite(session: AsyncSession, query: str, limit: int, offset: int) -> list[tuple[Market, float]]:
+    match = _fts5_query(query)
+    if match is None:
+        return []
+    stmt = (
+        select(Market, _markets_fts.c.rank)
+        .join(_markets_fts, _markets_fts.c.market_id == Market.id)
+        .where(_markets_fts.c.markets_fts.op("MATCH")(match))
+        .order_by(_markets_fts.c.rank)
+        .limit(limit)
+        .offset(offset)
+    )
+    result = await session.execute(stmt)
+    # bm25() ranks are negative with the best match lowest; flip them so higher is better.
+    return [(market, -float(rank)) for market, rank in result]
@@ -0,0 +1,143 @@
+"""Backtest runner driving `InMemoryMatchingEngine` with scripted or random order flow.
+
+Each market is simulated independently, so scenarios are fanned out across a
+process pool. Run from the backend directory with::
+
+    python -m app.services.simulation --markets 8 --orders 125000 --workers 8
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from decimal import Decimal
+from typing import Iterable, Iterator, Sequence
+
+from ..models import OrderSide, OrderType
+from .matching import CENT, HUNDRED, InMemoryMatchingEngine, OrderRejected, quantize
+
+
+@dataclass(frozen=True)
+class SimulatedOrder:
+    side: OrderSide
+    type: OrderType
+    price: Decimal
+    quantity: int
+
+
+@dataclass(frozen=True)
+class MarketScenario:
+    """A single market to simulate: either an explicit order script or `random_orders` synthetic orders."""
+
+    name: str
+    initial_price_yes: Decimal
+    orders: tuple[SimulatedOrder, ...] = ()
+    random_orders: int = 0
+    seed: int = 0
+    sell_ratio: float = 0.4
+    price_volatility: Decimal = Decimal("2.00")
+    max_quantity: int = 50
+
+
+@dataclass
+class SimulationResult:
+    name: str
+    orders: int = 0
+    rejected: int = 0
+    filled_quantity: int = 0
+    resting_quantity: int = 0
+    traded_notional: Decimal = Decimal("0.00")
+    realized_pnl: Decimal = Decimal("0.00")
+    final_yes_price: Decimal = Decimal("0.00")
+    positions: dict[str, int] = field(default_factory=dict)
+    elapsed_seconds: float = 0.0
+
+    @property
+    def orders_per_second(self) -> float:
+        return self.orders / self.elapsed_seconds if self.elapsed_seconds else 0.0
+
+
+def random_order_flow(scenario: MarketScenario) -> Iterator[SimulatedOrder]:
+    """Yield orders priced around a random walk of the YES mid, reproducible from `scenario.seed`."""
+    rng = random.Random(scenario.seed)
+    mid = quantize(scenario.initial_price_yes)
+    floor, ceiling = CENT, HUNDRED - CENT
+    ticks = int(scenario.price_volatility / CENT)
+    for _ in range(scenario.random_orders):
+        mid = min(max(mid + CENT * rng.randint(-ticks, ticks), floor), ceiling)
+        side = OrderSide.YES if rng.random() < 0.5 else OrderSide.NO
+        order_type = OrderType.SELL if rng.random() < scenario.sell_ratio else OrderType.BUY
+        side_mid = mid if side == OrderSide.YES else HUNDRED - mid
+        price = min(max(side_mid + CENT * rng.randint(-ticks, ticks), floor), ceiling)
+        yield SimulatedOrder(side=side, type=order_type, price=price, quantity=rng.randint(1, scenario.max_quantity))
+
+
+def run_scenario(scenario: MarketScenario) -> SimulationResult:
+    engine = InMemoryMatchingEngine(scenario.initial_price_yes)
+    result = SimulationResult(name=scenario.name)
+    orders: Iterable[SimulatedOrder] = scenario.orders or random_order_flow(scenario)
+
+    started = time.perf_counter()
+    for order in orders:
+        result.orders += 1
+        try:
+            outcome = engine.place_order(order.side, order.type, order.price, order.quantity)
+        except OrderRejected:
+            result.rejected += 1
+            continue
+        result.filled_quantity += outcome.quantity
+        result.resting_quantity += outcome.resting_quantity
+        result.traded_notional += outcome.total_cost
+        result.realized_pnl += outcome.realized_pnl
+    result.elapsed_seconds = time.perf_counter() - started
+
+    result.final_yes_price = engine.market.yes_price
+    result.positions = {side.value: position.quantity for side, position in engine.positions.items()}
+    return result
+
+
+def run_simulations(scenarios: Sequence[MarketScenario], max_workers: int | None = None) -> list[SimulationResult]:
+    """Run scenarios in parallel, one market per task; `max_workers=1` stays in-process."""
+    if max_workers == 1 or len(scenarios) <= 1:
+        return [run_scenario(scenario) for scenario in scenarios]
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        return list(pool.map(run_scenario, scenarios))
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Backtest the matching engine with random order flow.")
+    parser.add_argument("--markets", type=int, default=4)
+    parser.add_argument("--orders", type=int, default=100_000, help="Orders per market.")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--initial-price-yes", type=Decimal, default=Decimal("50.00"))
+    args = parser.parse_args(argv)
+
+    scenarios = [
+        MarketScenario(
+            name=f"market-{idx}",
+            initial_price_yes=args.initial_price_yes,
+            random_orders=args.orders,
+            seed=args.seed + idx,
+        )
+        for idx in range(args.markets)
+    ]
+    started = time.perf_counter()
+    results = run_simulations(scenarios, max_workers=args.workers)
+    wall = time.perf_counter() - started
+
+    for res in results:
+        print(
+            f"{res.name}: {res.orders} orders ({res.rejected} rejected) in {res.elapsed_seconds:.2f}s "
+            f"[{res.orders_per_second:,.0f}/s], final YES {res.final_yes_price}, "
+            f"filled {res.filled_quantity}, resting {res.resting_quantity}"
+        )
+    total = sum(res.orders for res in results)
+    print(f"total: {total} orders in {wall:.2f}s wall [{total / wall if wall else 0:,.0f}/s]")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,187 @@
+"""Sharded multi-process hosting: N API workers behind a market_id-aware router.
+
+Every `/markets/{market_id}/...` request is sent to the worker that owns the
+market's shard, so a hot market only saturates its own event loop. Requests
+without a market id (listing, creation, portfolio) are spread round-robin.
+Start everything from the backend directory with::
+
+    python -m app.sharding --workers 4 --port 8000
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import itertools
+import multiprocessing
+import re
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Sequence
+from uuid import UUID
+
+import httpx
+import uvicorn
+from fastapi import FastAPI, Request, Response
+
+from .config import get_settings
+
+MARKET_PATH = re.compile(r"^/markets/([0-9a-fA-F-]{36})(?:/|$)")
+SHARD_HEADER = "X-Predicta-Shard"
+# Headers describing the upstream connection/encoding rather than the payload.
+_HOP_BY_HOP = {
+    "connection",
+    "keep-alive",
+    "transfer-encoding",
+    "content-encoding",
+    "content-length",
+    "host",
+    "upgrade",
+}
+
+
+def shard_for(market_id: UUID, shard_count: int) -> int:
+    """Map a market to a shard; stable across processes, restarts and Python hash seeds."""
+    digest = hashlib.blake2b(market_id.bytes, digest_size=8).digest()
+    return int.from_bytes(digest, "big") % shard_count
+
+
+@dataclass
+class ShardStats:
+    upstream: str
+    requests: int = 0
+    errors: int = 0
+    in_flight: int = 0
+    total_latency: float = 0.0
+
+    def as_dict(self, uptime: float) -> dict[str, object]:
+        return {
+            "upstream": self.upstream,
+            "requests": self.requests,
+            "errors": self.errors,
+            "in_flight": self.in_flight,
+            "avg_latency_ms": round(self.total_latency / self.requests * 1000, 3) if self.requests else 0.0,
+            "requests_per_second": round(self.requests / uptime, 3) if uptime else 0.0,
+        }
+
+
+class ShardRouter:
+    def __init__(self, upstreams: Sequence[str], client: httpx.AsyncClient | None = None) -> None:
+        if not upstreams:
+            raise ValueError("At least one upstream is required.")
+        self.stats = [ShardStats(upstream=upstream.rstrip("/")) for upstream in upstreams]
+        self.client = client or httpx.AsyncClient(timeout=httpx.Timeout(30.0))
+        self.started_at = time.monotonic()
+        self._round_robin = itertools.cycle(range(len(self.stats)))
+
+    def pick(self, path: str) -> int:
+        match = MARKET_PATH.match(path)
+        if match:
+            try:
+                return shard_for(UUID(match.group(1)), len(self.stats))
+            except ValueError:
+                pass
+        return next(self._round_robin)
+
+    async def forward(self, request: Request) -> Response:
+        shard = self.pick(request.url.path)
+        stats = self.stats[shard]
+        url = stats.upstream + request.url.path
+        if request.url.query:
+            url = f"{url}?{request.url.query}"
+        # Raw pairs rather than a dict, so repeated headers (Cookie, Forwarded, ...) all reach the shard.
+        headers = [
+            (key, value) for key, value in request.headers.raw if key.decode("latin-1").lower() not in _HOP_BY_HOP
+        ]
+
+        stats.requests += 1
+        stats.in_flight += 1
+        started = time.perf_counter()
+        try:
+            upstream = await self.client.request(request.method, url, headers=headers, content=await request.body())
+        except httpx.HTTPError:
+            stats.errors += 1
+            return Response(status_code=502, content=b'{"detail":"Shard unavailable"}', media_type="application/json")
+        finally:
+            stats.in_flight -= 1
+            stats.total_latency += time.perf_counter() - started
+
+        if upstream.status_code >= 500:
+            stats.errors += 1
+        response = Response(content=upstream.content, status_code=upstream.status_code)
+        # Append each upstream header on its own line so repeated ones such as Set-Cookie survive.
+        for key, value in upstream.headers.multi_items():
+            if key.lower() not in _HOP_BY_HOP:
+                response.headers.append(key, value)
+        response.headers[SHARD_HEADER] = str(shard)
+        return response
+
+    def snapshot(self) -> dict[str, object]:
+        uptime = time.monotonic() - self.started_at
+        return {
+            "shard_count": len(self.stats),
+            "uptime_seconds": round(uptime, 3),
+            "shards": [stats.as_dict(uptime) for stats in self.stats],
+        }
+
+
+def create_router_app(upstreams: Sequence[str], client: httpx.AsyncClient | None = None) -> FastAPI:
+    shard_router = ShardRouter(upstreams, client=client)
+
+    @asynccontextmanager
+    async def lifespan(_: FastAPI):
+        yield
+        await shard_router.client.aclose()
+
+    app = FastAPI(title="Predicta Shard Router", lifespan=lifespan, docs_url=None, redoc_url=None, openapi_url=None)
+    app.state.shard_router = shard_router
+
+    @app.get("/shards/stats")
+    async def shard_stats() -> dict[str, object]:
+        return shard_router.snapshot()
+
+    @app.api_route("/{path:path}", methods=["GET", "POST", "PUT", "PATCH", "DELETE", "OPTIONS", "HEAD"])
+    async def proxy(request: Request) -> Response:
+        return await shard_router.forward(request)
+
+    return app
+
+
+def _run_worker(host: str, port: int) -> None:
+    uvicorn.run("app.main:app", host=host, port=port, log_level=get_settings().log_level)
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    settings = get_settings()
+    parser = argparse.ArgumentParser(description="Run sharded API workers behind a market_id router.")
+    parser.add_argument("--workers", type=int, default=settings.shard_count)
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--worker-host", default="127.0.0.1")
+    parser.add_argument("--base-port", type=int, default=settings.shard_base_port)
+    args = parser.parse_args(argv)
+
+    ports = [args.base_port + idx for idx in range(args.workers)]
+    workers = [
+        multiprocessing.Process(target=_run_worker, args=(args.worker_host, port), name=f"shard-{idx}", daemon=True)
+        for idx, port in enumerate(ports)
+    ]
+    for worker in workers:
+        worker.start()
+    try:
+        uvicorn.run(
+            create_router_app([f"http://{args.worker_host}:{port}" for port in ports]),
+            host=args.host,
+            port=args.port,
+            log_level=settings.log_level,
+        )
+    finally:
+        for worker in workers:
+            worker.terminate()
+        for worker in workers:
+            worker.join()
+
+
+if __name__ == "__main__":
+    main()
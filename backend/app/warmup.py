@@ -0,0 +1,128 @@
+"""Startup warmup and readiness tracking.
+
+Fresh processes pay for mapper configuration, statement compilation and pool
+connects on their first requests. `run_warmup` does that work up front, through
+every sessionmaker the routes use (the compiled-statement cache is per engine),
+and only then flips `ReadinessState.ready`, which `/readyz` reports to load
+balancers.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Sequence
+
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+from sqlalchemy.orm import configure_mappers
+
+from .config import Settings
+from .models import Market, MarketStatus
+from .services import markets as market_service
+from .services.quotes import DepthCache
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ReadinessState:
+    ready: bool = False
+    attempts: int = 0
+    last_error: str | None = None
+    warmup_seconds: float | None = None
+    details: dict[str, int] = field(default_factory=dict)
+
+    def snapshot(self) -> dict[str, object]:
+        return {
+            "status": "ready" if self.ready else "warming",
+            "attempts": self.attempts,
+            "last_error": self.last_error,
+            "warmup_seconds": self.warmup_seconds,
+            **self.details,
+        }
+
+
+async def open_pool_connections(engine: AsyncEngine, count: int) -> int:
+    """Check out `count` connections at once so the pool holds them open afterwards."""
+    connections = await asyncio.gather(*(engine.connect() for _ in range(count)))
+    try:
+        for connection in connections:
+            await connection.execute(text("SELECT 1"))
+    finally:
+        await asyncio.gather(*(connection.close() for connection in connections))
+    return len(connections)
+
+
+async def preload_books(session: AsyncSession, limit: int, depth_cache: DepthCache | None = None) -> int:
+    """Read the books of the most recently active open markets into the database cache.
+
+    With a `depth_cache`, the books are also loaded into it so the first quotes are served from memory.
+    """
+    result = await session.execute(
+        select(Market.id)
+        .where(Market.status == MarketStatus.OPEN)
+        .order_by(Market.updated_at.desc())
+        .limit(limit)
+    )
+    market_ids = list(result.scalars().all())
+    for market_id in market_ids:
+        if depth_cache is not None:
+            await depth_cache.load(session, market_id)
+        else:
+            await market_service.get_order_book_columns(session, market_id)
+    await session.rollback()
+    return len(market_ids)
+
+
+async def warm_up(
+    engines: Sequence[AsyncEngine],
+    sessionmakers: Sequence[async_sessionmaker[AsyncSession]],
+    settings: Settings,
+    depth_cache: DepthCache | None = None,
+) -> dict[str, int]:
+    """Open pool connections on `engines` and prime statements through each of `sessionmakers`.
+
+    Books are preloaded through the last sessionmaker, the one serving reads.
+    """
+    configure_mappers()
+    details = {"pool_connections": 0, "statements": 0, "preloaded_books": 0}
+    for engine in engines:
+        # Connections beyond the pool size are overflow and closed on return, so never open more.
+        size = getattr(engine.sync_engine.pool, "size", None)
+        count = min(settings.warmup_pool_connections, size()) if callable(size) else settings.warmup_pool_connections
+        details["pool_connections"] += await open_pool_connections(engine, count)
+    for sessionmaker in sessionmakers:
+        async with sessionmaker() as session:
+            details["statements"] += await market_service.prime_statements(session)
+    if settings.warmup_preload_books:
+        async with sessionmakers[-1]() as session:
+            details["preloaded_books"] = await preload_books(session, settings.warmup_preload_limit, depth_cache)
+    return details
+
+
+async def run_warmup(
+    state: ReadinessState,
+    engines: Sequence[AsyncEngine],
+    sessionmakers: Sequence[async_sessionmaker[AsyncSession]],
+    settings: Settings,
+    depth_cache: DepthCache | None = None,
+) -> None:
+    """Retry warmup until it succeeds, then mark the instance ready."""
+    started = time.perf_counter()
+    while True:
+        state.attempts += 1
+        try:
+            state.details = await warm_up(engines, sessionmakers, settings, depth_cache)
+        except Exception as exc:  # database not reachable yet, migrations pending, ...
+            state.last_error = repr(exc)
+            logger.warning("Warmup attempt %d failed: %r", state.attempts, exc)
+            await asyncio.sleep(settings.warmup_retry_seconds)
+            continue
+        state.last_error = None
+        state.warmup_seconds = round(time.perf_counter() - started, 3)
+        state.ready = True
+        logger.info("Warmup finished in %.3fs: %s", state.warmup_seconds, state.details)
+        return
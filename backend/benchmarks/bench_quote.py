@@ -0,0 +1,57 @@
+"""Per-quote cost of walking a cached depth view, by how many levels the order sweeps.
+
+Builds one in-memory `BookDepth` with `--levels` resting NO levels one cent apart
+and quotes YES buys of growing size against it, so the numbers are the pure
+Python walk a cache hit pays. Run from the backend directory::
+
+    python -m benchmarks.bench_quote --levels 1000 --iterations 20000
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+import uuid
+from decimal import Decimal
+
+from app.models import MarketStatus, OrderSide, OrderType
+from app.services.quotes import BookDepth, DepthSide, quote_order
+
+LEVEL_QUANTITY = 10
+
+
+def _depth(levels: int) -> BookDepth:
+    # Distinct cent prices spread over 1.00-98.99 (levels must stay <= 9800).
+    prices = [Decimal(100 + index * 9800 // levels) / 100 for index in range(levels)]
+    return BookDepth(
+        market_id=uuid.uuid4(),
+        status=MarketStatus.OPEN,
+        yes_price=Decimal("50.00"),
+        no_price=Decimal("50.00"),
+        sides={
+            OrderSide.YES: DepthSide.from_levels([]),
+            OrderSide.NO: DepthSide.from_levels([(price, LEVEL_QUANTITY) for price in prices]),
+        },
+        loaded_at=0.0,
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--levels", type=int, default=1000)
+    parser.add_argument("--iterations", type=int, default=20000)
+    args = parser.parse_args()
+
+    depth = _depth(args.levels)
+    print(f"{'levels swept':<14}{'per quote (us)':>16}")
+    for swept in (1, 10, 100):
+        quantity = swept * LEVEL_QUANTITY
+        started = time.perf_counter()
+        for _ in range(args.iterations):
+            quote_order(depth, OrderSide.YES, OrderType.BUY, Decimal("99"), quantity)
+        elapsed = (time.perf_counter() - started) / args.iterations * 1e6
+        print(f"{swept:<14}{elapsed:>16.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""Python-side cost per matching-path query: per-call select() vs prebuilt bound statements.
+
+Runs against an empty in-memory SQLite database so the numbers are dominated by
+statement construction, cache-key generation and ORM result handling rather than
+by the database itself. Run from the backend directory::
+
+    python -m benchmarks.bench_statement_cache --iterations 5000
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+import uuid
+from decimal import Decimal
+from typing import Callable
+
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import Session
+
+from app.db import Base
+from app.models import DEFAULT_ACCOUNT, Market, OrderBookLevel, OrderSide, Position
+from app.services import markets as market_service
+
+MARKET_ID = uuid.uuid4()
+SIDE = OrderSide.NO
+MIN_PRICE = Decimal("40.00")
+
+
+def _per_call_statements() -> dict[str, Callable[[Session], object]]:
+    """The select() constructs as they were built on every call before caching."""
+    return {
+        "_get_best_level": lambda session: session.execute(
+            select(OrderBookLevel)
+            .where(
+                OrderBookLevel.market_id == MARKET_ID,
+                OrderBookLevel.side == SIDE,
+                OrderBookLevel.price >= MIN_PRICE,
+            )
+            .order_by(OrderBookLevel.price.asc(), OrderBookLevel.created_at.asc())
+            .limit(1)
+        ).scalars().first(),
+        "_get_position": lambda session: session.execute(
+            select(Position).where(
+                Position.account_id == DEFAULT_ACCOUNT, Position.market_id == MARKET_ID, Position.side == SIDE
+            )
+        ).scalars().first(),
+        "_get_account_positions": lambda session: session.execute(
+            select(Position).where(Position.account_id.in_([DEFAULT_ACCOUNT]), Position.market_id == MARKET_ID)
+        ).scalars().all(),
+        "_slug_exists": lambda session: session.execute(
+            select(func.count(Market.id)).where(Market.slug == "will-it-rain")
+        ).scalar_one(),
+    }
+
+
+def _cached_statements() -> dict[str, Callable[[Session], object]]:
+    return {
+        "_get_best_level": lambda session: session.execute(
+            market_service._BEST_LEVEL, {"market_id": MARKET_ID, "side": SIDE, "min_price": MIN_PRICE}
+        ).scalars().first(),
+        "_get_position": lambda session: session.execute(
+            market_service._POSITION_BY_SIDE, {"account_id": DEFAULT_ACCOUNT, "market_id": MARKET_ID, "side": SIDE}
+        ).scalars().first(),
+        "_get_account_positions": lambda session: session.execute(
+            market_service._POSITIONS_FOR_ACCOUNTS, {"account_ids": [DEFAULT_ACCOUNT], "market_id": MARKET_ID}
+        ).scalars().all(),
+        "_slug_exists": lambda session: session.execute(
+            market_service._SLUG_EXISTS, {"slug": "will-it-rain"}
+        ).scalar_one_or_none(),
+    }
+
+
+def _time_per_call(session: Session, query: Callable[[Session], object], iterations: int) -> float:
+    for _ in range(min(iterations, 200)):
+        query(session)
+    started = time.perf_counter()
+    for _ in range(iterations):
+        query(session)
+    return (time.perf_counter() - started) / iterations * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=5000)
+    args = parser.parse_args()
+
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    before = _per_call_statements()
+    after = _cached_statements()
+
+    print(f"{'query':<24}{'per-call (us)':>16}{'cached (us)':>14}{'saved':>9}")
+    with Session(engine) as session:
+        for name in before:
+            old = _time_per_call(session, before[name], args.iterations)
+            new = _time_per_call(session, after[name], args.iterations)
+            print(f"{name:<24}{old:>16.1f}{new:>14.1f}{(old - new) / old:>9.0%}")
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
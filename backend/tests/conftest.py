@@ -2,9 +2,12 @@ import asyncio
 from collections.abc import AsyncGenerator
 
 import pytest
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 
-from app.db import Base
+from app.db import Base, get_read_session, get_session
+from app.main import create_app
 
 
 @pytest.fixture(scope="session")
@@ -27,3 +30,20 @@ async def session() -> AsyncGenerator[AsyncSession, None]:
 
     await engine.dispose()
 
+
+@pytest.fixture()
+def app(session: AsyncSession) -> FastAPI:
+    app = create_app()
+
+    async def override_session() -> AsyncGenerator[AsyncSession, None]:
+        yield session
+
+    app.dependency_overrides[get_session] = override_session
+    app.dependency_overrides[get_read_session] = override_session
+    return app
+
+
+@pytest.fixture()
+async def client(app: FastAPI) -> AsyncGenerator[AsyncClient, None]:
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as http_client:
+        yield http_client
@@ -0,0 +1,84 @@
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import select
+
+from app.models import Resolution
+
+
+@pytest.mark.asyncio
+async def test_accounts_hold_separate_positions_and_settle_together(client, session):
+    created = await client.post("/markets", json={"question": "Will the canal freeze?", "initial_price_yes": 40})
+    market_id = created.json()["id"]
+    base = f"/markets/{market_id}"
+
+    alice = await client.post(
+        f"{base}/orders", json={"account_id": "alice", "side": "YES", "type": "BUY", "price": 40, "quantity": 5}
+    )
+    assert alice.json()["account_id"] == "alice"
+    await client.post(
+        f"{base}/orders", json={"account_id": "bob", "side": "YES", "type": "BUY", "price": 50, "quantity": 2}
+    )
+    await client.post(
+        f"{base}/orders", json={"account_id": "carol", "side": "NO", "type": "BUY", "price": 45, "quantity": 4}
+    )
+
+    # Holdings are per account: bob cannot sell contracts alice bought.
+    oversell = await client.post(
+        f"{base}/orders", json={"account_id": "bob", "side": "YES", "type": "SELL", "price": 40, "quantity": 3}
+    )
+    assert oversell.status_code == 422
+
+    bob = (await client.get(f"{base}/positions", params={"account_id": "bob"})).json()
+    assert [(row["account_id"], row["side"], row["quantity"]) for row in bob] == [("bob", "YES", 2)]
+    holders = {(row["account_id"], row["side"]) for row in (await client.get(f"{base}/positions")).json()}
+    assert {("alice", "YES"), ("bob", "YES"), ("carol", "NO")} <= holders
+
+    analytics = (await client.get("/portfolio/analytics", params={"account_id": "alice"})).json()
+    assert analytics["payout_if_yes"] == "500.00"
+
+    await client.post(f"{base}/resolve", json={"outcome": "YES"})
+
+    settled = {(row["account_id"], row["side"]): row for row in (await client.get(f"{base}/positions")).json()}
+    assert all(row["quantity"] == 0 for row in settled.values())
+    assert settled[("alice", "YES")]["realized_pnl"] == "300.00"
+    assert settled[("bob", "YES")]["realized_pnl"] == "100.00"
+    assert settled[("carol", "NO")]["realized_pnl"] == "-180.00"
+    resolution = (await session.execute(select(Resolution))).scalar_one()
+    assert (resolution.payout_yes, resolution.payout_no) == (Decimal("700.00"), Decimal("0.00"))
+
+
+@pytest.mark.asyncio
+async def test_resting_sell_is_reserved_and_settled_on_the_maker(client):
+    created = await client.post("/markets", json={"question": "Will the ferry run late?", "initial_price_yes": 50})
+    base = f"/markets/{created.json()['id']}"
+
+    await client.post(
+        f"{base}/orders", json={"account_id": "maker", "side": "NO", "type": "BUY", "price": 50, "quantity": 10}
+    )
+    rested = await client.post(
+        f"{base}/orders", json={"account_id": "maker", "side": "NO", "type": "SELL", "price": 40, "quantity": 6}
+    )
+    assert rested.json()["resting_quantity"] == 6
+
+    # Six of the ten contracts are already offered, so only four are left to sell.
+    double_sell = await client.post(
+        f"{base}/orders", json={"account_id": "maker", "side": "NO", "type": "SELL", "price": 45, "quantity": 5}
+    )
+    assert double_sell.status_code == 422
+    quote = await client.get(
+        f"{base}/quote", params={"account_id": "maker", "side": "NO", "type": "SELL", "price": 45, "quantity": 5}
+    )
+    assert quote.status_code == 422
+
+    taker = await client.post(
+        f"{base}/orders", json={"account_id": "taker", "side": "YES", "type": "BUY", "price": 60, "quantity": 4}
+    )
+    assert (taker.json()["quantity"], taker.json()["price"]) == (4, "60.00")
+
+    positions = {(row["account_id"], row["side"]): row for row in (await client.get(f"{base}/positions")).json()}
+    assert positions[("taker", "YES")]["quantity"] == 4
+    maker = positions[("maker", "NO")]
+    assert (maker["quantity"], maker["average_price"], maker["realized_pnl"]) == (6, "50.00", "-40.00")
+    book = (await client.get(f"{base}/order-book")).json()
+    assert [(level["side"], level["quantity"]) for level in book] == [("NO", 2)]
@@ -0,0 +1,143 @@
+import asyncio
+import uuid
+
+import pytest
+from fastapi import HTTPException
+
+from app.services.admission import AdmissionController
+
+
+def _controller(**overrides) -> AdmissionController:
+    limits = dict(
+        global_rate=1000.0,
+        global_burst=1000,
+        global_max_in_flight=10,
+        market_rate=1000.0,
+        market_burst=1000,
+        market_max_in_flight=1,
+        max_queue=1,
+        queue_timeout=1.0,
+    )
+    limits.update(overrides)
+    return AdmissionController(**limits)
+
+
+@pytest.mark.asyncio
+async def test_rate_limit_rejects_with_retry_after():
+    controller = _controller(market_rate=0.5, market_burst=2)
+    market_id = uuid.uuid4()
+
+    for _ in range(2):
+        async with controller.admit(market_id):
+            pass
+    with pytest.raises(HTTPException) as excinfo:
+        async with controller.admit(market_id):
+            pass
+
+    assert excinfo.value.status_code == 429
+    assert excinfo.value.headers["Retry-After"] == "2"
+    # Other markets still have their own budget.
+    async with controller.admit(uuid.uuid4()):
+        pass
+    assert controller.snapshot()["markets"][str(market_id)]["rejected_rate"] == 1
+
+
+@pytest.mark.asyncio
+async def test_in_flight_limit_queues_then_rejects():
+    controller = _controller()
+    market_id = uuid.uuid4()
+    release = asyncio.Event()
+
+    async def hold():
+        async with controller.admit(market_id):
+            await release.wait()
+
+    holder = asyncio.create_task(hold())
+    queued = asyncio.create_task(hold())
+    await asyncio.sleep(0.01)
+    assert controller.snapshot()["markets"][str(market_id)]["queue_depth"] == 1
+
+    with pytest.raises(HTTPException) as excinfo:
+        async with controller.admit(market_id):
+            pass
+    assert excinfo.value.status_code == 429
+
+    release.set()
+    await asyncio.gather(holder, queued)
+    stats = controller.snapshot()["markets"][str(market_id)]
+    assert (stats["admitted"], stats["rejected_queue"], stats["in_flight"]) == (2, 1, 0)
+
+
+@pytest.mark.asyncio
+async def test_queue_rejection_refunds_tokens():
+    controller = _controller(market_rate=0.001, market_burst=2, max_queue=0)
+    market_id = uuid.uuid4()
+    release = asyncio.Event()
+
+    async def hold():
+        async with controller.admit(market_id):
+            await release.wait()
+
+    holder = asyncio.create_task(hold())
+    await asyncio.sleep(0.01)
+    with pytest.raises(HTTPException):
+        async with controller.admit(market_id):
+            pass
+    release.set()
+    await holder
+
+    # The rejected order's token came back, so the second of the two burst tokens is still there.
+    async with controller.admit(market_id):
+        pass
+    stats = controller.snapshot()["markets"][str(market_id)]
+    assert (stats["admitted"], stats["rejected_queue"], stats["rejected_rate"]) == (2, 1, 0)
+
+
+@pytest.mark.asyncio
+async def test_market_scopes_are_bounded_and_busy_ones_kept():
+    controller = _controller(max_markets=2)
+    busy = uuid.uuid4()
+    release = asyncio.Event()
+
+    async def hold():
+        async with controller.admit(busy):
+            await release.wait()
+
+    holder = asyncio.create_task(hold())
+    await asyncio.sleep(0.01)
+    for _ in range(5):
+        async with controller.admit(uuid.uuid4()):
+            pass
+
+    snapshot = controller.snapshot()
+    assert snapshot["tracked_markets"] == 2
+    assert snapshot["evicted_markets"] == 4
+    assert str(busy) in snapshot["markets"]
+    release.set()
+    await holder
+
+
+@pytest.mark.asyncio
+async def test_snapshot_lists_only_the_busiest_markets(client, app):
+    controller = app.state.admission
+    busy = uuid.uuid4()
+    release = asyncio.Event()
+
+    async def hold():
+        async with controller.admit(busy):
+            await release.wait()
+
+    holder = asyncio.create_task(hold())
+    await asyncio.sleep(0.01)
+    quiet = [uuid.uuid4() for _ in range(30)]
+    for market_id in quiet:
+        async with controller.admit(market_id):
+            pass
+
+    markets = list(controller.snapshot(top=3)["markets"])
+    assert markets == [str(busy), str(quiet[-1]), str(quiet[-2])]
+    body = (await client.get("/system/admission", params={"top": 5})).json()
+    assert body["tracked_markets"] == 31
+    assert len(body["markets"]) == 5
+    release.set()
+    await holder
@@ -0,0 +1,154 @@
+import asyncio
+import uuid
+from decimal import Decimal
+
+import pytest
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.services.admission import AdmissionController
+from app.services.auction import AuctionScheduler
+from app.services.matching import AuctionInterest, clear_call_auction
+
+
+def test_clearing_price_maximises_volume_and_honours_time_priority():
+    bids = [
+        AuctionInterest("resting", Decimal("52.00"), 4),
+        AuctionInterest("early", Decimal("55.00"), 3),
+        AuctionInterest("late", Decimal("55.00"), 3),
+    ]
+    asks = [AuctionInterest("seller", Decimal("50.00"), 7), AuctionInterest("dear", Decimal("58.00"), 5)]
+
+    clearing = clear_call_auction(bids, asks, reference_price=Decimal("53.00"))
+
+    assert clearing.price == Decimal("52.00")
+    assert clearing.volume == 7
+    assert clearing.allocations == {"early": 3, "late": 3, "resting": 1, "seller": 7}
+    assert clear_call_auction(bids, [], Decimal("50.00")).price is None
+
+
+@pytest.mark.asyncio
+async def test_auction_market_clears_a_batch_at_one_price(app, client, session):
+    app.state.auctions = AuctionScheduler(
+        async_sessionmaker(session.bind, expire_on_commit=False), 50, app.state.post_trade
+    )
+    created = await client.post("/markets", json={"question": "Will the ferry run?", "initial_price_yes": 50})
+    market_id = created.json()["id"]
+    await client.post(f"/markets/{market_id}/orders", json={"side": "YES", "type": "BUY", "price": 50, "quantity": 4})
+    stop = await client.post(
+        f"/markets/{market_id}/conditional-orders",
+        json={"side": "YES", "type": "SELL", "kind": "STOP", "trigger_price": 46, "price": 40, "quantity": 2},
+    )
+    switched = await client.put(f"/markets/{market_id}/trading-mode", json={"mode": "AUCTION", "auction_interval_ms": 50})
+    assert switched.json()["trading_mode"] == "AUCTION"
+
+    responses = await asyncio.gather(
+        client.post(f"/markets/{market_id}/orders", json={"side": "YES", "type": "BUY", "price": 60, "quantity": 5}),
+        client.post(f"/markets/{market_id}/orders", json={"side": "NO", "type": "BUY", "price": 55, "quantity": 3}),
+        client.post(f"/markets/{market_id}/orders", json={"side": "YES", "type": "BUY", "price": 40, "quantity": 2}),
+    )
+
+    orders = [response.json() for response in responses]
+    # Three contracts cross at 45; the unmatched YES remainders fill at their own limits.
+    assert [(order["quantity"], order["total_cost"]) for order in orders] == [(5, "255.00"), (3, "165.00"), (2, "80.00")]
+    market = (await client.get(f"/markets/{market_id}")).json()
+    assert market["yes_price"] == "45.00"
+    stats = (await client.get("/system/auctions")).json()["markets"][market_id]
+    assert stats["auctions"] == 1
+    assert stats["last_batch_size"] == 3
+    assert stats["matched_volume"] == 3
+    assert stats["last_clearing_price"] == "45.00"
+
+    # The clearing price crossed the stop; the scheduler publishes that order, which no caller receives.
+    conditional = (await client.get(f"/markets/{market_id}/conditional-orders")).json()[0]
+    assert (conditional["id"], conditional["status"]) == (stop.json()["id"], "TRIGGERED")
+    for _ in range(50):
+        if app.state.trade_stats.for_market(uuid.UUID(market_id)).orders == 5:
+            break
+        await asyncio.sleep(0.01)
+    assert app.state.trade_stats.for_market(uuid.UUID(market_id)).orders == 5
+
+
+@pytest.mark.asyncio
+async def test_busy_auction_market_does_not_block_other_markets(app, client, session):
+    app.state.auctions = AuctionScheduler(
+        async_sessionmaker(session.bind, expire_on_commit=False), 300, app.state.post_trade
+    )
+    app.state.admission = AdmissionController(
+        global_rate=1000.0,
+        global_burst=1000,
+        global_max_in_flight=2,
+        market_rate=1000.0,
+        market_burst=1000,
+        market_max_in_flight=1,
+        max_queue=1,
+        queue_timeout=0.05,
+    )
+    auction = (await client.post("/markets", json={"question": "Will the lock open?", "initial_price_yes": 50})).json()
+    other = (await client.post("/markets", json={"question": "Will the gate close?", "initial_price_yes": 50})).json()
+    await client.put(f"/markets/{auction['id']}/trading-mode", json={"mode": "AUCTION", "auction_interval_ms": 300})
+
+    order = {"side": "YES", "type": "BUY", "price": 50, "quantity": 1}
+    burst = [asyncio.create_task(client.post(f"/markets/{auction['id']}/orders", json=order)) for _ in range(10)]
+    await asyncio.sleep(0.05)
+    continuous = await client.post(f"/markets/{other['id']}/orders", json=order)
+    responses = await asyncio.gather(*burst)
+
+    assert continuous.status_code == 201
+    assert [response.status_code for response in responses] == [201] * 10
+    assert app.state.auctions.snapshot()["markets"][auction["id"]]["last_batch_size"] == 10
+
+
+@pytest.mark.asyncio
+async def test_switching_back_to_continuous_clears_the_open_batch_first(app, client, session):
+    app.state.auctions = AuctionScheduler(
+        async_sessionmaker(session.bind, expire_on_commit=False), 10_000, app.state.post_trade
+    )
+    created = await client.post("/markets", json={"question": "Will the mill turn?", "initial_price_yes": 50})
+    base = f"/markets/{created.json()['id']}"
+    await client.put(f"{base}/trading-mode", json={"mode": "AUCTION", "auction_interval_ms": 10_000})
+
+    order = {"side": "YES", "type": "BUY", "price": 55, "quantity": 2}
+    pending = [asyncio.create_task(client.post(f"{base}/orders", json=order)) for _ in range(3)]
+    await asyncio.sleep(0.05)
+    assert app.state.auctions.snapshot()["open_batches"] == {created.json()["id"]: 3}
+
+    switched = await client.put(f"{base}/trading-mode", json={"mode": "CONTINUOUS"})
+
+    # The batch cleared before the switch returned, long before its interval was up.
+    assert switched.json()["trading_mode"] == "CONTINUOUS"
+    snapshot = app.state.auctions.snapshot()
+    assert snapshot["open_batches"] == {}
+    assert snapshot["markets"][created.json()["id"]]["last_batch_size"] == 3
+    responses = await asyncio.wait_for(asyncio.gather(*pending), timeout=1)
+    assert [response.status_code for response in responses] == [201] * 3
+    after = await client.post(f"{base}/orders", json=order)
+    assert after.status_code == 201
+    assert app.state.auctions.snapshot()["markets"][created.json()["id"]]["auctions"] == 1
+
+
+@pytest.mark.asyncio
+async def test_resting_makers_are_settled_at_the_clearing_price(app, client, session):
+    app.state.auctions = AuctionScheduler(
+        async_sessionmaker(session.bind, expire_on_commit=False), 50, app.state.post_trade
+    )
+    created = await client.post("/markets", json={"question": "Will the kiln fire?", "initial_price_yes": 70})
+    market_id = created.json()["id"]
+    base = f"/markets/{market_id}"
+    maker = {"account_id": "maker", "side": "NO", "quantity": 10}
+    await client.post(f"{base}/orders", json={**maker, "type": "BUY", "price": 30})
+    await client.post(f"{base}/orders", json={**maker, "type": "SELL", "price": 40, "quantity": 5})
+    await client.put(f"{base}/trading-mode", json={"mode": "AUCTION", "auction_interval_ms": 50})
+
+    # The resting NO sell at 40 offers YES at 60 against a YES bid at 70; the tie on volume
+    # goes to the reference price, so the batch clears at 70 and the maker receives 30.
+    taker = await client.post(
+        f"{base}/orders", json={"account_id": "taker", "side": "YES", "type": "BUY", "price": 70, "quantity": 5}
+    )
+    assert (taker.json()["quantity"], taker.json()["price"]) == (5, "70.00")
+    stats = (await client.get("/system/auctions")).json()["markets"][market_id]
+    assert (stats["last_clearing_price"], stats["last_matched_volume"]) == ("70.00", 5)
+
+    positions = {(row["account_id"], row["side"]): row for row in (await client.get(f"{base}/positions")).json()}
+    settled = positions[("maker", "NO")]
+    assert (settled["quantity"], settled["average_price"], settled["realized_pnl"]) == (5, "30.00", "0.00")
+    assert (await client.get(f"{base}/order-book")).json() == []
@@ -0,0 +1,72 @@
+import asyncio
+from decimal import Decimal
+
+import pytest
+
+from app.models import ConditionalKind, OrderSide, OrderType, TriggerDirection
+from app.services.conditional_orders import trigger_on_yes_price
+
+
+def test_side_quoted_triggers_restate_against_yes_price():
+    assert trigger_on_yes_price(OrderSide.YES, OrderType.SELL, ConditionalKind.STOP, Decimal("45")) == (
+        TriggerDirection.FALL,
+        Decimal("45.00"),
+    )
+    assert trigger_on_yes_price(OrderSide.NO, OrderType.SELL, ConditionalKind.STOP, Decimal("30")) == (
+        TriggerDirection.RISE,
+        Decimal("70.00"),
+    )
+    assert trigger_on_yes_price(OrderSide.NO, OrderType.BUY, ConditionalKind.STOP, Decimal("60")) == (
+        TriggerDirection.FALL,
+        Decimal("40.00"),
+    )
+
+
+@pytest.mark.asyncio
+async def test_price_move_fires_only_crossed_triggers_in_the_same_transaction(client):
+    created = await client.post("/markets", json={"question": "Will the launch slip?", "initial_price_yes": 50})
+    market_id = created.json()["id"]
+    base = f"/markets/{market_id}"
+    await client.post(f"{base}/orders", json={"side": "YES", "type": "BUY", "price": 50, "quantity": 10})
+
+    stop = await client.post(
+        f"{base}/conditional-orders",
+        json={"side": "YES", "type": "SELL", "kind": "STOP", "trigger_price": 45, "price": 40, "quantity": 10},
+    )
+    oversized = await client.post(
+        f"{base}/conditional-orders",
+        json={"side": "NO", "type": "SELL", "kind": "TAKE_PROFIT", "trigger_price": 55, "price": 55, "quantity": 5},
+    )
+    untouched = await client.post(
+        f"{base}/conditional-orders",
+        json={"side": "YES", "type": "BUY", "kind": "STOP", "trigger_price": 70, "price": 70, "quantity": 1},
+    )
+    crossed = await client.post(
+        f"{base}/conditional-orders",
+        json={"side": "YES", "type": "BUY", "kind": "STOP", "trigger_price": 40, "price": 45, "quantity": 1},
+    )
+    assert stop.status_code == oversized.status_code == untouched.status_code == 201
+    assert crossed.status_code == 422
+
+    # Buying NO at 60 drops the YES price to 40, crossing the YES stop at 45 and the NO take-profit at 55.
+    await client.post(f"{base}/orders", json={"side": "NO", "type": "BUY", "price": 60, "quantity": 1})
+
+    # The fired stop reaches the post-trade pipeline alongside the two orders placed directly.
+    for _ in range(50):
+        stats = (await client.get(f"{base}/stats")).json()
+        if stats["orders"] == 3:
+            break
+        await asyncio.sleep(0.01)
+    assert stats["orders"] == 3
+
+    conditionals = {item["id"]: item for item in (await client.get(f"{base}/conditional-orders")).json()}
+    assert conditionals[stop.json()["id"]]["status"] == "TRIGGERED"
+    assert conditionals[stop.json()["id"]]["order_id"] is not None
+    assert conditionals[oversized.json()["id"]]["status"] == "REJECTED"
+    assert conditionals[untouched.json()["id"]]["status"] == "PENDING"
+    book = (await client.get(f"{base}/order-book")).json()
+    assert [(level["side"], level["price"], level["quantity"]) for level in book] == [("YES", "40.00", 10)]
+
+    await client.post(f"{base}/resolve", json={"outcome": "NO"})
+    conditionals = {item["id"]: item for item in (await client.get(f"{base}/conditional-orders")).json()}
+    assert conditionals[untouched.json()["id"]]["status"] == "CANCELLED"
@@ -0,0 +1,118 @@
+import asyncio
+from decimal import Decimal
+
+import pytest
+from fastapi import HTTPException
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.config import Settings
+from app.db import Base, create_sqlite_engine, get_read_session, get_session
+from app.main import create_app
+from app.models import OrderSide, OrderType
+from app.schemas import MarketCreate, OrderRequest
+from app.services import markets as market_service
+from app.services.group_commit import GroupCommitter
+
+
+@pytest.mark.asyncio
+async def test_orders_for_several_markets_share_one_commit(session):
+    first = await market_service.create_market(
+        session,
+        MarketCreate(question="Will it snow in May?", description=None, slug=None, initial_price_yes=Decimal("30.00")),
+    )
+    second = await market_service.create_market(
+        session,
+        MarketCreate(question="Will the bridge open?", description=None, slug=None, initial_price_yes=Decimal("70.00")),
+    )
+    committer = GroupCommitter(async_sessionmaker(session.bind, expire_on_commit=False), max_batch=8, window=0.05)
+
+    results = await asyncio.gather(
+        committer.submit(first.id, OrderRequest(side=OrderSide.YES, type=OrderType.BUY, price=Decimal("30.00"), quantity=4)),
+        committer.submit(second.id, OrderRequest(side=OrderSide.NO, type=OrderType.BUY, price=Decimal("30.00"), quantity=2)),
+        committer.submit(first.id, OrderRequest(side=OrderSide.NO, type=OrderType.SELL, price=Decimal("70.00"), quantity=9)),
+        return_exceptions=True,
+    )
+    await committer.stop()
+
+    assert [execution.order.quantity for execution in results[:2]] == [4, 2]
+    assert isinstance(results[2], HTTPException)
+    assert committer.snapshot()["batches"] == 1
+    assert committer.snapshot()["avg_batch_size"] == 2.0
+    assert committer.snapshot()["rejected"] == 1
+
+    first_id = first.id
+    session.expire_all()
+    positions = await market_service.get_positions(session, first_id)
+    assert next(p for p in positions if p.side == OrderSide.YES).quantity == 4
+
+
+@pytest.mark.asyncio
+async def test_group_commit_route_runs_on_a_single_writer_connection(tmp_path):
+    url = f"sqlite+aiosqlite:///{tmp_path / 'predicta.db'}"
+    writer = create_sqlite_engine(url, Settings(database_url=url, app_env="test"), pool_size=1)
+    async with writer.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    sessionmaker = async_sessionmaker(writer, expire_on_commit=False)
+    app = create_app()
+    app.state.group_commit = GroupCommitter(sessionmaker, max_batch=8, window=0.01)
+
+    async def writer_session():
+        async with sessionmaker() as session:
+            yield session
+
+    app.dependency_overrides[get_session] = writer_session
+    try:
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+            created = await client.post("/markets", json={"question": "Will the lock hold?", "initial_price_yes": 50})
+            market_id = created.json()["id"]
+            order = {"side": "YES", "type": "BUY", "price": 50, "quantity": 1}
+            # Request sessions must not hold the only connection while the committer needs it.
+            responses = await asyncio.wait_for(
+                asyncio.gather(*(client.post(f"/markets/{market_id}/orders", json=order) for _ in range(4))),
+                timeout=5,
+            )
+            followup = await asyncio.wait_for(client.post(f"/markets/{market_id}/orders", json=order), timeout=5)
+    finally:
+        await app.state.group_commit.stop()
+        await writer.dispose()
+
+    assert [response.status_code for response in (*responses, followup)] == [201] * 5
+    # Once cached, the mode is served from memory without a database read.
+    modes = app.state.admission.snapshot()["trading_modes"]
+    assert (modes["cached"], modes["hits"]) == (1, 1)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_orders_for_one_market_share_a_batch(tmp_path):
+    url = f"sqlite+aiosqlite:///{tmp_path / 'predicta.db'}"
+    writer = create_sqlite_engine(url, Settings(database_url=url, app_env="test"), pool_size=1)
+    async with writer.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    sessionmaker = async_sessionmaker(writer, expire_on_commit=False)
+    app = create_app()
+    app.state.group_commit = GroupCommitter(sessionmaker, max_batch=64, window=0.05)
+
+    async def writer_session():
+        async with sessionmaker() as session:
+            yield session
+
+    app.dependency_overrides[get_session] = writer_session
+    app.dependency_overrides[get_read_session] = writer_session
+    try:
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+            created = await client.post("/markets", json={"question": "Will the tide turn?", "initial_price_yes": 50})
+            base = f"/markets/{created.json()['id']}"
+            order = {"side": "YES", "type": "BUY", "price": 50, "quantity": 1}
+            await client.post(f"{base}/orders", json=order)
+            responses = await asyncio.gather(*(client.post(f"{base}/orders", json=order) for _ in range(20)))
+            positions = (await client.get(f"{base}/positions")).json()
+    finally:
+        await app.state.group_commit.stop()
+        await writer.dispose()
+
+    assert [response.status_code for response in responses] == [201] * 20
+    # The first order warmed the mode cache; the burst then committed as a single batch.
+    stats = app.state.group_commit.snapshot()
+    assert (stats["batches"], stats["orders"], stats["max_batch_size"]) == (2, 21, 20)
+    assert next(row for row in positions if row["side"] == "YES")["quantity"] == 21
@@ -0,0 +1,111 @@
+import io
+import json
+import logging
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.log import LogPipeline, install_sql_logging, sql_logger
+from app.models import OrderSide, OrderType
+from app.schemas import MarketCreate, OrderRequest
+from app.services import markets as market_service
+
+
+@pytest.mark.asyncio
+async def test_place_order_writes_json_audit_line_through_the_queue(session):
+    stream = io.StringIO()
+    pipeline = LogPipeline("info", queue_size=100, stream=stream)
+    pipeline.start()
+    try:
+        market = await market_service.create_market(
+            session,
+            MarketCreate(question="Will the tram be late?", description=None, slug=None, initial_price_yes=Decimal("35.00")),
+        )
+        execution = await market_service.place_order(
+            session,
+            market.id,
+            OrderRequest(side=OrderSide.YES, type=OrderType.BUY, price=Decimal("35.00"), quantity=2),
+        )
+        order = execution.order
+    finally:
+        pipeline.stop()
+
+    lines = [json.loads(line) for line in stream.getvalue().splitlines()]
+    audit = [line for line in lines if line["logger"] == "predicta.audit"]
+    assert len(audit) == 1
+    assert audit[0]["order_id"] == str(order.id)
+    assert audit[0]["quantity"] == 2
+    assert audit[0]["total_cost"] == "70.00"
+    assert audit[0]["source"] == "continuous"
+
+
+def test_full_queue_drops_instead_of_blocking():
+    pipeline = LogPipeline("info", queue_size=2, stream=io.StringIO())
+    record_logger = logging.getLogger("predicta.test")
+    record_logger.addHandler(pipeline.handler)
+    try:
+        for idx in range(5):
+            record_logger.warning("burst %d", idx)
+    finally:
+        record_logger.removeHandler(pipeline.handler)
+
+    assert pipeline.snapshot()["queue_depth"] == 2
+    assert pipeline.snapshot()["dropped"] == 3
+
+
+def test_stop_restores_root_and_uvicorn_logging():
+    root = logging.getLogger()
+    access = logging.getLogger("uvicorn.access")
+    access_handler = logging.StreamHandler(io.StringIO())
+    saved = (root.handlers[:], root.level, access.handlers[:], access.propagate)
+    root.setLevel(logging.ERROR)
+    access.handlers = [access_handler]
+    access.propagate = False
+    try:
+        pipeline = LogPipeline("debug", queue_size=10, stream=io.StringIO())
+        pipeline.start()
+        assert (root.level, access.handlers, access.propagate) == (logging.DEBUG, [], True)
+        pipeline.stop()
+
+        assert (root.level, access.handlers, access.propagate) == (logging.ERROR, [access_handler], False)
+        assert root.handlers == saved[0]
+    finally:
+        root.setLevel(saved[1])
+        access.handlers, access.propagate = saved[2], saved[3]
+
+
+def test_queued_record_is_a_copy():
+    pipeline = LogPipeline("info", queue_size=4, stream=io.StringIO())
+    record = logging.LogRecord("predicta.test", logging.INFO, __file__, 1, "order %s", ("abc",), None)
+
+    prepared = pipeline.handler.prepare(record)
+
+    assert prepared is not record
+    assert (prepared.msg, prepared.args) == ("order abc", None)
+    assert (record.msg, record.args) == ("order %s", ("abc",))
+
+
+@pytest.mark.asyncio
+async def test_sql_timing_survives_failing_statements():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    install_sql_logging(engine, 1.0)
+    lines: list[logging.LogRecord] = []
+    handler = logging.Handler()
+    handler.emit = lines.append
+    sql_logger.addHandler(handler)
+    sql_logger.setLevel(logging.INFO)
+    try:
+        async with engine.connect() as conn:
+            with pytest.raises(OperationalError):
+                await conn.execute(text("SELECT * FROM missing_table"))
+            await conn.execute(text("SELECT 1"))
+            assert not [key for key in conn.sync_connection.info if key.startswith("predicta")]
+    finally:
+        sql_logger.removeHandler(handler)
+        sql_logger.setLevel(logging.NOTSET)
+        await engine.dispose()
+
+    assert [record.statement for record in lines] == ["SELECT 1"]
@@ -3,7 +3,7 @@ from decimal import Decimal
 import pytest
 from fastapi import HTTPException
 
-from app.models import MarketOutcome, MarketStatus, OrderSide, OrderType
+from app.models import MarketOutcome, MarketStatus, OrderBookLevel, OrderSide, OrderType
 from app.schemas import MarketCreate, OrderRequest
 from app.services import markets as market_service
 
@@ -84,21 +84,75 @@ async def test_yes_order_matches_existing_no_level(session):
     )
 
     # Post a NO sell order at 40 cents that should rest on the order book.
-    sell_order = await market_service.place_order(
-        session,
-        market.id,
-        OrderRequest(side=OrderSide.NO, type=OrderType.SELL, price=Decimal("40.00"), quantity=5),
-    )
+    sell_order = (
+        await market_service.place_order(
+            session,
+            market.id,
+            OrderRequest(side=OrderSide.NO, type=OrderType.SELL, price=Decimal("40.00"), quantity=5),
+        )
+    ).order
     assert sell_order.quantity == 0
     assert sell_order.resting_quantity == 5
 
     # YES buy order should match against the NO level at 40 and trade at 60.
-    yes_order = await market_service.place_order(
-        session,
-        market.id,
-        OrderRequest(side=OrderSide.YES, type=OrderType.BUY, price=Decimal("72.00"), quantity=5),
-    )
+    yes_order = (
+        await market_service.place_order(
+            session,
+            market.id,
+            OrderRequest(side=OrderSide.YES, type=OrderType.BUY, price=Decimal("72.00"), quantity=5),
+        )
+    ).order
     assert yes_order.quantity == 5
     assert yes_order.price == Decimal("60.00")
     assert yes_order.resting_quantity == 0
 
+
+@pytest.mark.asyncio
+async def test_enum_columns_load_as_enums_and_reads_bypass_identity_map(session):
+    market = await market_service.create_market(
+        session,
+        MarketCreate(question="Will the rover land?", description=None, slug=None, initial_price_yes=Decimal("50.00")),
+    )
+    await market_service.place_order(
+        session,
+        market.id,
+        OrderRequest(side=OrderSide.NO, type=OrderType.BUY, price=Decimal("50.00"), quantity=4),
+    )
+    await market_service.place_order(
+        session,
+        market.id,
+        OrderRequest(side=OrderSide.NO, type=OrderType.SELL, price=Decimal("45.00"), quantity=4),
+    )
+    session.expunge_all()
+
+    reloaded = await market_service.get_market(session, market.id)
+    assert reloaded.status is MarketStatus.OPEN
+    levels = await market_service.get_order_book_levels(session, market.id)
+    assert [(level.side, level.price, level.quantity) for level in levels] == [(OrderSide.NO, Decimal("45.00"), 4)]
+    assert levels[0].side is OrderSide.NO
+    assert not hasattr(levels[0], "__dict__")
+    tracked = {type(obj) for obj in session.identity_map.values()}
+    assert OrderBookLevel not in tracked
+
+
+@pytest.mark.asyncio
+async def test_snapshot_returns_market_positions_and_aggregated_book(client):
+    created = await client.post("/markets", json={"question": "Will the dam hold?", "initial_price_yes": 50})
+    market_id = created.json()["id"]
+    await client.post(f"/markets/{market_id}/orders", json={"side": "NO", "type": "BUY", "price": 50, "quantity": 9})
+    for quantity in (2, 3):
+        await client.post(f"/markets/{market_id}/orders", json={"side": "NO", "type": "SELL", "price": 45, "quantity": quantity})
+    await client.post(f"/markets/{market_id}/orders", json={"side": "NO", "type": "SELL", "price": 48, "quantity": 1})
+
+    response = await client.get(f"/markets/{market_id}/snapshot")
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["market"]["id"] == market_id
+    assert {position["side"]: position["quantity"] for position in body["positions"]} == {"YES": 0, "NO": 9}
+    assert [(level["side"], level["price"], level["quantity"]) for level in body["order_book"]] == [
+        ("NO", "45.00", 5),
+        ("NO", "48.00", 1),
+    ]
+    missing = await client.get("/markets/00000000-0000-0000-0000-000000000000/snapshot")
+    assert missing.status_code == 404
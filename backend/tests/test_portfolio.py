@@ -0,0 +1,57 @@
+from decimal import Decimal
+
+import pytest
+
+from app.models import MarketOutcome, OrderSide, OrderType
+from app.schemas import MarketCreate, OrderRequest
+from app.services import markets as market_service
+from app.services import portfolio as portfolio_service
+
+
+async def _create(session, question: str, price_yes: str):
+    return await market_service.create_market(
+        session,
+        MarketCreate(question=question, description=None, slug=None, initial_price_yes=Decimal(price_yes)),
+    )
+
+
+async def _buy(session, market_id, side: OrderSide, price: str, quantity: int):
+    await market_service.place_order(
+        session,
+        market_id,
+        OrderRequest(side=side, type=OrderType.BUY, price=Decimal(price), quantity=quantity),
+    )
+
+
+@pytest.mark.asyncio
+async def test_portfolio_analytics_marks_open_positions(session):
+    first = await _create(session, "Will the launch succeed?", "60.00")
+    second = await _create(session, "Will the merger close?", "70.00")
+    resolved = await _create(session, "Was it sunny?", "50.00")
+
+    await _buy(session, first.id, OrderSide.YES, "60.00", 10)
+    await _buy(session, first.id, OrderSide.NO, "45.00", 2)
+    await _buy(session, second.id, OrderSide.NO, "30.00", 5)
+    await _buy(session, resolved.id, OrderSide.YES, "50.00", 100)
+    await market_service.resolve_market(session, resolved.id, MarketOutcome.NO)
+
+    analytics = await portfolio_service.get_portfolio_analytics(session, top=1)
+
+    assert analytics.market_count == 2
+    assert analytics.position_count == 3
+    assert analytics.market_value == Decimal("790.00")
+    assert analytics.unrealized_pnl == Decimal("-50.00")
+    assert analytics.payout_if_yes == Decimal("1000.00")
+    assert analytics.payout_if_no == Decimal("700.00")
+    assert analytics.worst_case_payout == Decimal("1500.00")
+    assert analytics.herfindahl_index == pytest.approx((640 / 790) ** 2 + (150 / 790) ** 2)
+    assert [exposure.market_id for exposure in analytics.top_exposures] == [first.id]
+    assert analytics.top_exposures[0].max_payout == Decimal("1000.00")
+
+
+@pytest.mark.asyncio
+async def test_portfolio_analytics_endpoint_without_positions(client):
+    response = await client.get("/portfolio/analytics")
+
+    assert response.status_code == 200
+    assert response.json()["market_count"] == 0
@@ -0,0 +1,97 @@
+import asyncio
+import uuid
+from datetime import datetime, timezone
+from decimal import Decimal
+
+import pytest
+
+from app.models import OrderSide, OrderType
+from app.services.post_trade import PostTradePipeline, TradeEvent
+
+
+def _event(market_id: uuid.UUID, quantity: int = 1) -> TradeEvent:
+    return TradeEvent(
+        order_id=uuid.uuid4(),
+        market_id=market_id,
+        side=OrderSide.YES,
+        type=OrderType.BUY,
+        price=Decimal("55.00"),
+        quantity=quantity,
+        resting_quantity=0,
+        total_cost=Decimal("55.00") * quantity,
+        realized_pnl=Decimal("0.00"),
+        occurred_at=datetime.now(timezone.utc),
+    )
+
+
+@pytest.mark.asyncio
+async def test_pipeline_waits_then_handles_inline_when_full_and_flushes_on_stop():
+    release = asyncio.Event()
+    batches: list[int] = []
+
+    async def slow_handler(events):
+        if len(events) > 1:
+            await release.wait()
+        batches.append(len(events))
+
+    pipeline = PostTradePipeline(
+        handlers=[slow_handler], max_queue=2, batch_size=2, flush_interval=0.01, publish_timeout=0.02
+    )
+    market_id = uuid.uuid4()
+    assert await pipeline.publish(_event(market_id)) and await pipeline.publish(_event(market_id))
+    await asyncio.sleep(0.05)
+    assert await pipeline.publish(_event(market_id)) and await pipeline.publish(_event(market_id))
+
+    # One batch of two is held by the handler and two events fill the queue, so a fifth waits
+    # out the timeout and is then handled by the publisher instead of being lost.
+    assert not await pipeline.publish(_event(market_id))
+    assert (pipeline.counters.publish_waits, pipeline.counters.inline_dispatches) == (1, 1)
+    assert batches == [1]
+
+    release.set()
+    await pipeline.stop()
+
+    assert sum(batches) == 5
+    assert pipeline.snapshot()["processed"] == 5
+    assert pipeline.depth == 0
+    with pytest.raises(RuntimeError):
+        await pipeline.publish(_event(market_id))
+
+
+@pytest.mark.asyncio
+async def test_publish_waits_for_space_instead_of_dropping():
+    handled: list[int] = []
+
+    async def handler(events):
+        await asyncio.sleep(0.01)
+        handled.append(len(events))
+
+    pipeline = PostTradePipeline(handlers=[handler], max_queue=1, batch_size=1, flush_interval=0.0, publish_timeout=1.0)
+    market_id = uuid.uuid4()
+    for _ in range(5):
+        assert await pipeline.publish(_event(market_id))
+    await pipeline.stop()
+
+    assert sum(handled) == 5
+    assert pipeline.counters.publish_waits > 0 and pipeline.counters.inline_dispatches == 0
+
+
+@pytest.mark.asyncio
+async def test_order_route_feeds_trade_statistics(client):
+    created = await client.post("/markets", json={"question": "Will the bridge open?", "initial_price_yes": "40.00"})
+    market_id = created.json()["id"]
+
+    order = await client.post(
+        f"/markets/{market_id}/orders",
+        json={"side": "YES", "type": "BUY", "price": "40.00", "quantity": 3},
+    )
+    assert order.status_code == 201
+
+    for _ in range(50):
+        stats = (await client.get(f"/markets/{market_id}/stats")).json()
+        if stats["orders"]:
+            break
+        await asyncio.sleep(0.01)
+    assert stats["filled_quantity"] == 3
+    assert stats["vwap"] == "40.00"
+    assert stats["last_trade_at"] is not None
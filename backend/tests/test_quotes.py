@@ -0,0 +1,62 @@
+from decimal import Decimal
+from uuid import uuid4
+
+import pytest
+
+from app.models import MarketStatus, OrderSide, OrderType
+from app.services.quotes import BookDepth, DepthSide, quote_order
+
+
+def test_quote_walks_only_eligible_levels_cheapest_first():
+    depth = BookDepth(
+        market_id=uuid4(),
+        status=MarketStatus.OPEN,
+        yes_price=Decimal("50.00"),
+        no_price=Decimal("50.00"),
+        sides={
+            OrderSide.YES: DepthSide.from_levels([]),
+            OrderSide.NO: DepthSide.from_levels(
+                [(Decimal("30.00"), 5), (Decimal("40.00"), 2), (Decimal("45.00"), 4), (Decimal("48.00"), 10)]
+            ),
+        },
+        loaded_at=0.0,
+    )
+
+    # A YES buy at 58 reaches NO levels priced >= 42: 45 then 48, filling at 55 and 52.
+    quote = quote_order(depth, OrderSide.YES, OrderType.BUY, Decimal("58"), 6)
+
+    assert [(fill.price, fill.quantity) for fill in quote.fills] == [(Decimal("55.00"), 4), (Decimal("52.00"), 2)]
+    assert quote.book_vwap == Decimal("54.00")
+    assert quote.slippage == Decimal("4.00")
+    assert quote.synthetic_quantity == 0 and quote.would_fill
+
+    deep = quote_order(depth, OrderSide.YES, OrderType.BUY, Decimal("58"), 20)
+    assert (deep.book_quantity, deep.synthetic_quantity) == (14, 6)
+    assert deep.total_cost == Decimal("1088.00")
+
+
+@pytest.mark.asyncio
+async def test_quote_matches_the_order_it_predicts_and_refreshes_after_writes(app, client):
+    created = await client.post("/markets", json={"question": "Will the pier reopen?", "initial_price_yes": 50})
+    market_id = created.json()["id"]
+    base = f"/markets/{market_id}"
+    await client.post(f"{base}/orders", json={"side": "NO", "type": "BUY", "price": 50, "quantity": 10})
+    await client.post(f"{base}/orders", json={"side": "NO", "type": "SELL", "price": 45, "quantity": 3})
+    await client.post(f"{base}/orders", json={"side": "NO", "type": "SELL", "price": 48, "quantity": 4})
+
+    params = {"side": "YES", "type": "BUY", "price": 60, "quantity": 5}
+    quote = (await client.get(f"{base}/quote", params=params)).json()
+    assert [(fill["price"], fill["quantity"]) for fill in quote["fills"]] == [("55.00", 3), ("52.00", 2)]
+    assert quote["average_price"] == "53.80"
+    assert (await client.get(f"{base}/quote", params=params)).json() == quote
+    assert app.state.depth_cache.hits == 1
+
+    order = (await client.post(f"{base}/orders", json=params)).json()
+    assert (order["price"], order["total_cost"]) == (quote["average_price"], quote["total_cost"])
+
+    after = (await client.get(f"{base}/quote", params=params)).json()
+    assert [(fill["price"], fill["quantity"]) for fill in after["fills"]] == [("52.00", 2)]
+    assert after["synthetic_quantity"] == 3
+
+    oversell = await client.get(f"{base}/quote", params={"side": "YES", "type": "SELL", "price": 50, "quantity": 99})
+    assert oversell.status_code == 422
@@ -0,0 +1,45 @@
+import time
+
+import pytest
+from starlette.requests import Request
+
+from app import db
+
+
+def _request(cookie: str | None = None) -> Request:
+    headers = [(b"cookie", f"{db.LAST_WRITE_COOKIE}={cookie}".encode())] if cookie is not None else []
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": headers})
+
+
+def test_reads_prefer_replica_until_it_has_replayed_the_clients_write(monkeypatch):
+    replica = object()
+    lag = db.ReplicaLagMonitor(None, poll_seconds=1.0, fallback_seconds=5.0)
+    monkeypatch.setattr(db, "AsyncReadSessionLocal", replica)
+    monkeypatch.setattr(db, "replica_lag", lag)
+
+    assert db.read_sessionmaker_for(_request()) is replica
+    assert db.read_sessionmaker_for(_request("not-a-timestamp")) is replica
+    assert db.read_sessionmaker_for(_request(f"{time.time() - 60:.3f}")) is replica
+    assert db.read_sessionmaker_for(_request(f"{time.time():.3f}")) is db.AsyncSessionLocal
+
+    # Unmeasured lag falls back to the configured ceiling; a measured one replaces it.
+    assert db.read_sessionmaker_for(_request(f"{time.time() - 3:.3f}")) is db.AsyncSessionLocal
+    lag.lag_seconds = 0.5
+    assert db.read_sessionmaker_for(_request(f"{time.time() - 3:.3f}")) is replica
+    assert db.read_sessionmaker_for(_request(f"{time.time() - 1:.3f}")) is db.AsyncSessionLocal
+
+
+@pytest.mark.asyncio
+async def test_cookie_is_set_only_after_a_successful_write(client, monkeypatch):
+    monkeypatch.setattr(db.settings, "read_database_url", "postgresql+asyncpg://replica/predicta")
+
+    created = await client.post("/markets", json={"question": "Will the ferry run?", "initial_price_yes": 50})
+    assert db.LAST_WRITE_COOKIE in created.headers.get("set-cookie", "")
+
+    client.cookies.clear()
+    market_id = created.json()["id"]
+    rejected = await client.post(
+        f"/markets/{market_id}/orders", json={"side": "YES", "type": "SELL", "price": 50, "quantity": 5}
+    )
+    assert rejected.status_code == 422
+    assert "set-cookie" not in rejected.headers
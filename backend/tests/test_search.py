@@ -0,0 +1,71 @@
+import importlib.util
+from decimal import Decimal
+from pathlib import Path
+
+import pytest
+from sqlalchemy import text
+
+from app.schemas import MarketCreate
+from app.services import markets as market_service
+from app.services.search import PG_SEARCH_DOCUMENT
+
+SEARCH_INDEX_MIGRATION = Path(__file__).parents[1] / "alembic" / "versions" / "b7e2d91c4a10_market_search_indexes.py"
+
+
+@pytest.mark.asyncio
+async def test_search_ranks_and_paginates(client, session):
+    for question, description in [
+        ("Will it rain in Lisbon tomorrow?", None),
+        ("Will the central bank cut rates?", "Rainy day fund discussion"),
+        ("Will the rocket launch on time?", None),
+    ]:
+        await market_service.create_market(
+            session,
+            MarketCreate(question=question, description=description, slug=None, initial_price_yes=Decimal("50.00")),
+        )
+
+    response = await client.get("/markets/search", params={"q": "rain"})
+    assert response.status_code == 200
+    body = response.json()
+    assert [item["question"] for item in body["items"]] == [
+        "Will it rain in Lisbon tomorrow?",
+        "Will the central bank cut rates?",
+    ]
+    assert body["items"][0]["score"] >= body["items"][1]["score"]
+    assert body["next_offset"] is None
+
+    first_page = (await client.get("/markets/search", params={"q": "will", "limit": 2})).json()
+    assert len(first_page["items"]) == 2
+    assert first_page["next_offset"] == 2
+    second_page = (await client.get("/markets/search", params={"q": "will", "limit": 2, "offset": 2})).json()
+    assert len(second_page["items"]) == 1
+
+    by_slug = (await client.get("/markets/search", params={"q": "rocket-launch"})).json()
+    assert [item["slug"] for item in by_slug["items"]] == ["will-the-rocket-launch-on-time"]
+
+
+@pytest.mark.asyncio
+async def test_search_survives_deletes_and_vacuum(client, session):
+    markets = [
+        await market_service.create_market(
+            session,
+            MarketCreate(question=question, description=None, slug=None, initial_price_yes=Decimal("50.00")),
+        )
+        for question in ("Will the harbour flood?", "Will the tram be late?", "Will the museum open?")
+    ]
+    await session.delete(markets[0])
+    await session.commit()
+    # Without an INTEGER PRIMARY KEY, VACUUM is free to renumber the rows of `markets`.
+    await session.execute(text("VACUUM"))
+
+    hits = (await client.get("/markets/search", params={"q": "museum"})).json()["items"]
+    assert [hit["id"] for hit in hits] == [str(markets[2].id)]
+    assert (await client.get("/markets/search", params={"q": "harbour"})).json()["items"] == []
+
+
+def test_postgres_search_document_matches_the_indexed_expression():
+    spec = importlib.util.spec_from_file_location("market_search_indexes", SEARCH_INDEX_MIGRATION)
+    migration = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(migration)
+
+    assert PG_SEARCH_DOCUMENT.replace("markets.", "") == migration.PG_SEARCH_DOCUMENT
@@ -0,0 +1,61 @@
+import uuid
+from collections import Counter
+
+import httpx
+import pytest
+
+from app.sharding import SHARD_HEADER, create_router_app, shard_for
+
+UPSTREAMS = ["http://shard-0", "http://shard-1", "http://shard-2"]
+
+
+def test_shard_for_is_stable_and_balanced():
+    market_ids = [uuid.uuid4() for _ in range(3000)]
+
+    first = [shard_for(market_id, 3) for market_id in market_ids]
+    second = [shard_for(uuid.UUID(str(market_id)), 3) for market_id in market_ids]
+
+    assert first == second
+    assert all(count > 800 for count in Counter(first).values())
+
+
+@pytest.mark.asyncio
+async def test_router_sends_market_requests_to_owning_shard():
+    seen: list[str] = []
+
+    def upstream(request: httpx.Request) -> httpx.Response:
+        seen.append(f"{request.url.scheme}://{request.url.host}{request.url.path}")
+        return httpx.Response(200, json={"ok": True})
+
+    app = create_router_app(UPSTREAMS, client=httpx.AsyncClient(transport=httpx.MockTransport(upstream)))
+    market_id = uuid.uuid4()
+    owner = shard_for(market_id, len(UPSTREAMS))
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://router") as client:
+        for _ in range(3):
+            response = await client.get(f"/markets/{market_id}/order-book")
+            assert response.headers[SHARD_HEADER] == str(owner)
+        stats = (await client.get("/shards/stats")).json()
+
+    assert seen == [f"{UPSTREAMS[owner]}/markets/{market_id}/order-book"] * 3
+    assert [shard["requests"] for shard in stats["shards"]] == [3 if idx == owner else 0 for idx in range(3)]
+
+
+@pytest.mark.asyncio
+async def test_router_keeps_repeated_headers_in_both_directions():
+    received: list[tuple[str, str]] = []
+
+    def upstream(request: httpx.Request) -> httpx.Response:
+        received.extend(request.headers.multi_items())
+        return httpx.Response(
+            200,
+            headers=[("set-cookie", "a=1; Path=/"), ("set-cookie", "b=2; Path=/")],
+            json={"ok": True},
+        )
+
+    app = create_router_app(UPSTREAMS, client=httpx.AsyncClient(transport=httpx.MockTransport(upstream)))
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://router") as client:
+        response = await client.get("/markets", headers=[("x-trace", "one"), ("x-trace", "two")])
+
+    assert response.headers.get_list("set-cookie") == ["a=1; Path=/", "b=2; Path=/"]
+    assert [value for key, value in received if key == "x-trace"] == ["one", "two"]
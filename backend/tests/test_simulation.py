@@ -0,0 +1,69 @@
+from decimal import Decimal
+
+import pytest
+from fastapi import HTTPException
+
+from app.models import OrderSide, OrderType
+from app.schemas import MarketCreate, OrderRequest
+from app.services import markets as market_service
+from app.services.matching import InMemoryMatchingEngine, OrderRejected
+from app.services.simulation import MarketScenario, SimulatedOrder, run_simulations
+
+SCRIPT = (
+    SimulatedOrder(OrderSide.NO, OrderType.BUY, Decimal("50.00"), 10),
+    SimulatedOrder(OrderSide.NO, OrderType.SELL, Decimal("40.00"), 4),
+    SimulatedOrder(OrderSide.NO, OrderType.SELL, Decimal("35.00"), 3),
+    SimulatedOrder(OrderSide.YES, OrderType.BUY, Decimal("70.00"), 5),
+    SimulatedOrder(OrderSide.YES, OrderType.SELL, Decimal("80.00"), 6),
+    SimulatedOrder(OrderSide.YES, OrderType.SELL, Decimal("55.00"), 2),
+    SimulatedOrder(OrderSide.NO, OrderType.BUY, Decimal("30.00"), 1),
+)
+
+
+@pytest.mark.asyncio
+async def test_in_memory_engine_matches_database_engine(session):
+    market = await market_service.create_market(
+        session,
+        MarketCreate(question="Will parity hold?", description=None, slug=None, initial_price_yes=Decimal("50.00")),
+    )
+    engine = InMemoryMatchingEngine(Decimal("50.00"))
+
+    for scripted in SCRIPT:
+        payload = OrderRequest(side=scripted.side, type=scripted.type, price=scripted.price, quantity=scripted.quantity)
+        try:
+            persisted = (await market_service.place_order(session, market.id, payload)).order
+        except HTTPException:
+            with pytest.raises(OrderRejected):
+                engine.place_order(scripted.side, scripted.type, scripted.price, scripted.quantity)
+            continue
+        simulated = engine.place_order(scripted.side, scripted.type, scripted.price, scripted.quantity)
+        assert (simulated.price, simulated.quantity, simulated.resting_quantity, simulated.total_cost, simulated.realized_pnl) == (
+            persisted.price,
+            persisted.quantity,
+            persisted.resting_quantity,
+            persisted.total_cost,
+            persisted.realized_pnl,
+        )
+
+    refreshed = await market_service.get_market(session, market.id)
+    assert engine.market.yes_price == refreshed.yes_price
+    for position in await market_service.get_positions(session, market.id):
+        simulated_position = engine.positions[position.side]
+        assert simulated_position.quantity == position.quantity
+        assert simulated_position.average_price == position.average_price
+        assert simulated_position.realized_pnl == position.realized_pnl
+
+
+def test_run_simulations_is_deterministic_across_workers():
+    scenarios = [
+        MarketScenario(name=f"m{idx}", initial_price_yes=Decimal("50.00"), random_orders=500, seed=idx)
+        for idx in range(2)
+    ]
+
+    in_process = run_simulations(scenarios, max_workers=1)
+    pooled = run_simulations(scenarios, max_workers=2)
+
+    assert [res.orders for res in pooled] == [500, 500]
+    assert [(res.final_yes_price, res.positions, res.rejected) for res in pooled] == [
+        (res.final_yes_price, res.positions, res.rejected) for res in in_process
+    ]
@@ -0,0 +1,57 @@
+import logging
+import uuid
+
+import pytest
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.config import Settings
+from app.db import Base
+from app.services import markets as market_service
+from app.warmup import run_warmup
+
+
+@pytest.mark.asyncio
+async def test_run_warmup_primes_pool_and_every_sessionmaker(app, client, tmp_path, caplog):
+    url = f"sqlite+aiosqlite:///{tmp_path / 'warmup.db'}"
+    engine = create_async_engine(url)
+    read_engine = create_async_engine(url)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    settings = Settings(warmup_pool_connections=3, warmup_preload_books=True)
+    sessionmakers = [async_sessionmaker(bound, expire_on_commit=False) for bound in (engine, read_engine)]
+
+    assert (await client.get("/readyz")).status_code == 503
+    await run_warmup(app.state.readiness, [engine, read_engine], sessionmakers, settings)
+    ready = await client.get("/readyz")
+    assert ready.status_code == 200
+    assert ready.json()["attempts"] == 1
+    assert ready.json()["pool_connections"] == 6
+
+    # SQLAlchemy logs "[generated in ...]" when it compiles a statement and "[cached since ...]"
+    # when it reuses one: the first hot-path reads after warmup must all be cache hits.
+    primed = []
+    with caplog.at_level(logging.INFO, logger="sqlalchemy.engine.Engine"):
+        for sessionmaker in sessionmakers:
+            async with sessionmaker() as session:
+                await market_service.get_positions(session, uuid.uuid4())
+                await market_service.get_order_book_columns(session, uuid.uuid4())
+                primed.append(await market_service.prime_statements(session))
+    await engine.dispose()
+    await read_engine.dispose()
+
+    assert sum(primed) == ready.json()["statements"]
+    messages = [record.getMessage() for record in caplog.records]
+    assert any("[cached since" in message for message in messages)
+    assert not any("[generated in" in message for message in messages)
+
+
+@pytest.mark.asyncio
+async def test_readyz_reports_warming_until_ready(app, client):
+    assert (await client.get("/healthz")).status_code == 200
+
+    warming = await client.get("/readyz")
+    assert warming.status_code == 503
+    assert warming.json()["status"] == "warming"
+
+    app.state.readiness.ready = True
+    assert (await client.get("/readyz")).status_code == 200
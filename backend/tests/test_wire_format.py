@@ -0,0 +1,84 @@
+from decimal import Decimal
+
+import msgpack
+import pytest
+
+from app.api.encoding import COLUMNAR_JSON, MSGPACK
+from app.models import OrderSide, OrderType
+from app.schemas import MarketCreate, OrderRequest
+from app.services import markets as market_service
+
+
+async def _market_with_resting_levels(session):
+    market = await market_service.create_market(
+        session,
+        MarketCreate(question="Will the vote pass?", description=None, slug=None, initial_price_yes=Decimal("50.00")),
+    )
+    await market_service.place_order(
+        session,
+        market.id,
+        OrderRequest(side=OrderSide.NO, type=OrderType.BUY, price=Decimal("50.00"), quantity=10),
+    )
+    for price in (Decimal("45.00"), Decimal("40.00")):
+        await market_service.place_order(
+            session,
+            market.id,
+            OrderRequest(side=OrderSide.NO, type=OrderType.SELL, price=price, quantity=3),
+        )
+    return market
+
+
+@pytest.mark.asyncio
+async def test_order_book_columnar_json(client, session):
+    market = await _market_with_resting_levels(session)
+
+    response = await client.get(f"/markets/{market.id}/order-book", headers={"Accept": COLUMNAR_JSON})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == COLUMNAR_JSON
+    body = response.json()
+    assert body["market_id"] == str(market.id)
+    assert body["NO"] == {"price": ["40.00", "45.00"], "quantity": [3, 3]}
+    assert body["YES"] == {"price": [], "quantity": []}
+
+
+@pytest.mark.asyncio
+async def test_positions_msgpack_and_default_json(client, session):
+    market = await _market_with_resting_levels(session)
+
+    packed = await client.get(f"/markets/{market.id}/positions", headers={"Accept": MSGPACK})
+    assert packed.headers["content-type"] == MSGPACK
+    columns = msgpack.unpackb(packed.content)
+    assert columns["side"] == ["NO", "YES"]
+    assert columns["quantity"] == [10, 0]
+
+    default = await client.get(f"/markets/{market.id}/positions")
+    assert default.headers["content-type"] == "application/json"
+    assert "Accept" in default.headers["vary"]
+    assert [row["side"] for row in default.json()] == ["NO", "YES"]
+
+
+@pytest.mark.asyncio
+async def test_zero_quality_columnar_falls_back_to_json(client, session):
+    market = await _market_with_resting_levels(session)
+
+    for accept in (f"{COLUMNAR_JSON};q=0.000", f"{MSGPACK}; q=0.00, application/json"):
+        response = await client.get(f"/markets/{market.id}/order-book", headers={"Accept": accept})
+        assert response.headers["content-type"] == "application/json"
+        assert "Accept" in response.headers["vary"]
+
+
+@pytest.mark.asyncio
+async def test_columnar_is_chosen_by_relative_quality(client, session):
+    market = await _market_with_resting_levels(session)
+    url = f"/markets/{market.id}/order-book"
+
+    cases = {
+        f"application/json, {MSGPACK};q=0.1": "application/json",
+        f"{MSGPACK};q=0.5, */*;q=0.5": "application/json",
+        f"*/*;q=0.2, {COLUMNAR_JSON};q=0.4, {MSGPACK};q=0.9": MSGPACK,
+        f"application/json;q=0.3, {COLUMNAR_JSON}": COLUMNAR_JSON,
+    }
+    for accept, expected in cases.items():
+        response = await client.get(url, headers={"Accept": accept})
+        assert response.headers["content-type"] == expected, accept
@@ -1,12 +1,15 @@
 "use client";
 
 import { useQuery } from "@tanstack/react-query";
-import { useState } from "react";
+import { useEffect, useState } from "react";
 
 import { CreateMarketForm } from "@/components/market/create-market-form";
 import { MarketCard } from "@/components/market/market-card";
 import { Breadcrumbs } from "@/components/navigation/breadcrumbs";
-import { fetchMarkets } from "@/lib/api";
+import { fetchMarkets, searchMarkets } from "@/lib/api";
+
+// Wait for a pause in typing so each keystroke does not fire its own search request.
+const SEARCH_DEBOUNCE_MS = 250;
 
 export default function HomePage() {
     const { data: markets, isLoading, error, refetch } = useQuery({
@@ -14,6 +17,18 @@ export default function HomePage() {
         queryFn: fetchMarkets,
     });
     const [isCreateOpen, setCreateOpen] = useState(false);
+    const [searchTerm, setSearchTerm] = useState("");
+    const [trimmedSearch, setTrimmedSearch] = useState("");
+    useEffect(() => {
+        const timer = setTimeout(() => setTrimmedSearch(searchTerm.trim()), SEARCH_DEBOUNCE_MS);
+        return () => clearTimeout(timer);
+    }, [searchTerm]);
+    const { data: searchResults, isFetching: isSearching } = useQuery({
+        queryKey: ["marketSearch", trimmedSearch],
+        queryFn: () => searchMarkets(trimmedSearch),
+        enabled: trimmedSearch.length > 0,
+    });
+    const visibleMarkets = trimmedSearch ? searchResults?.items : markets;
 
     const totalMarkets = markets?.length ?? 0;
     const openMarkets = markets?.filter((market) => market.status === "OPEN").length ?? 0;
@@ -73,16 +88,32 @@ export default function HomePage() {
                             <p className="text-xs uppercase tracking-wide text-slate-500">Live markets</p>
                             <h2 className="text-xl font-semibold text-slate-900">Order book overview</h2>
                         </div>
-                        <span className="rounded-full bg-slate-100 px-3 py-1 text-xs font-medium text-slate-600">
-                            {isLoading ? "Loading..." : `${openMarkets} open`}
-                        </span>
+                        <div className="flex items-center gap-3">
+                            <input
+                                type="search"
+                                value={searchTerm}
+                                onChange={(event) => setSearchTerm(event.target.value)}
+                                placeholder="Search markets"
+                                aria-label="Search markets"
+                                className="w-56 border border-slate-200 bg-white px-3 py-1.5 text-sm text-slate-900 outline-none transition focus:border-slate-400"
+                            />
+                            <span className="rounded-full bg-slate-100 px-3 py-1 text-xs font-medium text-slate-600">
+                                {isLoading ? "Loading..." : `${openMarkets} open`}
+                            </span>
+                        </div>
                     </div>
 
                     {isLoading && <p className="text-sm text-slate-500">Fetching markets...</p>}
-                    {!isLoading && !markets?.length && <p className="text-sm text-slate-500">No markets created yet.</p>}
+                    {!isLoading && !trimmedSearch && !markets?.length && (
+                        <p className="text-sm text-slate-500">No markets created yet.</p>
+                    )}
+                    {trimmedSearch && isSearching && <p className="text-sm text-slate-500">Searching...</p>}
+                    {trimmedSearch && !isSearching && !searchResults?.items.length && (
+                        <p className="text-sm text-slate-500">No markets match &ldquo;{trimmedSearch}&rdquo;.</p>
+                    )}
 
                     <div className="grid gap-3 md:grid-cols-3">
-                        {markets?.map((market) => (
+                        {visibleMarkets?.map((market) => (
                             <MarketCard key={market.id} market={market} />
                         ))}
                     </div>
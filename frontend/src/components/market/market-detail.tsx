@@ -2,9 +2,8 @@
 
 import { useMutation, useQuery } from "@tanstack/react-query";
 import Link from "next/link";
-import { useCallback } from "react";
 
-import { fetchMarket, fetchOrderBook, fetchPositions, resolveMarket } from "@/lib/api";
+import { fetchMarketSnapshot, resolveMarket } from "@/lib/api";
 import { Breadcrumbs } from "../navigation/breadcrumbs";
 import { Badge } from "../ui/badge";
 import { Button } from "../ui/button";
@@ -17,53 +16,32 @@ interface Props {
 }
 
 export function MarketDetail({ marketId }: Props) {
+  // Market, positions and book arrive together from one request.
   const {
-    data: market,
-    isLoading: loadingMarket,
-    error: marketError,
-    refetch: refetchMarket,
+    data: snapshot,
+    isLoading,
+    error,
+    refetch: refetchAll,
   } = useQuery({
-    queryKey: ["market", marketId],
-    queryFn: () => fetchMarket(marketId),
+    queryKey: ["marketSnapshot", marketId],
+    queryFn: () => fetchMarketSnapshot(marketId),
   });
 
-  const {
-    data: positions,
-    isLoading: loadingPositions,
-    refetch: refetchPositions,
-  } = useQuery({
-    queryKey: ["positions", marketId],
-    queryFn: () => fetchPositions(marketId),
-  });
-
-  const {
-    data: orderBookLevels,
-    isLoading: loadingOrderBook,
-    refetch: refetchOrderBook,
-  } = useQuery({
-    queryKey: ["orderBook", marketId],
-    queryFn: () => fetchOrderBook(marketId),
-  });
-
-  const refetchAll = useCallback(() => {
-    refetchMarket();
-    refetchPositions();
-    refetchOrderBook();
-  }, [refetchMarket, refetchOrderBook, refetchPositions]);
-
   const resolveMutation = useMutation({
     mutationFn: (outcome: "YES" | "NO") => resolveMarket(marketId, outcome),
     onSuccess: () => refetchAll(),
   });
 
-  if (loadingMarket) {
+  if (isLoading) {
     return <p className="text-muted-foreground">Loading market...</p>;
   }
 
-  if (marketError || !market) {
+  if (error || !snapshot) {
     return <p className="text-destructive">Unable to load market.</p>;
   }
 
+  const { market, positions, order_book: orderBookLevels } = snapshot;
+
   const breadcrumbs = [
     { label: "Home", href: "/" },
     { label: "Markets", href: "/" },
@@ -114,9 +92,7 @@ export function MarketDetail({ marketId }: Props) {
             <CardDescription>Weighted averages and realized P/L per side</CardDescription>
           </CardHeader>
           <CardContent>
-            {loadingPositions ? (
-              <p className="text-muted-foreground text-sm">Loading positions...</p>
-            ) : positions?.length ? (
+            {positions.length ? (
               <Table>
                 <TableHeader>
                   <TableRow>
@@ -153,12 +129,10 @@ export function MarketDetail({ marketId }: Props) {
             <CardDescription>Resting limit orders waiting for a match</CardDescription>
           </CardHeader>
           <CardContent>
-            {loadingOrderBook ? (
-              <p className="text-sm text-muted-foreground">Loading book...</p>
-            ) : orderBookLevels?.length ? (
+            {orderBookLevels.length ? (
               <div className="grid gap-4 sm:grid-cols-2">
                 {(["YES", "NO"] as const).map((side) => {
-                  const levels = [...(orderBookLevels ?? [])]
+                  const levels = [...orderBookLevels]
                     .filter((level) => level.side === side)
                     .sort((a, b) => Number(b.price) - Number(a.price));
                   return (
@@ -174,7 +148,7 @@ export function MarketDetail({ marketId }: Props) {
                           </TableHeader>
                           <TableBody>
                             {levels.map((level) => (
-                              <TableRow key={level.id}>
+                              <TableRow key={`${level.side}-${level.price}`}>
                                 <TableCell>{Number(level.price).toFixed(2)}</TableCell>
                                 <TableCell>{level.quantity}</TableCell>
                               </TableRow>
@@ -200,7 +174,7 @@ export function MarketDetail({ marketId }: Props) {
             <CardDescription>Orders update holdings immediately; sells require existing inventory.</CardDescription>
           </CardHeader>
           <CardContent>
-            <OrderForm marketId={market.id} onSettled={refetchAll} />
+            <OrderForm marketId={market.id} onSettled={() => refetchAll()} />
           </CardContent>
         </Card>
 
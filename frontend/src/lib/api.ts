@@ -1,7 +1,22 @@
-import { Market, OrderBookLevel, OrderRequestPayload, Position } from "./types";
+import {
+  ConditionalOrder,
+  ConditionalOrderPayload,
+  Market,
+  MarketSearchResponse,
+  MarketSnapshot,
+  OrderBookLevel,
+  OrderQuote,
+  OrderRequestPayload,
+  Position,
+  TradingMode,
+} from "./types";
 
 const API_BASE = process.env.NEXT_PUBLIC_API_URL ?? "http://localhost:8000";
 
+// Only writes (which set the read-after-write cookie) and the reads that must see them
+// carry credentials; search and quotes stay cookie-free.
+const FOLLOW_WRITES: RequestInit = { credentials: "include" };
+
 async function request<T>(path: string, options?: RequestInit): Promise<T> {
   const response = await fetch(`${API_BASE}${path}`, {
     ...options,
@@ -26,19 +41,42 @@ async function request<T>(path: string, options?: RequestInit): Promise<T> {
 }
 
 export function fetchMarkets(): Promise<Market[]> {
-  return request<Market[]>("/markets");
+  return request<Market[]>("/markets", FOLLOW_WRITES);
+}
+
+export function searchMarkets(query: string, limit = 20, offset = 0): Promise<MarketSearchResponse> {
+  const params = new URLSearchParams({ q: query, limit: String(limit), offset: String(offset) });
+  return request<MarketSearchResponse>(`/markets/search?${params.toString()}`);
 }
 
 export function fetchMarket(id: string): Promise<Market> {
-  return request<Market>(`/markets/${id}`);
+  return request<Market>(`/markets/${id}`, FOLLOW_WRITES);
 }
 
-export function fetchPositions(id: string): Promise<Position[]> {
-  return request<Position[]>(`/markets/${id}/positions`);
+export function fetchMarketSnapshot(id: string): Promise<MarketSnapshot> {
+  return request<MarketSnapshot>(`/markets/${id}/snapshot`, FOLLOW_WRITES);
+}
+
+export function fetchOrderQuote(marketId: string, payload: OrderRequestPayload): Promise<OrderQuote> {
+  const params = new URLSearchParams({
+    side: payload.side,
+    type: payload.type,
+    price: String(payload.price),
+    quantity: String(payload.quantity),
+  });
+  if (payload.account_id) {
+    params.set("account_id", payload.account_id);
+  }
+  return request<OrderQuote>(`/markets/${marketId}/quote?${params.toString()}`);
+}
+
+export function fetchPositions(id: string, accountId?: string): Promise<Position[]> {
+  const query = accountId ? `?${new URLSearchParams({ account_id: accountId }).toString()}` : "";
+  return request<Position[]>(`/markets/${id}/positions${query}`, FOLLOW_WRITES);
 }
 
 export function fetchOrderBook(marketId: string): Promise<OrderBookLevel[]> {
-    return request<OrderBookLevel[]>(`/markets/${marketId}/order-book`);
+    return request<OrderBookLevel[]>(`/markets/${marketId}/order-book`, FOLLOW_WRITES);
 }
 
 export function createMarket(payload: {
@@ -48,6 +86,7 @@ export function createMarket(payload: {
   slug?: string;
 }): Promise<Market> {
   return request<Market>("/markets", {
+    ...FOLLOW_WRITES,
     method: "POST",
     body: JSON.stringify(payload),
   });
@@ -55,13 +94,42 @@ export function createMarket(payload: {
 
 export function placeOrder(marketId: string, payload: OrderRequestPayload) {
   return request(`/markets/${marketId}/orders`, {
+    ...FOLLOW_WRITES,
+    method: "POST",
+    body: JSON.stringify(payload),
+  });
+}
+
+export function fetchConditionalOrders(marketId: string): Promise<ConditionalOrder[]> {
+  return request<ConditionalOrder[]>(`/markets/${marketId}/conditional-orders`, FOLLOW_WRITES);
+}
+
+export function placeConditionalOrder(marketId: string, payload: ConditionalOrderPayload): Promise<ConditionalOrder> {
+  return request<ConditionalOrder>(`/markets/${marketId}/conditional-orders`, {
+    ...FOLLOW_WRITES,
     method: "POST",
     body: JSON.stringify(payload),
   });
 }
 
+export function cancelConditionalOrder(marketId: string, conditionalId: string): Promise<ConditionalOrder> {
+  return request<ConditionalOrder>(`/markets/${marketId}/conditional-orders/${conditionalId}`, {
+    ...FOLLOW_WRITES,
+    method: "DELETE",
+  });
+}
+
+export function setTradingMode(marketId: string, mode: TradingMode, auctionIntervalMs?: number): Promise<Market> {
+  return request<Market>(`/markets/${marketId}/trading-mode`, {
+    ...FOLLOW_WRITES,
+    method: "PUT",
+    body: JSON.stringify({ mode, auction_interval_ms: auctionIntervalMs }),
+  });
+}
+
 export function resolveMarket(marketId: string, outcome: "YES" | "NO") {
   return request(`/markets/${marketId}/resolve`, {
+    ...FOLLOW_WRITES,
     method: "POST",
     body: JSON.stringify({ outcome }),
   });
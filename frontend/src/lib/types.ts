@@ -2,6 +2,7 @@ export type MarketStatus = "OPEN" | "RESOLVED";
 export type MarketOutcome = "YES" | "NO" | null;
 export type OrderSide = "YES" | "NO";
 export type OrderType = "BUY" | "SELL";
+export type TradingMode = "CONTINUOUS" | "AUCTION";
 
 export interface Market {
   id: string;
@@ -12,10 +13,24 @@ export interface Market {
   outcome?: MarketOutcome;
   yes_price: number;
   no_price: number;
+  trading_mode: TradingMode;
+  auction_interval_ms: number | null;
+}
+
+export interface MarketSearchHit extends Market {
+  score: number;
+}
+
+export interface MarketSearchResponse {
+  items: MarketSearchHit[];
+  limit: number;
+  offset: number;
+  next_offset: number | null;
 }
 
 export interface Position {
   market_id: string;
+  account_id: string;
   side: OrderSide;
   quantity: number;
   average_price: number;
@@ -30,10 +45,70 @@ export interface OrderBookLevel {
     quantity: number;
 }
 
+export interface OrderBookDepth {
+  side: OrderSide;
+  price: number;
+  quantity: number;
+}
+
+export interface MarketSnapshot {
+  market: Market;
+  positions: Position[];
+  order_book: OrderBookDepth[];
+}
+
+export type ConditionalKind = "STOP" | "TAKE_PROFIT";
+export type ConditionalStatus = "PENDING" | "TRIGGERED" | "REJECTED" | "CANCELLED";
+
+export interface ConditionalOrder {
+  id: string;
+  market_id: string;
+  account_id: string;
+  side: OrderSide;
+  type: OrderType;
+  kind: ConditionalKind;
+  trigger_price: number;
+  price: number;
+  quantity: number;
+  status: ConditionalStatus;
+  order_id: string | null;
+  rejection_reason: string | null;
+  triggered_at: string | null;
+}
+
+export interface ConditionalOrderPayload extends OrderRequestPayload {
+  kind: ConditionalKind;
+  trigger_price: number;
+}
+
 export interface OrderRequestPayload {
+  account_id?: string;
   side: OrderSide;
   type: OrderType;
   price: number;
   quantity: number;
 }
 
+export interface QuoteFill {
+  price: string;
+  quantity: number;
+}
+
+export interface OrderQuote {
+  market_id: string;
+  side: OrderSide;
+  type: OrderType;
+  limit_price: string;
+  quantity: number;
+  fills: QuoteFill[];
+  book_quantity: number;
+  synthetic_quantity: number;
+  resting_quantity: number;
+  book_vwap: string | null;
+  average_price: string | null;
+  total_cost: string;
+  reference_price: string;
+  slippage: string | null;
+  would_fill: boolean;
+}
+